@@ -0,0 +1,88 @@
+import random
+import uuid
+from datetime import date, datetime, time, timedelta, timezone
+from typing import Dict, Any, Iterator, List
+
+BENCH_TAG = "__bench__"
+
+TAGS = [None, None, None, "paliwo", "jedzenie", "kino", "wakacje", "dom", "prezenty", "zdrowie"]
+WORDS = [
+    "biedronka", "lidl", "orlen", "apteka", "czynsz", "prąd", "internet", "kino", "obiad", "kawa",
+    "allegro", "paliwo", "bilet", "siłownia", "książka", "prezent", "naprawa", "ubezpieczenie", "rata", "pensja"
+]
+CATEGORIES = [
+    ("Jedzenie", ["Zakupy", "Restauracje", "Kawa"], "EXPENSE"),
+    ("Transport", ["Paliwo", "Bilety", "Serwis"], "EXPENSE"),
+    ("Dom", ["Czynsz", "Media", "Naprawy"], "EXPENSE"),
+    ("Rozrywka", ["Kino", "Hobby", "Podróże"], "EXPENSE"),
+    ("Zdrowie", ["Apteka", "Lekarz"], "EXPENSE"),
+    ("Przychody", ["Pensja", "Premia", "Zwroty"], "INCOME"),
+    ("System", ["Transfer"], "TRANSFER"),
+]
+HISTORY_DAYS = 5 * 365
+
+def build_dims(seed: int = 1, users: int = 3, wallets: int = 6) -> Dict[str, List[Dict[str, Any]]]:
+    rnd = random.Random(seed)
+    stamp = datetime(2020, 1, 1, tzinfo=timezone.utc).isoformat()
+    user_rows = [{
+        "id": str(uuid.UUID(int=rnd.getrandbits(128), version=4)), "alias": f"Bench {i + 1}",
+        "color_hex": "#%06x" % rnd.getrandbits(24), "default_wallet_fk": None,
+        "created_at": stamp, "updated_at": stamp
+    } for i in range(users)]
+    wallet_rows = [{
+        "id": str(uuid.UUID(int=rnd.getrandbits(128), version=4)), "wallet_name": f"Portfel {i + 1}",
+        "owner_name": user_rows[i % users]["id"], "is_active": True,
+        "created_at": stamp, "updated_at": stamp, "deleted_at": None
+    } for i in range(wallets)]
+    category_rows = []
+    for category_id, (category, subcategories, type_) in enumerate(CATEGORIES, start=1):
+        for subcategory in subcategories:
+            category_rows.append({
+                "subcategory_id": len(category_rows) + 1, "category_id": category_id, "category": category,
+                "subcategory": subcategory, "type": type_, "color_hex": "#%06x" % rnd.getrandbits(24),
+                "created_at": stamp, "updated_at": stamp, "deleted_at": None
+            })
+    return {"dim_users": user_rows, "dim_wallets": wallet_rows, "dim_categories": category_rows}
+
+def iter_transactions(count: int, dims: Dict[str, List[Dict[str, Any]]], seed: int = 1,
+                      today: date = None, tag: str = None) -> Iterator[Dict[str, Any]]:
+    # Timestamps follow the transaction date, so only the last few rows fall into
+    # the sync overlap window - as on a real, slowly growing ledger.
+    rnd = random.Random(seed)
+    today = today or date.today()
+    first_day = today - timedelta(days=HISTORY_DAYS)
+    users = [u["id"] for u in dims["dim_users"]]
+    wallets = [w["id"] for w in dims["dim_wallets"]]
+    categories = [(c["subcategory_id"], c["type"]) for c in dims["dim_categories"]]
+    plain = [c for c in categories if c[1] != "TRANSFER"]
+    transfers = [c for c in categories if c[1] == "TRANSFER"]
+    day_stamps: Dict[int, str] = {}
+
+    for i in range(count):
+        # Evenly spread over the history, newest last, with a little jitter.
+        day = min(HISTORY_DAYS, max(0, i * HISTORY_DAYS // max(count, 1) + rnd.randint(-2, 2)))
+        stamp = day_stamps.get(day)
+        if stamp is None:
+            stamp = day_stamps[day] = datetime.combine(first_day + timedelta(days=day), time(12), timezone.utc).isoformat()
+        is_transfer = transfers and rnd.random() < 0.03
+        subcategory_id, _ = rnd.choice(transfers if is_transfer else plain)
+        wallet = rnd.choice(wallets)
+        yield {
+            "id": str(uuid.UUID(int=rnd.getrandbits(128), version=4)),
+            "amount": round(rnd.lognormvariate(4, 1.1), 2) or 0.01,
+            "transaction_date": stamp[:10],
+            "wallet_fk": wallet,
+            "to_wallet_fk": rnd.choice([w for w in wallets if w != wallet]) if is_transfer else None,
+            "subcategory_fk": subcategory_id,
+            "created_by_fk": rnd.choice(users),
+            "status": "PENDING" if rnd.random() < 0.05 else "COMPLETED",
+            "sentiment": None,
+            "tag": tag or rnd.choice(TAGS),
+            "is_excluded_from_stats": rnd.random() < 0.02,
+            "attachment_path": None,
+            "attachment_type": None,
+            "description": f"{rnd.choice(WORDS)} {rnd.choice(WORDS)} {i}",
+            "created_at": stamp,
+            "updated_at": stamp,
+            "deleted_at": None,
+        }
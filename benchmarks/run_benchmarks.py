@@ -0,0 +1,385 @@
+import argparse
+import json
+import os
+import platform
+import statistics
+import subprocess
+import sys
+import tempfile
+import time
+from datetime import datetime, timezone
+from pathlib import Path
+from typing import Dict, Any, List, Callable, Optional
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+SRC_DIR = BASE_DIR / "src"
+BENCH_DIR = Path(__file__).resolve().parent
+RESULTS_DIR = BASE_DIR / "bench_results"
+
+DEFAULT_SIZES = [1000, 10000, 100000, 1000000]
+SCENARIOS = [
+    "full_load", "incremental_refresh", "replica_startup", "ui_refresh", "populate_table",
+    "filter_search", "filter_author", "sort_amount", "edit_amount", "delete_100",
+]
+SEARCH_QUERIES = ["biedronka", "kawa 1", "orlen", "apteka czynsz", "pensja"]
+# Medians below this are dominated by timer and scheduler noise; they are reported
+# but never flagged as regressions.
+NOISE_FLOOR_S = 0.005
+
+def summarize(samples: List[float]) -> Dict[str, Any]:
+    return {
+        "samples_s": [round(s, 6) for s in samples],
+        "min_s": round(min(samples), 6),
+        "median_s": round(statistics.median(samples), 6),
+        "mean_s": round(statistics.fmean(samples), 6),
+        "max_s": round(max(samples), 6),
+    }
+
+def measure(action: Callable[[int], Any], repeat: int, setup: Callable[[int], Any] = None) -> List[float]:
+    samples = []
+    for i in range(repeat):
+        if setup:
+            setup(i)
+        started = time.perf_counter()
+        action(i)
+        samples.append(time.perf_counter() - started)
+    return samples
+
+def peak_rss_mb() -> Optional[float]:
+    try:
+        import resource
+    except ImportError:
+        return None
+    peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+    # Linux reports KiB, macOS bytes.
+    return round(peak / (1024 * 1024 if sys.platform == "darwin" else 1024), 1)
+
+def git_info() -> Dict[str, Optional[str]]:
+    def git(*args):
+        try:
+            return subprocess.run(["git", *args], cwd=BASE_DIR, capture_output=True, text=True, timeout=10).stdout.strip() or None
+        except (OSError, subprocess.SubprocessError):
+            return None
+    return {"commit": git("rev-parse", "HEAD"), "describe": git("describe", "--always", "--dirty"), "branch": git("rev-parse", "--abbrev-ref", "HEAD")}
+
+# ----------------------------------------------------------------------------- worker
+
+def seed_local_postgres(size: int, seed: int) -> Dict[str, Any]:
+    from core.pg_copy import connect, PgCopyLoader
+    from ledger import build_dims, iter_transactions, BENCH_TAG
+
+    dims = build_dims(seed)
+    conn = connect()
+    try:
+        with conn.cursor() as cur:
+            for user in dims["dim_users"]:
+                cur.execute(
+                    "INSERT INTO dim_users (id, alias, color_hex) VALUES (%s, %s, %s) ON CONFLICT (id) DO NOTHING",
+                    (user["id"], user["alias"], user["color_hex"])
+                )
+            for wallet in dims["dim_wallets"]:
+                cur.execute(
+                    "INSERT INTO dim_wallets (id, owner_name, wallet_name, is_active) VALUES (%s, %s, %s, true) ON CONFLICT (id) DO NOTHING",
+                    (wallet["id"], wallet["owner_name"], wallet["wallet_name"])
+                )
+            for category in dims["dim_categories"]:
+                category["category"] = f"[bench] {category['category']}"
+                cur.execute(
+                    "INSERT INTO dim_categories (category_id, category, subcategory, type, color_hex) VALUES (%s, %s, %s, %s, %s) "
+                    "ON CONFLICT (category, subcategory) DO UPDATE SET type = EXCLUDED.type RETURNING subcategory_id",
+                    (category["category_id"], category["category"], category["subcategory"], category["type"], category["color_hex"])
+                )
+                category["subcategory_id"] = cur.fetchone()[0]
+        conn.commit()
+    finally:
+        conn.close()
+
+    columns = ["id", "amount", "transaction_date", "wallet_fk", "to_wallet_fk", "subcategory_fk", "created_by_fk", "status",
+               "tag", "is_excluded_from_stats", "description", "created_at", "updated_at"]
+    rows = ((tuple(tx[c] for c in columns)) for tx in iter_transactions(size, dims, seed, tag=BENCH_TAG))
+
+    def chunks(chunk_size=10000):
+        chunk = []
+        for row in rows:
+            chunk.append(row)
+            if len(chunk) >= chunk_size:
+                yield chunk
+                chunk = []
+        if chunk:
+            yield chunk
+
+    for _ in PgCopyLoader().iter_copy("fact_transactions", columns, chunks()):
+        pass
+    return dims
+
+def cleanup_local_postgres(dims: Dict[str, Any]):
+    from core.pg_copy import connect
+    from ledger import BENCH_TAG
+
+    conn = connect()
+    try:
+        with conn.cursor() as cur:
+            cur.execute("CREATE TEMP TABLE bench_ids ON COMMIT DROP AS SELECT id::text AS id FROM fact_transactions WHERE tag = %s", (BENCH_TAG,))
+            cur.execute("DELETE FROM fact_transactions WHERE id::text IN (SELECT id FROM bench_ids)")
+            # The delete trigger wrote one tombstone per row; they belong to the benchmark too.
+            cur.execute("DELETE FROM sync_tombstones WHERE table_name = 'fact_transactions' AND row_id IN (SELECT id FROM bench_ids)")
+            cur.execute("DELETE FROM dim_categories WHERE subcategory_id = ANY(%s)", ([c["subcategory_id"] for c in dims["dim_categories"]],))
+            cur.execute("DELETE FROM dim_users WHERE id = ANY(%s::uuid[])", ([u["id"] for u in dims["dim_users"]],))
+            cur.execute("DELETE FROM dim_wallets WHERE id = ANY(%s::uuid[])", ([w["id"] for w in dims["dim_wallets"]],))
+        conn.commit()
+    except Exception as e:
+        conn.rollback()
+        print(f"BENCH WARNING: cleanup of benchmark rows failed: {e}")
+    finally:
+        conn.close()
+
+def run_worker(args) -> Dict[str, Any]:
+    sys.path.insert(0, str(SRC_DIR))
+    sys.path.insert(0, str(BENCH_DIR))
+    from PyQt6.QtCore import Qt
+    from PyQt6.QtWidgets import QApplication
+    app = QApplication.instance() or QApplication([])
+
+    dims = seed_local_postgres(args.size, args.seed) if args.backend == "local" else None
+    # On a real database the ledger also holds the user's own rows; writes only ever touch seeded ones.
+    writable = None
+    if dims is not None:
+        from ledger import iter_transactions
+        writable = {tx["id"] for tx in iter_transactions(args.size, dims, args.seed)}
+    try:
+        from services.budget_service import BudgetService
+        from models.budget_types import BudgetColumn
+        from models.transaction_frame import TransactionFrame
+        from ui.tabs.budget_tab import BudgetTab
+
+        service = BudgetService()
+        users = service.user_service.get_users(force=True)
+        service.user_service.set_active_user_id(next(iter(users)))
+        wanted = set(args.scenarios)
+        results: Dict[str, Dict[str, Any]] = {}
+        frame = TransactionFrame()
+
+        def record(name, samples, **extra):
+            results[name] = {**summarize(samples), **extra}
+            print(f"  {args.size:>9,} {name:<20} median {results[name]['median_s'] * 1000:10.1f} ms", file=sys.stderr, flush=True)
+
+        def full_load(_):
+            nonlocal frame
+            frame = TransactionFrame()
+            for page in service.iter_ui_transaction_pages():
+                frame.extend(page)
+
+        # Always run once: every later scenario works on the loaded ledger.
+        samples = measure(full_load, args.repeat if "full_load" in wanted else 1, setup=lambda _: service.sync_service.reset())
+        if "full_load" in wanted:
+            record("full_load", samples, rows=len(frame))
+
+        if "incremental_refresh" in wanted:
+            record("incremental_refresh", measure(lambda _: list(service.iter_ui_transaction_pages()), args.repeat))
+
+        if "replica_startup" in wanted:
+            def replica_startup(_):
+                if not service.load_local_cache():
+                    raise RuntimeError("local replica was not written by the full load")
+                list(service.iter_local_ui_transaction_pages())
+            record("replica_startup", measure(replica_startup, args.repeat, setup=lambda _: service.sync_service.reset()))
+            # Leave the sync state as a normal session would have it.
+            service.sync_service.sync()
+
+        tab = BudgetTab()
+        snapshot = service.get_cache_snapshot()
+
+        def ui_refresh(_):
+            tab.on_data_chunk({"snapshot": snapshot})
+            tab.on_data_chunk({"transactions": frame})
+            tab.on_data_loaded()
+
+        samples = measure(ui_refresh, args.repeat if "ui_refresh" in wanted else 1)
+        if "ui_refresh" in wanted:
+            record("ui_refresh", samples)
+
+        if "populate_table" in wanted:
+            record("populate_table", measure(lambda _: tab.populate_table(frame), args.repeat))
+
+        if "filter_search" in wanted:
+            record("filter_search", measure(
+                lambda i: tab.search_input.setText(SEARCH_QUERIES[i % len(SEARCH_QUERIES)]), args.repeat,
+                setup=lambda _: tab.search_input.clear()
+            ), visible_rows=tab.proxy.rowCount())
+            tab.search_input.clear()
+
+        if "filter_author" in wanted and tab.user_filter_combo.count() > 1:
+            record("filter_author", measure(
+                lambda i: tab.user_filter_combo.setCurrentIndex(1 + i % (tab.user_filter_combo.count() - 1)), args.repeat,
+                setup=lambda _: tab.user_filter_combo.setCurrentIndex(0)
+            ))
+            tab.user_filter_combo.setCurrentIndex(0)
+
+        if "sort_amount" in wanted:
+            orders = [Qt.SortOrder.DescendingOrder, Qt.SortOrder.AscendingOrder]
+            record("sort_amount", measure(lambda i: tab.table.sortByColumn(BudgetColumn.AMOUNT, orders[i % 2]), args.repeat))
+
+        rows = [r for r in range(tab.model.rowCount()) if writable is None or str(tab.model.row_id_at(r)) in writable]
+
+        if "edit_amount" in wanted and rows:
+            record("edit_amount", measure(
+                lambda i: tab.on_cell_edited(rows[(i * 7919) % len(rows)], BudgetColumn.AMOUNT, f"{10 + i},{i % 100:02d}"),
+                max(args.repeat, 10)
+            ))
+
+        if "delete_100" in wanted and len(rows) >= 100:
+            batches = [[tab.model.row_id_at(r) for r in rows[start:start + 100]] for start in range(0, min(len(rows), 100 * args.repeat), 100)]
+            def delete_batch(i):
+                if service.delete_transactions(batches[i]) != len(batches[i]):
+                    raise RuntimeError("stand-in rejected a bulk delete")
+            record("delete_100", measure(delete_batch, len(batches)))
+
+        return {"size": args.size, "rows_loaded": len(frame), "peak_rss_mb": peak_rss_mb(), "scenarios": results}
+    finally:
+        if dims is not None:
+            cleanup_local_postgres(dims)
+
+# ----------------------------------------------------------------------------- runner
+
+def start_stand_in(size: int, seed: int):
+    process = subprocess.Popen(
+        [sys.executable, str(BENCH_DIR / "stand_in.py"), "--size", str(size), "--seed", str(seed), "--port", "0"],
+        stdout=subprocess.PIPE, text=True
+    )
+    line = process.stdout.readline()
+    if not line:
+        process.kill()
+        raise RuntimeError("stand-in server did not start")
+    return process, json.loads(line)["url"]
+
+def run_size(size: int, args) -> Dict[str, Any]:
+    stand_in, url = (None, None)
+    started = time.perf_counter()
+    if args.backend == "stand-in":
+        stand_in, url = start_stand_in(size, args.seed)
+        print(f"Seeded stand-in with {size:,} transactions in {time.perf_counter() - started:.1f} s ({url})", flush=True)
+
+    try:
+        with tempfile.TemporaryDirectory(prefix="bench_") as work_dir:
+            env = dict(os.environ)
+            env.setdefault("QT_QPA_PLATFORM", "offscreen")
+            env.update({
+                "LOCAL_REPLICA_PATH": str(Path(work_dir) / "replica.db"),
+                "ATTACHMENT_CACHE_DIR": str(Path(work_dir) / "attachment_cache"),
+                "PYTHONPATH": os.pathsep.join([str(SRC_DIR), env.get("PYTHONPATH", "")]),
+            })
+            if stand_in is not None:
+                # Never let a stand-in run reach the database configured in .env.
+                env.update({
+                    "SUPABASE_URL": url, "SUPABASE_SECRET_KEY": "stand-in",
+                    "DB_HOST": "127.0.0.1", "DB_PORT": "9", "DB_USER": "stand-in", "DB_PASSWORD": "stand-in",
+                })
+
+            result_path = Path(work_dir) / "result.json"
+            command = [
+                sys.executable, str(Path(__file__).resolve()), "--worker", "--size", str(size), "--seed", str(args.seed),
+                "--repeat", str(args.repeat), "--backend", args.backend, "--scenarios", ",".join(args.scenarios),
+                "--result-file", str(result_path),
+            ]
+            # cwd is the scratch dir: the app writes user_prefs.json next to the process.
+            # Timings go to stderr, so --verbose only adds the application's own output.
+            completed = subprocess.run(command, cwd=work_dir, env=env, stdout=None if args.verbose else subprocess.DEVNULL)
+            if completed.returncode != 0 or not result_path.exists():
+                raise RuntimeError(f"benchmark worker for {size} rows failed (exit code {completed.returncode})")
+            return json.loads(result_path.read_text(encoding="utf-8"))
+    finally:
+        if stand_in is not None:
+            stand_in.terminate()
+            stand_in.wait(timeout=30)
+
+def compare(current: Dict[str, Any], baseline: Dict[str, Any], threshold: float) -> List[str]:
+    base = {(r["size"], name): s for r in baseline["results"] for name, s in r["scenarios"].items()}
+    regressions = []
+    print(f"\n{'scenario':<20} {'size':>9} {'baseline ms':>12} {'current ms':>12} {'change':>8}")
+    for result in current["results"]:
+        for name, stats in result["scenarios"].items():
+            old = base.get((result["size"], name))
+            if old is None:
+                continue
+            change = stats["median_s"] / old["median_s"] - 1 if old["median_s"] else 0.0
+            flag = change > threshold and stats["median_s"] > NOISE_FLOOR_S
+            if flag:
+                regressions.append(f"{name} @ {result['size']}: {change:+.0%}")
+            print(f"{name:<20} {result['size']:>9,} {old['median_s'] * 1000:>12.1f} {stats['median_s'] * 1000:>12.1f} {change:>+8.0%}{'  <-- regression' if flag else ''}")
+    return regressions
+
+def run(args) -> int:
+    try:
+        from PyQt6.QtCore import PYQT_VERSION_STR
+    except ImportError:
+        PYQT_VERSION_STR = None
+    report = {
+        "format": 1,
+        "started_at": datetime.now(timezone.utc).isoformat(timespec="seconds"),
+        "git": git_info(),
+        "environment": {
+            "python": platform.python_version(), "platform": platform.platform(), "machine": platform.machine(),
+            "cpu_count": os.cpu_count(), "pyqt": PYQT_VERSION_STR,
+        },
+        "settings": {"backend": args.backend, "repeat": args.repeat, "seed": args.seed, "scenarios": args.scenarios},
+        "results": [],
+    }
+    for size in args.sizes:
+        try:
+            report["results"].append(run_size(size, args))
+        except Exception as e:
+            print(f"BENCH ERROR ({size} rows): {e}")
+            report["results"].append({"size": size, "error": str(e), "scenarios": {}})
+
+    output = Path(args.output) if args.output else \
+        RESULTS_DIR / f"{datetime.now().strftime('%Y%m%d-%H%M%S')}_{(report['git']['describe'] or 'nogit')}.json"
+    output.parent.mkdir(parents=True, exist_ok=True)
+    output.write_text(json.dumps(report, indent=2), encoding="utf-8")
+    print(f"\nResults written to {output}")
+
+    failed = any("error" in r for r in report["results"])
+    if args.compare:
+        regressions = compare(report, json.loads(Path(args.compare).read_text(encoding="utf-8")), args.threshold)
+        if regressions:
+            print("\nRegressions above threshold: " + "; ".join(regressions))
+            return 1
+    return 1 if failed else 0
+
+def parse_list(value: str, cast=str) -> list:
+    return [cast(v.strip().replace("_", "")) if cast is int else v.strip() for v in value.split(",") if v.strip()]
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Time BudgetService and BudgetTab hot paths against synthetic ledgers.")
+    parser.add_argument("--sizes", type=lambda v: parse_list(v, int), default=DEFAULT_SIZES,
+                        help="comma-separated ledger sizes (default: 1000,10000,100000,1000000)")
+    parser.add_argument("--scenarios", type=parse_list, default=SCENARIOS, help=f"comma-separated subset of: {', '.join(SCENARIOS)}")
+    parser.add_argument("--repeat", type=int, default=3, help="samples per scenario (edits always take at least 10)")
+    parser.add_argument("--seed", type=int, default=1, help="random seed of the synthetic ledger")
+    parser.add_argument("--backend", choices=["stand-in", "local"], default="stand-in",
+                        help="stand-in: in-memory REST/storage server; local: the local Supabase stack from .env, seeded with COPY")
+    parser.add_argument("--allow-remote", action="store_true", help="allow --backend local against a non-localhost SUPABASE_URL")
+    parser.add_argument("--output", help="result file (default: bench_results/<timestamp>_<git describe>.json)")
+    parser.add_argument("--compare", help="baseline result file; exits 1 if a median regressed beyond --threshold")
+    parser.add_argument("--threshold", type=float, default=0.2, help="allowed relative slowdown per scenario (default 0.2)")
+    parser.add_argument("--verbose", action="store_true", help="show application output of the benchmark workers")
+    parser.add_argument("--worker", action="store_true", help=argparse.SUPPRESS)
+    parser.add_argument("--size", type=int, help=argparse.SUPPRESS)
+    parser.add_argument("--result-file", help=argparse.SUPPRESS)
+    args = parser.parse_args()
+
+    unknown = set(args.scenarios) - set(SCENARIOS)
+    if unknown:
+        parser.error(f"unknown scenarios: {', '.join(sorted(unknown))}")
+
+    if args.worker:
+        result = run_worker(args)
+        Path(args.result_file).write_text(json.dumps(result), encoding="utf-8")
+        sys.exit(0)
+
+    if args.backend == "local" and not args.allow_remote:
+        sys.path.insert(0, str(SRC_DIR))
+        from urllib.parse import urlsplit
+        from core.config import Config
+        if urlsplit(Config.SUPABASE_URL or "").hostname not in ("localhost", "127.0.0.1", "::1"):
+            parser.error("--backend local seeds and deletes rows; SUPABASE_URL must point at a local stack (or pass --allow-remote)")
+    sys.exit(run(args))
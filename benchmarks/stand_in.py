@@ -0,0 +1,587 @@
+import argparse
+import bisect
+import hashlib
+import json
+import re
+import sys
+import threading
+import uuid
+from collections import defaultdict
+from datetime import date, datetime, timedelta, timezone
+from http.server import ThreadingHTTPServer, BaseHTTPRequestHandler
+from pathlib import Path
+from typing import Dict, Any, List, Optional, Callable, Iterable, Tuple
+from urllib.parse import urlsplit, parse_qsl
+
+sys.path.insert(0, str(Path(__file__).resolve().parent))
+from ledger import build_dims, iter_transactions
+
+# An in-memory stand-in for the subset of PostgREST and Supabase Storage the app
+# talks to. Not a database: no types, constraints or RLS - just enough query
+# semantics (filters, or/and, order, limit, keyset, one embed) to drive the real
+# client code, fast enough to page through a million rows.
+
+RESERVED_PARAMS = {"select", "order", "limit", "offset", "on_conflict", "columns"}
+SERIAL_TABLES = {"dim_categories", "dim_budget_goals", "sync_tombstones"}
+KEYSET = re.compile(r"^\((\w+)\.(lt|gt)\.([^,]+),and\(\1\.eq\.\3,(\w+)\.\2\.([^)]+)\)\)$")
+EMBEDS = {("fact_transactions", "dim_categories"): ("subcategory_fk", "subcategory_id")}
+
+def now() -> str:
+    return datetime.now(timezone.utc).isoformat(timespec="microseconds")
+
+def split_top(text: str) -> List[str]:
+    parts, depth, current = [], 0, []
+    for ch in text:
+        if ch == "(":
+            depth += 1
+        elif ch == ")":
+            depth -= 1
+        if ch == "," and depth == 0:
+            parts.append("".join(current))
+            current = []
+        else:
+            current.append(ch)
+    if current:
+        parts.append("".join(current))
+    return [p.strip() for p in parts]
+
+def _like(pattern: str, flags=0):
+    regex = re.compile("".join(".*" if ch in "*%" else re.escape(ch) for ch in pattern), flags | re.S)
+    return lambda value, _: regex.fullmatch(str(value)) is not None
+
+OPS = {
+    "eq": lambda v, a: v == a, "neq": lambda v, a: v != a,
+    "gt": lambda v, a: v > a, "gte": lambda v, a: v >= a,
+    "lt": lambda v, a: v < a, "lte": lambda v, a: v <= a,
+}
+
+def compile_condition(column: str, op: str, arg: str) -> Callable[[Dict[str, Any]], bool]:
+    if op == "not":
+        inner_op, inner_arg = arg.split(".", 1)
+        inner = compile_condition(column, inner_op, inner_arg)
+        return lambda row: not inner(row)
+    if op == "is":
+        expected = {"null": None, "true": True, "false": False}[arg.lower()]
+        return lambda row: row.get(column) is expected
+    if op == "in":
+        values = {v.strip('"') for v in split_top(arg[1:-1])}
+        return lambda row: row.get(column) is not None and str(row.get(column)) in values
+    if op in ("like", "ilike"):
+        match = _like(arg, re.I if op == "ilike" else 0)
+    else:
+        match = OPS[op]
+    try:
+        number = float(arg)
+    except ValueError:
+        number = None
+    flag = arg == "true"
+
+    def predicate(row):
+        value = row.get(column)
+        if value is None:
+            return False
+        if isinstance(value, bool):
+            return match(value, flag)
+        if isinstance(value, (int, float)):
+            return number is not None and match(value, number)
+        return match(value, arg)
+    return predicate
+
+def compile_expression(expr: str) -> Callable[[Dict[str, Any]], bool]:
+    if expr.startswith(("and(", "or(")):
+        kind, inner = expr.split("(", 1)
+        return compile_group(kind, "(" + inner)
+    column, op, arg = expr.split(".", 2)
+    return compile_condition(column, op, arg)
+
+def compile_group(kind: str, body: str) -> Callable[[Dict[str, Any]], bool]:
+    parts = [compile_expression(p) for p in split_top(body[1:-1])]
+    if kind == "and":
+        return lambda row: all(p(row) for p in parts)
+    return lambda row: any(p(row) for p in parts)
+
+def parse_select(select: Optional[str]) -> Tuple[Optional[List[str]], List[Tuple[str, str, List[str]]]]:
+    if not select or select.strip() == "*":
+        return None, []
+    columns, embeds, star = [], [], False
+    for item in split_top(select):
+        if "(" in item:
+            name, inner = item.split("(", 1)
+            alias, _, relation = name.rpartition(":")
+            relation = relation.split("!")[0].strip()
+            embeds.append((alias.strip() or relation, relation, [c.strip() for c in inner[:-1].split(",")]))
+        elif item == "*":
+            star = True
+        else:
+            columns.append(item.split(":")[-1].strip())
+    return (None if star else columns), embeds
+
+def parse_order(order: Optional[str]) -> List[Tuple[str, bool]]:
+    keys = []
+    for part in (order or "").split(","):
+        if part:
+            bits = part.split(".")
+            keys.append((bits[0], len(bits) > 1 and bits[1] == "desc"))
+    return keys
+
+class Table:
+    def __init__(self, name: str, pk: str, index: Tuple[str, ...] = ()):
+        self.name = name
+        self.pk = pk
+        self.rows: Dict[Any, Dict[str, Any]] = {}
+        self.index_columns = index
+        self.index: List[tuple] = []
+
+    def _key(self, row: Dict[str, Any]) -> tuple:
+        return tuple(row.get(c) or "" for c in self.index_columns)
+
+    def load(self, rows: Iterable[Dict[str, Any]]):
+        self.rows = {row[self.pk]: row for row in rows}
+        if self.index_columns:
+            self.index = sorted(self._key(row) for row in self.rows.values())
+
+    def put(self, row: Dict[str, Any]):
+        old = self.rows.get(row[self.pk])
+        if old is not None:
+            self.remove(old)
+        self.rows[row[self.pk]] = row
+        if self.index_columns:
+            bisect.insort(self.index, self._key(row))
+
+    def remove(self, row: Dict[str, Any]):
+        self.rows.pop(row[self.pk], None)
+        if self.index_columns:
+            key = self._key(row)
+            i = bisect.bisect_left(self.index, key)
+            if i < len(self.index) and self.index[i] == key:
+                del self.index[i]
+
+    def ordered(self, order: List[Tuple[str, bool]], keyset: Optional[tuple]) -> Optional[Iterable[Dict[str, Any]]]:
+        # Serves ORDER BY on the index columns (one direction) without sorting, starting
+        # right after the keyset cursor - one page of a 1M-row walk costs one bisect.
+        if not self.index_columns or [c for c, _ in order] != list(self.index_columns[:len(order)]):
+            return None
+        if len(order) != len(self.index_columns) or len({desc for _, desc in order}) != 1:
+            return None
+        desc = order[0][1]
+        index, rows, pk_pos = self.index, self.rows, self.index_columns.index(self.pk)
+        if desc:
+            start = bisect.bisect_left(index, keyset) - 1 if keyset else len(index) - 1
+            positions = range(start, -1, -1)
+        else:
+            start = bisect.bisect_right(index, keyset) if keyset else 0
+            positions = range(start, len(index))
+        return (rows[index[i][pk_pos]] for i in positions)
+
+class StandInStore:
+    def __init__(self):
+        self.lock = threading.RLock()
+        self.version = 0
+        self.tables: Dict[str, Table] = {
+            "fact_transactions": Table("fact_transactions", "id", ("transaction_date", "id")),
+            "dim_users": Table("dim_users", "id"),
+            "dim_wallets": Table("dim_wallets", "id"),
+            "dim_categories": Table("dim_categories", "subcategory_id"),
+            "dim_budget_goals": Table("dim_budget_goals", "id"),
+            "sync_tombstones": Table("sync_tombstones", "id"),
+            "sync_tombstone_horizon": Table("sync_tombstone_horizon", "table_name"),
+        }
+        self.by_id = Table("fact_transactions", "id", ("id",))
+        self.storage: Dict[str, Dict[str, Any]] = {}
+        self._view_cache: Dict[str, Tuple[int, List[Dict[str, Any]]]] = {}
+
+    def seed(self, count: int, seed: int = 1):
+        dims = build_dims(seed)
+        with self.lock:
+            for name, rows in dims.items():
+                self.tables[name].load(rows)
+            transactions = list(iter_transactions(count, dims, seed))
+            self.tables["fact_transactions"].load(transactions)
+            self.by_id.load(transactions)
+            self.tables["dim_budget_goals"].load([
+                {"id": i + 1, "tag": tag, "monthly_target_amount": amount, "is_active": True,
+                 "created_at": now(), "updated_at": now(), "deleted_at": None}
+                for i, (tag, amount) in enumerate([("paliwo", 600.0), ("jedzenie", 1500.0), ("kino", 120.0)])
+            ])
+            self.version += 1
+
+    def _write(self, table: str, row: Dict[str, Any]):
+        self.tables[table].put(row)
+        if table == "fact_transactions":
+            self.by_id.put(row)
+
+    def _delete(self, table: str, row: Dict[str, Any]):
+        self.tables[table].remove(row)
+        if table == "fact_transactions":
+            self.by_id.remove(row)
+            tombstones = self.tables["sync_tombstones"]
+            tombstones.put({"id": len(tombstones.rows) + 1, "table_name": table, "row_id": row["id"], "deleted_at": now()})
+
+    def _view(self, name: str) -> List[Dict[str, Any]]:
+        cached = self._view_cache.get(name)
+        if cached is not None and cached[0] == self.version:
+            return cached[1]
+        rows = self.tables["fact_transactions"].rows.values()
+        if name == "v_distinct_tags":
+            result = [{"tag": t} for t in sorted({r["tag"] for r in rows if r.get("tag") and not r.get("deleted_at")})]
+        elif name == "v_distinct_authors":
+            result = [{"created_by_fk": a} for a in sorted({r["created_by_fk"] for r in rows if not r.get("deleted_at")})]
+        else:
+            raise KeyError(name)
+        self._view_cache[name] = (self.version, result)
+        return result
+
+    def select(self, table: str, params: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        options = dict(params)
+        filters, keyset = [], None
+        order = parse_order(options.get("order"))
+        source = self.by_id if table == "fact_transactions" and [c for c, _ in order] == ["id"] else self.tables.get(table)
+
+        for key, value in params:
+            if key in RESERVED_PARAMS:
+                continue
+            if key in ("or", "and"):
+                match = KEYSET.match(value) if key == "or" and source is not None else None
+                if match and source.index_columns == (match.group(1), match.group(4)):
+                    keyset = (match.group(3), match.group(5))
+                filters.append(compile_group(key, value))
+            else:
+                op, arg = value.split(".", 1)
+                if source is not None and source.index_columns == (key,) and op == "gt" and [c for c, _ in order] == [key]:
+                    keyset = (arg,)
+                filters.append(compile_condition(key, op, arg))
+
+        limit = int(options["limit"]) if "limit" in options else None
+        offset = int(options.get("offset", 0))
+        with self.lock:
+            if source is None:
+                candidates = self._view(table)
+                ordered = None
+            else:
+                candidates = source.rows.values()
+                ordered = source.ordered(order, keyset) if order else None
+
+            if ordered is not None:
+                result = []
+                for row in ordered:
+                    if all(f(row) for f in filters):
+                        if offset:
+                            offset -= 1
+                            continue
+                        result.append(row)
+                        if limit is not None and len(result) >= limit:
+                            break
+            else:
+                result = [row for row in candidates if all(f(row) for f in filters)]
+                for column, desc in reversed(order):
+                    # PostgreSQL defaults: NULLS LAST ascending, NULLS FIRST descending.
+                    result.sort(key=lambda r, c=column: (True, 0) if r.get(c) is None else (False, r[c]), reverse=desc)
+                result = result[offset:offset + limit if limit is not None else None]
+            return self._project(table, result, options.get("select"))
+
+    def _project(self, table: str, rows: List[Dict[str, Any]], select: Optional[str]) -> List[Dict[str, Any]]:
+        columns, embeds = parse_select(select)
+        out = [dict(row) if columns is None else {c: row.get(c) for c in columns} for row in rows]
+        for alias, relation, embed_columns in embeds:
+            local, remote = EMBEDS.get((table, relation), (None, None))
+            target = self.tables[relation].rows if remote == self.tables[relation].pk else {}
+            for row, source in zip(out, rows):
+                related = target.get(source.get(local))
+                row[alias] = None if related is None else (
+                    dict(related) if embed_columns == ["*"] else {c: related.get(c) for c in embed_columns}
+                )
+        return out
+
+    def insert(self, table: str, body: Any, on_conflict: Optional[str], upsert: bool) -> List[Dict[str, Any]]:
+        target = self.tables[table]
+        inserted = []
+        with self.lock:
+            for data in body if isinstance(body, list) else [body]:
+                row = dict(data)
+                if upsert and on_conflict and on_conflict != target.pk:
+                    existing = next((r for r in target.rows.values() if r.get(on_conflict) == row.get(on_conflict)), None)
+                    if existing is not None:
+                        row[target.pk] = existing[target.pk]
+                existing = target.rows.get(row.get(target.pk))
+                if existing is not None:
+                    if not upsert:
+                        raise ValueError(f"duplicate key value violates unique constraint \"{table}_pkey\"")
+                    row = {**existing, **row, "updated_at": now()}
+                else:
+                    if row.get(target.pk) is None:
+                        row[target.pk] = max(target.rows, default=0) + 1 if table in SERIAL_TABLES else str(uuid.uuid4())
+                    stamp = now()
+                    row.setdefault("created_at", stamp)
+                    row.setdefault("updated_at", stamp)
+                    if table == "fact_transactions":
+                        row.setdefault("status", "COMPLETED")
+                        row.setdefault("is_excluded_from_stats", False)
+                        row.setdefault("deleted_at", None)
+                        for key in ("to_wallet_fk", "sentiment", "tag", "attachment_path", "attachment_type", "description"):
+                            row.setdefault(key, None)
+                self._write(table, row)
+                inserted.append(row)
+            self.version += 1
+        return [dict(r) for r in inserted]
+
+    def update(self, table: str, params: List[Tuple[str, str]], fields: Dict[str, Any]) -> List[Dict[str, Any]]:
+        with self.lock:
+            matched = self._match(table, params)
+            stamp = now()
+            for row in matched:
+                self._write(table, {**row, **fields, "updated_at": stamp})
+            self.version += 1
+            return [dict(self.tables[table].rows[r[self.tables[table].pk]]) for r in matched]
+
+    def delete(self, table: str, params: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        with self.lock:
+            matched = self._match(table, params)
+            for row in matched:
+                self._delete(table, row)
+            self.version += 1
+            return matched
+
+    def _match(self, table: str, params: List[Tuple[str, str]]) -> List[Dict[str, Any]]:
+        target = self.tables[table]
+        filters, keys = [], None
+        for key, value in params:
+            if key in RESERVED_PARAMS:
+                continue
+            if key in ("or", "and"):
+                filters.append(compile_group(key, value))
+                continue
+            op, arg = value.split(".", 1)
+            # Primary-key filters (edits, chunked in_ deletes) are point lookups, not scans.
+            if key == target.pk and op in ("eq", "in") and keys is None:
+                keys = [arg] if op == "eq" else [v.strip('"') for v in split_top(arg[1:-1])]
+                if table in SERIAL_TABLES:
+                    keys = [int(k) for k in keys]
+            filters.append(compile_condition(key, op, arg))
+        candidates = target.rows.values() if keys is None else [target.rows[k] for k in keys if k in target.rows]
+        return [row for row in candidates if all(f(row) for f in filters)]
+
+    def rpc(self, name: str, args: Dict[str, Any]) -> Any:
+        with self.lock:
+            if name == "fn_budget_goal_progress":
+                return self._goal_progress(args)
+            if name == "fn_find_attachment":
+                return self._find_attachment(args)
+        raise KeyError(name)
+
+    def _find_attachment(self, args: Dict[str, Any]) -> Optional[str]:
+        prefix = f"{args['p_bucket']}/{args['p_folder']}/" if args["p_folder"] else f"{args['p_bucket']}/"
+        ext = args.get("p_ext") or ""
+        full, short = f"__{args['p_hash']}{ext}", f"__{args['p_hash'][:12]}{ext}"
+        for key, obj in self.storage.items():
+            name = key[len(prefix):]
+            if not key.startswith(prefix) or "/" in name:
+                continue
+            if (name.endswith(full) and len(name) > len(full)) or \
+                    (name.endswith(short) and len(name) > len(short) and (obj.get("user_metadata") or {}).get("sha256") == args["p_hash"]):
+                return key.split("/", 1)[1]
+        return None
+
+    def _goal_progress(self, args: Dict[str, Any]) -> List[Dict[str, Any]]:
+        month = date.fromisoformat(args.get("p_month") or date.today().isoformat()).replace(day=1)
+        next_month = (month + timedelta(days=32)).replace(day=1)
+        categories = self.tables["dim_categories"].rows
+        tags = set(args["p_tags"]) if args.get("p_tags") is not None else None
+        goals = [g for g in self.tables["dim_budget_goals"].rows.values()
+                 if not g.get("deleted_at") and g.get("is_active", True) and (tags is None or g["tag"] in tags)]
+        spent = defaultdict(lambda: [0.0, 0])
+        wanted = {g["tag"] for g in goals}
+        lo, hi = month.isoformat(), next_month.isoformat()
+        for t in self.tables["fact_transactions"].rows.values():
+            if t.get("tag") in wanted and lo <= t["transaction_date"] < hi and not t.get("deleted_at") \
+                    and not t.get("is_excluded_from_stats") and (categories.get(t["subcategory_fk"]) or {}).get("type") == "EXPENSE":
+                spent[t["tag"]][0] += float(t["amount"])
+                spent[t["tag"]][1] += 1
+        result = []
+        for g in sorted(goals, key=lambda g: -float(g["monthly_target_amount"])):
+            target, (total, count) = float(g["monthly_target_amount"]), spent[g["tag"]]
+            result.append({
+                "goal_id": g["id"], "tag": g["tag"], "monthly_target_amount": target, "month": lo,
+                "spent": round(total, 2), "remaining": round(target - total, 2),
+                "progress_pct": round(total * 100 / target, 1) if target > 0 else None, "tx_count": count
+            })
+        return result
+
+class StandInHandler(BaseHTTPRequestHandler):
+    protocol_version = "HTTP/1.1"
+    store: StandInStore = None
+
+    def log_message(self, *args):
+        pass
+
+    def _send(self, status: int, body: Any = None, headers: Dict[str, str] = None, content_type: str = "application/json"):
+        data = body if isinstance(body, bytes) else b"" if body is None else json.dumps(body, default=str).encode("utf-8")
+        self.send_response(status)
+        self.send_header("Content-Type", content_type)
+        for key, value in (headers or {}).items():
+            self.send_header(key, value)
+        self.send_header("Content-Length", str(len(data)))
+        self.end_headers()
+        if self.command != "HEAD":
+            self.wfile.write(data)
+
+    def _error(self, status: int, message: str):
+        self._send(status, {"code": str(status), "message": message, "details": None, "hint": None})
+
+    def _request(self) -> Tuple[str, List[Tuple[str, str]]]:
+        url = urlsplit(self.path)
+        return url.path, parse_qsl(url.query, keep_blank_values=True)
+
+    def _raw_body(self) -> bytes:
+        length = int(self.headers.get("Content-Length") or 0)
+        return self.rfile.read(length) if length else b""
+
+    def _json_body(self) -> Any:
+        raw = self._raw_body()
+        return json.loads(raw) if raw else None
+
+    def _dispatch(self):
+        path, params = self._request()
+        try:
+            if path.startswith("/storage/v1/"):
+                return self._storage(path[len("/storage/v1/"):])
+            if path.startswith("/rest/v1/rpc/"):
+                return self._send(200, self.store.rpc(path[len("/rest/v1/rpc/"):], self._json_body() or {}))
+            if path.startswith("/rest/v1/"):
+                return self._rest(path[len("/rest/v1/"):], params)
+            self._error(404, "not found")
+        except KeyError as e:
+            self._error(404, f"relation or function {e} does not exist")
+        except ValueError as e:
+            self._error(409, str(e))
+
+    def _rest(self, table: str, params: List[Tuple[str, str]]):
+        prefer = self.headers.get("Prefer", "")
+        minimal = "return=minimal" in prefer
+        if self.command in ("GET", "HEAD"):
+            return self._send(200, self.store.select(table, params))
+        if self.command == "POST":
+            rows = self.store.insert(table, self._json_body(), dict(params).get("on_conflict"), "merge-duplicates" in prefer)
+            return self._send(201, None if minimal else rows)
+        if self.command == "PATCH":
+            rows = self.store.update(table, params, self._json_body() or {})
+            return self._send(204 if minimal else 200, None if minimal else rows)
+        if self.command == "DELETE":
+            self._raw_body()
+            rows = self.store.delete(table, params)
+            return self._send(204 if minimal else 200, None if minimal else rows)
+        self._error(405, "method not allowed")
+
+    def _storage(self, path: str):
+        store = self.store.storage
+        if path.startswith("object/list/"):
+            return self._send(200, self._storage_list(path[len("object/list/"):], self._json_body() or {}))
+        if path.startswith("object/sign/"):
+            self._raw_body()
+            key = path[len("object/sign/"):]
+            return self._send(200, {"signedURL": f"/object/sign/{key}?token=stand-in"})
+        key = re.sub(r"^object/(authenticated/|public/|info/)?", "", path)
+        obj = store.get(key)
+        if self.command in ("GET", "HEAD"):
+            if obj is None:
+                return self._send(400, {"statusCode": "404", "error": "not_found", "message": "Object not found"})
+            etag = f"\"{obj['etag']}\""
+            if self.headers.get("If-None-Match") == etag:
+                return self._send(304, None, {"ETag": etag})
+            return self._send(200, obj["data"], {"ETag": etag}, obj["content_type"])
+        if self.command in ("POST", "PUT"):
+            raw = self._raw_body()
+            if obj is not None and self.command == "POST" and self.headers.get("x-upsert") != "true":
+                return self._send(400, {"statusCode": "409", "error": "Duplicate", "message": "The resource already exists"})
+            data, content_type, metadata = self._multipart_file(raw)
+            store[key] = {"data": data, "content_type": content_type, "etag": hashlib.md5(data).hexdigest(),
+                          "user_metadata": metadata, "updated_at": now()}
+            return self._send(200, {"Key": key, "Id": key})
+        if self.command == "DELETE":
+            body = self._json_body() or {}
+            for name in body.get("prefixes", []):
+                store.pop(f"{key}/{name}", None)
+            store.pop(key, None)
+            return self._send(200, [])
+        self._error(405, "method not allowed")
+
+    def _multipart_file(self, raw: bytes) -> Tuple[bytes, str, Dict[str, Any]]:
+        content_type = self.headers.get("Content-Type", "")
+        if not content_type.startswith("multipart/form-data"):
+            return raw, content_type or "application/octet-stream", {}
+        boundary = b"--" + content_type.split("boundary=", 1)[1].encode()
+        data, file_type, metadata = raw, "application/octet-stream", {}
+        for part in raw.split(boundary):
+            head, _, body = part.partition(b"\r\n\r\n")
+            if b'name="file"' in head:
+                match = re.search(rb"Content-Type: ([^\r\n]+)", head)
+                data, file_type = body[:-2], match.group(1).decode() if match else file_type
+            elif b'name="metadata"' in head:
+                metadata = json.loads(body[:-2] or b"{}")
+        return data, file_type, metadata
+
+    def _storage_list(self, bucket: str, body: Dict[str, Any]) -> List[Dict[str, Any]]:
+        prefix = (body.get("prefix") or "").strip("/")
+        search = (body.get("search") or "").lower()
+        entries: Dict[str, Optional[Dict[str, Any]]] = {}
+        for key, obj in self.store.storage.items():
+            obj_bucket, _, name = key.partition("/")
+            if obj_bucket != bucket or (prefix and not name.startswith(prefix + "/")):
+                continue
+            tail = name[len(prefix) + 1:] if prefix else name
+            if search and not tail.lower().startswith(search):
+                continue
+            if "/" in tail:
+                entries.setdefault(tail.split("/", 1)[0], None)
+            else:
+                entries[tail] = obj
+        listing = []
+        for name in sorted(entries):
+            obj = entries[name]
+            listing.append({"name": name, "id": None, "metadata": None} if obj is None else {
+                "name": name, "id": obj["etag"], "updated_at": obj["updated_at"],
+                "metadata": {"size": len(obj["data"]), "mimetype": obj["content_type"], "eTag": f"\"{obj['etag']}\""}
+            })
+        offset = int(body.get("offset", 0))
+        return listing[offset:offset + int(body.get("limit", 100))]
+
+    do_GET = do_HEAD = do_POST = do_PATCH = do_PUT = do_DELETE = _dispatch
+
+class StandInServer:
+    def __init__(self, store: StandInStore, port: int = 0):
+        handler = type("BoundStandInHandler", (StandInHandler,), {"store": store})
+        self.store = store
+        self.httpd = ThreadingHTTPServer(("127.0.0.1", port), handler)
+        self.httpd.daemon_threads = True
+        self.thread: Optional[threading.Thread] = None
+
+    @property
+    def url(self) -> str:
+        return f"http://127.0.0.1:{self.httpd.server_address[1]}"
+
+    def start(self) -> "StandInServer":
+        self.thread = threading.Thread(target=self.httpd.serve_forever, daemon=True)
+        self.thread.start()
+        return self
+
+    def stop(self):
+        self.httpd.shutdown()
+        self.httpd.server_close()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Serve a seeded in-memory stand-in for the Supabase REST and storage APIs.")
+    parser.add_argument("--size", type=int, default=10000, help="number of synthetic transactions to seed")
+    parser.add_argument("--seed", type=int, default=1, help="random seed of the synthetic ledger")
+    parser.add_argument("--port", type=int, default=54321, help="port to listen on (0 picks a free one)")
+    args = parser.parse_args()
+
+    store = StandInStore()
+    store.seed(args.size, args.seed)
+    server = StandInServer(store, args.port)
+    # The first line is machine-read by the benchmark runner.
+    print(json.dumps({"url": server.url, "size": args.size}), flush=True)
+    try:
+        server.httpd.serve_forever()
+    except KeyboardInterrupt:
+        pass
+    finally:
+        server.httpd.server_close()
@@ -0,0 +1,46 @@
+-- =============================================================================
+-- PROJECT: supa-meta-budget
+-- DESCRIPTION: Find an attachment blob by content hash, whatever its readable name
+-- VERSION: 1.12
+-- =============================================================================
+BEGIN;
+
+-- Attachments are stored as {folder}/{name}__{first 12 hex of sha256}{ext}, with the full
+-- sha256 in the object's user metadata; a blob whose short name was taken by other
+-- content carries the full digest in its name instead. The same content uploaded under
+-- another file name has another path, so upload dedupe looks for the digest among the
+-- folder's objects. plpgsql resolves storage.objects at call time, so the function also
+-- installs where there is no Supabase storage schema.
+CREATE OR REPLACE FUNCTION fn_find_attachment(
+    p_bucket text,
+    p_folder text,
+    p_hash text,
+    p_ext text DEFAULT ''
+)
+RETURNS text
+LANGUAGE plpgsql STABLE
+AS $$
+DECLARE
+    v_prefix text := CASE WHEN p_folder = '' THEN '' ELSE p_folder || '/' END;
+    v_short text := '__' || left(p_hash, 12) || p_ext;
+    v_full text := '__' || p_hash || p_ext;
+    v_name text;
+BEGIN
+    SELECT o.name INTO v_name
+    FROM storage.objects o
+    WHERE o.bucket_id = p_bucket
+      AND o.name LIKE replace(replace(replace(v_prefix, '\', '\\'), '%', '\%'), '_', '\_') || '%'
+      AND strpos(substr(o.name, length(v_prefix) + 1), '/') = 0
+      AND (
+          (right(o.name, length(v_full)) = v_full AND length(o.name) > length(v_prefix) + length(v_full))
+          OR (right(o.name, length(v_short)) = v_short
+              AND length(o.name) > length(v_prefix) + length(v_short)
+              AND o.user_metadata ->> 'sha256' = p_hash)
+      )
+    ORDER BY o.created_at
+    LIMIT 1;
+    RETURN v_name;
+END;
+$$;
+
+COMMIT;
@@ -0,0 +1,87 @@
+-- =============================================================================
+-- PROJECT: supa-meta-budget
+-- DESCRIPTION: Delta sync support (tombstones for hard deletes, watermark indexes)
+-- VERSION: 1.3
+-- =============================================================================
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS sync_tombstones (
+    id bigserial PRIMARY KEY,
+    table_name varchar NOT NULL,
+    row_id varchar NOT NULL,
+    deleted_at timestamptz NOT NULL DEFAULT clock_timestamp()
+);
+
+CREATE OR REPLACE FUNCTION record_sync_tombstone()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO sync_tombstones (table_name, row_id)
+    VALUES (TG_TABLE_NAME, to_jsonb(OLD) ->> TG_ARGV[0]);
+    RETURN OLD;
+END;
+$$ LANGUAGE plpgsql;
+
+
+CREATE TRIGGER trg_transactions_tombstone AFTER DELETE ON fact_transactions FOR EACH ROW EXECUTE PROCEDURE record_sync_tombstone('id');
+
+
+CREATE INDEX idx_sync_tombstones_table_deleted ON sync_tombstones(table_name, deleted_at);
+CREATE INDEX idx_fact_transactions_updated_at ON fact_transactions(updated_at);
+CREATE INDEX idx_fact_transactions_created_at ON fact_transactions(created_at);
+
+
+-- Retention: tombstones older than p_keep are pruned. The newest pruned deleted_at is
+-- kept per table; a client whose tombstone watermark is below it may have missed
+-- deletes and reloads in full.
+CREATE TABLE IF NOT EXISTS sync_tombstone_horizon (
+    table_name varchar PRIMARY KEY,
+    pruned_through timestamptz NOT NULL
+);
+
+CREATE OR REPLACE FUNCTION prune_sync_tombstones(p_keep interval DEFAULT interval '30 days')
+RETURNS integer AS $$
+DECLARE
+    v_pruned integer;
+BEGIN
+    WITH pruned AS (
+        DELETE FROM sync_tombstones
+        WHERE deleted_at < now() - p_keep
+        RETURNING table_name, deleted_at
+    ), horizon AS (
+        SELECT table_name, max(deleted_at) AS pruned_through, count(*) AS pruned_count
+        FROM pruned
+        GROUP BY table_name
+    ), saved AS (
+        INSERT INTO sync_tombstone_horizon (table_name, pruned_through)
+        SELECT table_name, pruned_through FROM horizon
+        ON CONFLICT (table_name) DO UPDATE
+        SET pruned_through = GREATEST(sync_tombstone_horizon.pruned_through, EXCLUDED.pruned_through)
+    )
+    SELECT COALESCE(sum(pruned_count), 0)::integer INTO v_pruned FROM horizon;
+    RETURN v_pruned;
+END;
+$$ LANGUAGE plpgsql;
+
+
+-- Daily prune via pg_cron where available; otherwise call prune_sync_tombstones() directly.
+DO $cron$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_cron') THEN
+        RAISE NOTICE 'pg_cron is not installed; prune_sync_tombstones() is not scheduled.';
+        RETURN;
+    END IF;
+
+    BEGIN
+        CREATE EXTENSION IF NOT EXISTS pg_cron;
+        PERFORM cron.schedule(
+            'prune-sync-tombstones',
+            '30 3 * * *',
+            $job$SELECT prune_sync_tombstones()$job$
+        );
+    EXCEPTION WHEN OTHERS THEN
+        RAISE NOTICE 'pg_cron could not be loaded (%); prune_sync_tombstones() is not scheduled.', SQLERRM;
+    END;
+END
+$cron$;
+
+COMMIT;
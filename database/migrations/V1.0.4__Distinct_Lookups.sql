@@ -0,0 +1,20 @@
+-- =============================================================================
+-- PROJECT: supa-meta-budget
+-- DESCRIPTION: Distinct lookup views for tag and author pickers
+-- VERSION: 1.4
+-- =============================================================================
+BEGIN;
+
+CREATE INDEX idx_fact_transactions_tag ON fact_transactions(tag) WHERE tag IS NOT NULL;
+
+CREATE OR REPLACE VIEW v_distinct_tags AS
+SELECT DISTINCT tag
+FROM fact_transactions
+WHERE tag IS NOT NULL AND tag <> '' AND deleted_at IS NULL;
+
+CREATE OR REPLACE VIEW v_distinct_authors AS
+SELECT DISTINCT created_by_fk
+FROM fact_transactions
+WHERE created_by_fk IS NOT NULL AND deleted_at IS NULL;
+
+COMMIT;
@@ -0,0 +1,114 @@
+-- =============================================================================
+-- PROJECT: supa-meta-budget
+-- DESCRIPTION: Materialized monthly rollups for Metabase dashboards
+-- VERSION: 1.6
+-- =============================================================================
+BEGIN;
+
+CREATE MATERIALIZED VIEW mv_monthly_rollup AS
+SELECT
+    date_trunc('month', t.transaction_date)::date AS month,
+    c.type::text AS type,
+    t.subcategory_fk,
+    c.category,
+    c.subcategory,
+    t.wallet_fk,
+    w.wallet_name,
+    t.created_by_fk,
+    u.alias AS author,
+    COALESCE(t.sentiment::text, '-') AS sentiment,
+    t.status::text AS status,
+    COALESCE(t.is_excluded_from_stats, false) AS is_excluded_from_stats,
+    count(*) AS tx_count,
+    sum(t.amount) AS total_amount
+FROM fact_transactions t
+JOIN dim_categories c ON c.subcategory_id = t.subcategory_fk
+JOIN dim_wallets w ON w.id = t.wallet_fk
+JOIN dim_users u ON u.id = t.created_by_fk
+WHERE t.deleted_at IS NULL
+GROUP BY 1, 2, 3, 4, 5, 6, 7, 8, 9, 10, 11, 12
+WITH DATA;
+
+-- REFRESH ... CONCURRENTLY needs a unique index over plain columns covering every row.
+CREATE UNIQUE INDEX idx_mv_monthly_rollup_key ON mv_monthly_rollup
+    (month, subcategory_fk, wallet_fk, created_by_fk, sentiment, status, is_excluded_from_stats);
+CREATE INDEX idx_mv_monthly_rollup_month ON mv_monthly_rollup(month);
+
+
+CREATE TABLE IF NOT EXISTS rollup_refresh_state (
+    view_name varchar PRIMARY KEY,
+    refreshed_at timestamptz
+);
+
+INSERT INTO rollup_refresh_state (view_name, refreshed_at)
+VALUES ('mv_monthly_rollup', now())
+ON CONFLICT (view_name) DO NOTHING;
+
+-- One row per writing transaction. Writers only insert their own key, so they never
+-- wait on each other; later statements of the same transaction hit the existing key.
+CREATE TABLE IF NOT EXISTS rollup_pending_changes (
+    xid xid8 PRIMARY KEY
+);
+
+CREATE OR REPLACE FUNCTION mark_rollups_dirty()
+RETURNS TRIGGER AS $$
+BEGIN
+    INSERT INTO rollup_pending_changes (xid) VALUES (pg_current_xact_id()) ON CONFLICT DO NOTHING;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION refresh_monthly_rollups(p_force boolean DEFAULT false)
+RETURNS boolean AS $$
+DECLARE
+    v_snapshot pg_snapshot;
+BEGIN
+    IF NOT p_force AND NOT EXISTS (SELECT 1 FROM rollup_pending_changes) THEN
+        RETURN false;
+    END IF;
+
+    -- The refresh takes its own snapshot after this one, so every writer visible here is
+    -- in the view. Writers still running (or not yet started) keep their rows, and rows
+    -- that commit later become visible to the next run.
+    v_snapshot := pg_current_snapshot();
+    REFRESH MATERIALIZED VIEW CONCURRENTLY mv_monthly_rollup;
+
+    DELETE FROM rollup_pending_changes WHERE pg_visible_in_snapshot(xid, v_snapshot);
+    UPDATE rollup_refresh_state SET refreshed_at = now() WHERE view_name = 'mv_monthly_rollup';
+    RETURN true;
+END;
+$$ LANGUAGE plpgsql;
+
+
+-- Statement-level: a bulk insert of thousands of rows marks the flag once.
+CREATE TRIGGER trg_transactions_rollup_dirty AFTER INSERT OR UPDATE OR DELETE OR TRUNCATE ON fact_transactions FOR EACH STATEMENT EXECUTE PROCEDURE mark_rollups_dirty();
+CREATE TRIGGER trg_categories_rollup_dirty AFTER UPDATE OR DELETE ON dim_categories FOR EACH STATEMENT EXECUTE PROCEDURE mark_rollups_dirty();
+CREATE TRIGGER trg_wallets_rollup_dirty AFTER UPDATE OR DELETE ON dim_wallets FOR EACH STATEMENT EXECUTE PROCEDURE mark_rollups_dirty();
+CREATE TRIGGER trg_users_rollup_dirty AFTER UPDATE OR DELETE ON dim_users FOR EACH STATEMENT EXECUTE PROCEDURE mark_rollups_dirty();
+
+
+-- Scheduled refresh via pg_cron (available on Supabase); a no-op when nothing changed.
+-- Without pg_cron the view is refreshed by calling refresh_monthly_rollups() directly.
+DO $cron$
+BEGIN
+    IF NOT EXISTS (SELECT 1 FROM pg_available_extensions WHERE name = 'pg_cron') THEN
+        RAISE NOTICE 'pg_cron is not installed; refresh_monthly_rollups() is not scheduled.';
+        RETURN;
+    END IF;
+
+    -- Installed but not in shared_preload_libraries: CREATE EXTENSION fails and only
+    -- this block is rolled back.
+    BEGIN
+        CREATE EXTENSION IF NOT EXISTS pg_cron;
+        PERFORM cron.schedule(
+            'refresh-monthly-rollups',
+            '*/10 * * * *',
+            $job$SELECT refresh_monthly_rollups()$job$
+        );
+    EXCEPTION WHEN OTHERS THEN
+        RAISE NOTICE 'pg_cron could not be loaded (%); refresh_monthly_rollups() is not scheduled.', SQLERRM;
+    END;
+END
+$cron$;
+
+COMMIT;
@@ -0,0 +1,69 @@
+-- =============================================================================
+-- PROJECT: supa-meta-budget
+-- DESCRIPTION: Budget goal progress (monthly spend per tag) as a PostgREST RPC
+-- VERSION: 1.7
+-- =============================================================================
+BEGIN;
+
+CREATE OR REPLACE FUNCTION fn_budget_goal_progress(
+    p_month date DEFAULT NULL,
+    p_tags text[] DEFAULT NULL
+)
+RETURNS TABLE (
+    goal_id int,
+    tag varchar,
+    monthly_target_amount numeric,
+    month date,
+    spent numeric,
+    remaining numeric,
+    progress_pct numeric,
+    tx_count bigint
+)
+LANGUAGE sql STABLE
+AS $$
+    WITH bounds AS (
+        SELECT date_trunc('month', COALESCE(p_month, current_date))::date AS month_start
+    )
+    SELECT
+        g.id,
+        g.tag,
+        g.monthly_target_amount,
+        b.month_start,
+        COALESCE(s.spent, 0),
+        g.monthly_target_amount - COALESCE(s.spent, 0),
+        CASE WHEN g.monthly_target_amount > 0
+             THEN round(COALESCE(s.spent, 0) * 100 / g.monthly_target_amount, 1)
+        END,
+        COALESCE(s.tx_count, 0)
+    FROM dim_budget_goals g
+    CROSS JOIN bounds b
+    -- One (tag, transaction_date) range scan per goal instead of a pass over the month.
+    LEFT JOIN LATERAL (
+        SELECT sum(t.amount) AS spent, count(*) AS tx_count
+        FROM fact_transactions t
+        JOIN dim_categories c ON c.subcategory_id = t.subcategory_fk
+        WHERE t.tag = g.tag
+          AND t.transaction_date >= b.month_start
+          AND t.transaction_date < (b.month_start + interval '1 month')::date
+          AND t.deleted_at IS NULL
+          AND c.type = 'EXPENSE'
+          AND NOT COALESCE(t.is_excluded_from_stats, false)
+    ) s ON true
+    WHERE g.deleted_at IS NULL
+      AND COALESCE(g.is_active, true)
+      AND (p_tags IS NULL OR g.tag = ANY(p_tags))
+    ORDER BY g.monthly_target_amount DESC
+$$;
+
+CREATE OR REPLACE VIEW v_budget_goal_progress AS
+SELECT * FROM fn_budget_goal_progress();
+
+COMMIT;
+
+-- Built without locking writes; must run outside a transaction block.
+CREATE INDEX CONCURRENTLY IF NOT EXISTS idx_fact_transactions_tag_date
+    ON fact_transactions(tag, transaction_date)
+    WHERE tag IS NOT NULL AND deleted_at IS NULL;
+
+-- The (tag) index from V1.0.4 is a prefix of the one above.
+DROP INDEX CONCURRENTLY IF EXISTS idx_fact_transactions_tag;
@@ -0,0 +1,94 @@
+-- =============================================================================
+-- PROJECT: supa-meta-budget
+-- DESCRIPTION: Trigger-maintained tag/author lookup tables behind the distinct views
+-- VERSION: 1.8
+-- =============================================================================
+BEGIN;
+
+CREATE TABLE IF NOT EXISTS dim_tags (
+    tag varchar PRIMARY KEY,
+    tx_count bigint NOT NULL DEFAULT 0
+);
+
+CREATE TABLE IF NOT EXISTS dim_transaction_authors (
+    created_by_fk uuid PRIMARY KEY,
+    tx_count bigint NOT NULL DEFAULT 0
+);
+
+INSERT INTO dim_tags (tag, tx_count)
+SELECT tag, count(*)
+FROM fact_transactions
+WHERE tag IS NOT NULL AND tag <> '' AND deleted_at IS NULL
+GROUP BY tag
+ON CONFLICT (tag) DO UPDATE SET tx_count = EXCLUDED.tx_count;
+
+INSERT INTO dim_transaction_authors (created_by_fk, tx_count)
+SELECT created_by_fk, count(*)
+FROM fact_transactions
+WHERE created_by_fk IS NOT NULL AND deleted_at IS NULL
+GROUP BY created_by_fk
+ON CONFLICT (created_by_fk) DO UPDATE SET tx_count = EXCLUDED.tx_count;
+
+-- Live rows count +1 from the new side and -1 from the old side, so one statement
+-- handles inserts, soft deletes, restores, retags and hard deletes alike.
+CREATE OR REPLACE FUNCTION apply_lookup_counts()
+RETURNS TRIGGER AS $$
+DECLARE
+    delta_rows text;
+BEGIN
+    IF TG_OP = 'INSERT' THEN
+        delta_rows := 'SELECT tag, created_by_fk, 1 AS n FROM new_rows WHERE deleted_at IS NULL';
+    ELSIF TG_OP = 'DELETE' THEN
+        delta_rows := 'SELECT tag, created_by_fk, -1 AS n FROM old_rows WHERE deleted_at IS NULL';
+    ELSE
+        delta_rows := 'SELECT tag, created_by_fk, 1 AS n FROM new_rows WHERE deleted_at IS NULL '
+                   || 'UNION ALL SELECT tag, created_by_fk, -1 FROM old_rows WHERE deleted_at IS NULL';
+    END IF;
+
+    EXECUTE format(
+        'INSERT INTO dim_tags (tag, tx_count) '
+        'SELECT tag, sum(n) FROM (%s) d WHERE tag IS NOT NULL AND tag <> '''' GROUP BY tag HAVING sum(n) <> 0 '
+        'ON CONFLICT (tag) DO UPDATE SET tx_count = dim_tags.tx_count + EXCLUDED.tx_count', delta_rows);
+    EXECUTE format(
+        'INSERT INTO dim_transaction_authors (created_by_fk, tx_count) '
+        'SELECT created_by_fk, sum(n) FROM (%s) d WHERE created_by_fk IS NOT NULL GROUP BY created_by_fk HAVING sum(n) <> 0 '
+        'ON CONFLICT (created_by_fk) DO UPDATE SET tx_count = dim_transaction_authors.tx_count + EXCLUDED.tx_count', delta_rows);
+
+    DELETE FROM dim_tags WHERE tx_count <= 0;
+    DELETE FROM dim_transaction_authors WHERE tx_count <= 0;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+CREATE OR REPLACE FUNCTION clear_lookup_counts()
+RETURNS TRIGGER AS $$
+BEGIN
+    DELETE FROM dim_tags;
+    DELETE FROM dim_transaction_authors;
+    RETURN NULL;
+END;
+$$ LANGUAGE plpgsql;
+
+
+-- Statement-level with transition tables: a bulk insert or COPY is counted in one pass.
+CREATE TRIGGER trg_transactions_lookup_insert AFTER INSERT ON fact_transactions
+    REFERENCING NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE PROCEDURE apply_lookup_counts();
+CREATE TRIGGER trg_transactions_lookup_update AFTER UPDATE ON fact_transactions
+    REFERENCING OLD TABLE AS old_rows NEW TABLE AS new_rows FOR EACH STATEMENT EXECUTE PROCEDURE apply_lookup_counts();
+CREATE TRIGGER trg_transactions_lookup_delete AFTER DELETE ON fact_transactions
+    REFERENCING OLD TABLE AS old_rows FOR EACH STATEMENT EXECUTE PROCEDURE apply_lookup_counts();
+CREATE TRIGGER trg_transactions_lookup_truncate AFTER TRUNCATE ON fact_transactions
+    FOR EACH STATEMENT EXECUTE PROCEDURE clear_lookup_counts();
+
+
+-- Same names and columns as V1.0.4, so PostgREST callers are unchanged; reads are
+-- now primary-key scans of a small table instead of a DISTINCT over every transaction.
+CREATE OR REPLACE VIEW v_distinct_tags AS
+SELECT tag
+FROM dim_tags;
+
+CREATE OR REPLACE VIEW v_distinct_authors AS
+SELECT created_by_fk
+FROM dim_transaction_authors;
+
+COMMIT;
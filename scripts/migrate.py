@@ -1,55 +1,260 @@
-import os
+import argparse
+import hashlib
+import re
+import sys
+import time
 import psycopg2
 from pathlib import Path
 
-def run_migration():
+BASE_DIR = Path(__file__).parent.parent
+MIGRATIONS_DIR = BASE_DIR / "database" / "migrations"
+
+HISTORY_TABLE = "schema_migration_history"
+# V1.0.0 - V1.0.2 are successive full re-creations of the base schema, not deltas;
+# only the newest one is ever applied and installs made by the old script start at it.
+BASELINE_VERSION = (1, 0, 2)
+ADVISORY_LOCK_ID = 741852963
+
+FILE_PATTERN = re.compile(r"^V(\d+(?:\.\d+)*)__(.+)\.sql$")
+NON_TRANSACTIONAL = re.compile(
+    r"^\s*((CREATE|DROP)\s+(UNIQUE\s+)?INDEX\s+CONCURRENTLY|REINDEX\b.*\bCONCURRENTLY|VACUUM\b)",
+    re.IGNORECASE | re.DOTALL
+)
+TRANSACTION_CONTROL = re.compile(r"^\s*(BEGIN|COMMIT|START\s+TRANSACTION|END)\s*;?\s*$", re.IGNORECASE)
+
+class Migration:
+    def __init__(self, path: Path):
+        match = FILE_PATTERN.match(path.name)
+        self.path = path
+        self.version = tuple(int(part) for part in match.group(1).split("."))
+        self.version_str = match.group(1)
+        self.description = match.group(2).replace("_", " ")
+        self.sql = path.read_text(encoding="utf-8")
+        self.checksum = hashlib.sha256(self.sql.encode("utf-8")).hexdigest()
+
+    def steps(self):
+        # Consecutive statements share one transactional step; each statement that
+        # Postgres refuses inside a transaction (CREATE INDEX CONCURRENTLY...) gets
+        # its own autocommit step.
+        steps, batch = [], []
+        for statement in split_statements(self.sql):
+            if TRANSACTION_CONTROL.match(strip_comments(statement)):
+                continue
+            if NON_TRANSACTIONAL.match(strip_comments(statement)):
+                if batch:
+                    steps.append((True, batch))
+                    batch = []
+                steps.append((False, [statement]))
+            else:
+                batch.append(statement)
+        if batch:
+            steps.append((True, batch))
+        return steps
+
+def strip_comments(sql: str) -> str:
+    return "\n".join(line for line in sql.splitlines() if not line.strip().startswith("--"))
+
+def split_statements(sql: str):
+    statements, current = [], []
+    i, n = 0, len(sql)
+    while i < n:
+        ch = sql[i]
+        if sql.startswith("--", i):
+            end = sql.find("\n", i)
+            end = n if end < 0 else end
+            current.append(sql[i:end])
+            i = end
+            continue
+        if sql.startswith("/*", i):
+            end = sql.find("*/", i + 2)
+            end = n if end < 0 else end + 2
+            current.append(sql[i:end])
+            i = end
+            continue
+        if ch == "'":
+            end = i + 1
+            while end < n:
+                if sql[end] == "'" and sql.startswith("''", end):
+                    end += 2
+                    continue
+                if sql[end] == "'":
+                    break
+                end += 1
+            current.append(sql[i:end + 1])
+            i = end + 1
+            continue
+        if ch == "$":
+            tag = re.match(r"\$[A-Za-z_]*\$", sql[i:])
+            if tag:
+                end = sql.find(tag.group(0), i + len(tag.group(0)))
+                end = n if end < 0 else end + len(tag.group(0))
+                current.append(sql[i:end])
+                i = end
+                continue
+        if ch == ";":
+            current.append(ch)
+            statement = "".join(current).strip()
+            if strip_comments(statement).strip(" ;\n\t"):
+                statements.append(statement)
+            current = []
+            i += 1
+            continue
+        current.append(ch)
+        i += 1
+
+    tail = "".join(current).strip()
+    if strip_comments(tail).strip():
+        statements.append(tail)
+    return statements
+
+def load_env():
     env_vars = {}
-    base_dir = Path(__file__).parent.parent
-    env_path = base_dir / ".env"
-    
+    env_path = BASE_DIR / ".env"
     if env_path.exists():
         with open(env_path, "r", encoding="utf-8") as f:
             for line in f:
                 if "=" in line and not line.strip().startswith("#"):
                     key, val = line.strip().split("=", 1)
                     env_vars[key] = val
+    return env_vars
+
+def discover_migrations():
+    migrations = [Migration(p) for p in MIGRATIONS_DIR.glob("V*.sql") if FILE_PATTERN.match(p.name)]
+    migrations.sort(key=lambda m: m.version)
+    return [m for m in migrations if m.version >= BASELINE_VERSION]
+
+def ensure_history(conn):
+    with conn.cursor() as cur:
+        cur.execute(f"""
+            CREATE TABLE IF NOT EXISTS {HISTORY_TABLE} (
+                version varchar PRIMARY KEY,
+                description varchar NOT NULL,
+                checksum char(64) NOT NULL,
+                applied_at timestamptz NOT NULL DEFAULT now(),
+                execution_ms integer NOT NULL,
+                is_baseline boolean NOT NULL DEFAULT false
+            )
+        """)
+    conn.commit()
+
+def applied_versions(conn):
+    with conn.cursor() as cur:
+        cur.execute(f"SELECT version, checksum FROM {HISTORY_TABLE}")
+        versions = dict(cur.fetchall())
+    conn.commit()
+    return versions
+
+def table_exists(conn, name):
+    with conn.cursor() as cur:
+        cur.execute("SELECT to_regclass(%s) IS NOT NULL", (f"public.{name}",))
+        result = cur.fetchone()[0]
+    conn.commit()
+    return result
 
+def record(conn, migration, elapsed_ms, is_baseline=False):
+    with conn.cursor() as cur:
+        cur.execute(
+            f"INSERT INTO {HISTORY_TABLE} (version, description, checksum, execution_ms, is_baseline) VALUES (%s, %s, %s, %s, %s)",
+            (migration.version_str, migration.description, migration.checksum, elapsed_ms, is_baseline)
+        )
+
+def apply(conn, migration):
+    print(f"Applying V{migration.version_str} ({migration.description})")
+    started = time.perf_counter()
+    steps = migration.steps()
+    # The history row is written in the same transaction as the last step when it
+    # is transactional, so a migration is never recorded without its final changes.
+    record_with_last_step = bool(steps) and steps[-1][0]
+
+    for number, (transactional, statements) in enumerate(steps, start=1):
+        step_started = time.perf_counter()
+        label = f"{len(statements)} statement(s)" if transactional else strip_comments(statements[0]).strip().splitlines()[0][:70]
+        conn.autocommit = not transactional
+        try:
+            with conn.cursor() as cur:
+                for statement in statements:
+                    cur.execute(statement)
+                if record_with_last_step and number == len(steps):
+                    record(conn, migration, int((time.perf_counter() - started) * 1000))
+            if transactional:
+                conn.commit()
+        except Exception as e:
+            if transactional:
+                conn.rollback()
+            print(f"  step {number}/{len(steps)} FAILED: {e}")
+            if number > 1:
+                print(f"  Steps 1-{number - 1} are already committed; make them idempotent (IF NOT EXISTS) before re-running.")
+            if not transactional:
+                print("  A failed concurrent index build leaves an INVALID index; drop it before re-running.")
+            return False
+        finally:
+            conn.autocommit = False
+        print(f"  step {number}/{len(steps)} [{'tx' if transactional else 'no-tx'}] {label}: {(time.perf_counter() - step_started) * 1000:.0f} ms")
+
+    if not record_with_last_step:
+        record(conn, migration, int((time.perf_counter() - started) * 1000))
+        conn.commit()
+    print(f"  done in {(time.perf_counter() - started) * 1000:.0f} ms")
+    return True
+
+def run_migration(dry_run=False):
+    env_vars = load_env()
     try:
         conn = psycopg2.connect(
             host=env_vars.get("DB_HOST"),
-            database="postgres",
+            database=env_vars.get("DB_NAME", "postgres"),
             user=env_vars.get("DB_USER", "postgres"),
             password=env_vars.get("DB_PASSWORD"),
             port=env_vars.get("DB_PORT", "5432")
         )
-        conn.autocommit = True
-        cursor = conn.cursor()
         print("Connected to database.")
     except Exception as e:
         print(f"Connection failed: {e}")
-        return
+        return False
 
-    sql_file_path = base_dir / "database" / "migrations" / "V1.0.2__Base_Schema_Deployment.sql"
-    
-    if not sql_file_path.exists():
-        print(f"SQL file not found: {sql_file_path}")
-        return
+    try:
+        with conn.cursor() as cur:
+            cur.execute("SELECT pg_advisory_lock(%s)", (ADVISORY_LOCK_ID,))
+        conn.commit()
 
-    print(f"Executing: {sql_file_path.name}")
-    with open(sql_file_path, "r", encoding="utf-8") as f:
-        sql_content = f.read()
+        ensure_history(conn)
+        migrations = discover_migrations()
+        applied = applied_versions(conn)
 
-    try:
-        cursor.execute(sql_content)
-        print("Migration successful.")
-    except Exception as e:
-        if "already exists" in str(e):
-            print("Tables already exist.")
-        else:
-            print(f"SQL Error: {e}")
+        if not applied and migrations and table_exists(conn, "fact_transactions"):
+            baseline = migrations[0]
+            print(f"Existing schema without history - baselining at V{baseline.version_str}.")
+            if not dry_run:
+                record(conn, baseline, 0, is_baseline=True)
+                conn.commit()
+            applied[baseline.version_str] = baseline.checksum
+
+        changed = [m for m in migrations if m.version_str in applied and applied[m.version_str] != m.checksum]
+        if changed:
+            for m in changed:
+                print(f"Checksum mismatch: V{m.version_str} was modified after it was applied.")
+            print("Aborting. Ship schema changes as a new migration file instead.")
+            return False
+
+        pending = [m for m in migrations if m.version_str not in applied]
+        if not pending:
+            print("Database is up to date.")
+            return True
+
+        for m in pending:
+            if dry_run:
+                print(f"Pending: V{m.version_str} ({m.description}), {len(m.steps())} step(s)")
+            elif not apply(conn, m):
+                return False
+        return True
     finally:
-        cursor.close()
+        with conn.cursor() as cur:
+            cur.execute("SELECT pg_advisory_unlock(%s)", (ADVISORY_LOCK_ID,))
+        conn.commit()
         conn.close()
 
 if __name__ == "__main__":
-    run_migration()
\ No newline at end of file
+    parser = argparse.ArgumentParser(description="Apply pending database migrations.")
+    parser.add_argument("--dry-run", action="store_true", help="list pending migrations without applying them")
+    args = parser.parse_args()
+    sys.exit(0 if run_migration(dry_run=args.dry_run) else 1)
\ No newline at end of file
@@ -0,0 +1,157 @@
+import hashlib
+import os
+import sqlite3
+import threading
+import time
+from typing import Optional, Dict, Any
+from core.config import Config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cache_entries (
+    storage_path text PRIMARY KEY,
+    file_name text NOT NULL,
+    etag text,
+    size integer NOT NULL,
+    last_access real NOT NULL
+);
+CREATE INDEX IF NOT EXISTS idx_cache_entries_last_access ON cache_entries(last_access);
+"""
+
+class AttachmentCache:
+    _instance = None
+
+    @classmethod
+    def get(cls) -> "AttachmentCache":
+        if cls._instance is None:
+            cls._instance = cls(Config.ATTACHMENT_CACHE_DIR, Config.ATTACHMENT_CACHE_MAX_MB * 1024 * 1024)
+        return cls._instance
+
+    def __init__(self, directory: str, max_bytes: int):
+        self.directory = directory
+        self.max_bytes = max_bytes
+        os.makedirs(directory, exist_ok=True)
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(os.path.join(directory, "index.db"), check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._drop_orphans()
+
+    def _drop_orphans(self):
+        # Entries whose file vanished (manual cleanup, crash mid-eviction) are forgotten.
+        with self._lock, self._conn:
+            rows = self._conn.execute("SELECT storage_path, file_name FROM cache_entries").fetchall()
+            missing = [(r["storage_path"],) for r in rows if not os.path.exists(os.path.join(self.directory, r["file_name"]))]
+            self._conn.executemany("DELETE FROM cache_entries WHERE storage_path = ?", missing)
+
+    @staticmethod
+    def _file_name(storage_path: str) -> str:
+        ext = os.path.splitext(storage_path)[1].lower()
+        return hashlib.sha1(storage_path.encode("utf-8")).hexdigest() + ext
+
+    def lookup(self, storage_path: str) -> Optional[Dict[str, Any]]:
+        with self._lock:
+            row = self._conn.execute("SELECT * FROM cache_entries WHERE storage_path = ?", (storage_path,)).fetchone()
+        if row is None:
+            return None
+        entry = dict(row)
+        entry["local_path"] = os.path.join(self.directory, entry["file_name"])
+        try:
+            size = os.path.getsize(entry["local_path"])
+        except OSError:
+            size = None
+        # A file changed behind the index's back (edited in place, truncated) is refetched.
+        if size != entry["size"]:
+            self.invalidate(storage_path)
+            return None
+        return entry
+
+    def touch(self, storage_path: str):
+        with self._lock, self._conn:
+            self._conn.execute("UPDATE cache_entries SET last_access = ? WHERE storage_path = ?", (time.time(), storage_path))
+
+    def put(self, storage_path: str, data: bytes, etag: Optional[str] = None, file_name: Optional[str] = None) -> str:
+        file_name = file_name or self._file_name(storage_path)
+        local_path = os.path.join(self.directory, file_name)
+        tmp_path = f"{local_path}.{threading.get_ident()}.tmp"
+        with open(tmp_path, "wb") as f:
+            f.write(data)
+        os.replace(tmp_path, local_path)
+
+        with self._lock, self._conn:
+            self._conn.execute(
+                "INSERT OR REPLACE INTO cache_entries (storage_path, file_name, etag, size, last_access) VALUES (?, ?, ?, ?, ?)",
+                (storage_path, file_name, etag, len(data), time.time())
+            )
+        self.evict(keep=storage_path)
+        return local_path
+
+    def read(self, storage_path: str) -> Optional[bytes]:
+        entry = self.lookup(storage_path)
+        if entry is None:
+            return None
+        self.touch(storage_path)
+        with open(entry["local_path"], "rb") as f:
+            return f.read()
+
+    def invalidate(self, storage_path: str):
+        with self._lock, self._conn:
+            row = self._conn.execute("SELECT file_name FROM cache_entries WHERE storage_path = ?", (storage_path,)).fetchone()
+            self._conn.execute("DELETE FROM cache_entries WHERE storage_path = ?", (storage_path,))
+        if row is not None:
+            self._remove_file(row["file_name"])
+
+    def _remove_file(self, file_name: str) -> bool:
+        try:
+            os.remove(os.path.join(self.directory, file_name))
+            return True
+        except FileNotFoundError:
+            return True
+        except OSError:
+            # Still opened by an external viewer (Windows); retried on the next eviction.
+            return False
+
+    def drop_unindexed(self, subdir: str):
+        # Files written before they were indexed (older versions) would never count or be evicted.
+        with self._lock:
+            known = {r["file_name"] for r in self._conn.execute("SELECT file_name FROM cache_entries").fetchall()}
+        directory = os.path.join(self.directory, subdir)
+        if not os.path.isdir(directory):
+            return
+        for name in os.listdir(directory):
+            file_name = os.path.join(subdir, name)
+            if file_name not in known:
+                self._remove_file(file_name)
+
+    def size(self) -> int:
+        with self._lock:
+            return self._conn.execute("SELECT COALESCE(SUM(size), 0) FROM cache_entries").fetchone()[0]
+
+    def evict(self, keep: Optional[str] = None):
+        with self._lock:
+            excess = self.size() - self.max_bytes
+            if excess <= 0:
+                return
+            candidates = self._conn.execute(
+                "SELECT storage_path, file_name, size FROM cache_entries ORDER BY last_access"
+            ).fetchall()
+            removed = []
+            for row in candidates:
+                if excess <= 0:
+                    break
+                if row["storage_path"] == keep:
+                    continue
+                if self._remove_file(row["file_name"]):
+                    removed.append((row["storage_path"],))
+                    excess -= row["size"]
+            with self._conn:
+                self._conn.executemany("DELETE FROM cache_entries WHERE storage_path = ?", removed)
+
+    def clear(self):
+        with self._lock:
+            names = [r["file_name"] for r in self._conn.execute("SELECT file_name FROM cache_entries").fetchall()]
+            with self._conn:
+                self._conn.execute("DELETE FROM cache_entries")
+        for name in names:
+            self._remove_file(name)
@@ -0,0 +1,34 @@
+import os
+import re
+import unicodedata
+from typing import Optional, Tuple
+
+HASH_PREFIX_LEN = 12
+SHA256_HEX_LEN = 64
+MAX_NAME_LEN = 80
+
+# {name}__{first 12 hex digits of the sha256}{ext}: the name keeps the browser and its
+# prefix search readable, the hash suffix keeps the object immutable under its path.
+# The full digest is stored in the object's metadata and is what dedupe compares; it
+# replaces the short one in the name only when other content already took that path.
+HASHED_NAME = re.compile(r"^(?P<name>.+)__(?P<hash>[0-9a-f]{64}|[0-9a-f]{12})(?P<ext>\.[^.]*)?$")
+
+def safe_name(stem: str) -> str:
+    # Storage keys reject most non-ASCII characters.
+    stem = unicodedata.normalize('NFKD', stem).encode('ascii', 'ignore').decode('ascii')
+    stem = re.sub(r'[^\w.-]', '', stem.replace(' ', '_')).strip('._')
+    return stem[:MAX_NAME_LEN] or "plik"
+
+def hashed_name(file_path: str, sha256: str, full: bool = False) -> str:
+    stem, ext = os.path.splitext(os.path.basename(file_path))
+    return f"{safe_name(stem)}__{sha256 if full else sha256[:HASH_PREFIX_LEN]}{ext.lower()}"
+
+def hash_key(storage_path: str) -> Optional[Tuple[str, str, str]]:
+    folder, name = os.path.split(storage_path)
+    match = HASHED_NAME.match(name)
+    return (folder, match.group("hash"), match.group("ext") or "") if match else None
+
+def display_name(storage_path: Optional[str]) -> str:
+    name = os.path.basename(storage_path or "")
+    match = HASHED_NAME.match(name)
+    return f"{match.group('name')}{match.group('ext') or ''}" if match else name
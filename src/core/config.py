@@ -1,5 +1,6 @@
 import os
 import json
+import tempfile
 from pathlib import Path
 from dotenv import load_dotenv
 
@@ -24,6 +25,29 @@ class Config:
     DB_USER = os.getenv("DB_USER")   
     DB_PASSWORD = os.getenv("DB_PASSWORD") 
 
+    LOCAL_REPLICA_PATH = os.getenv("LOCAL_REPLICA_PATH", str(BASE_DIR / "local_replica.db"))
+    SYNC_INTERVAL_SEC = int(os.getenv("SYNC_INTERVAL_SEC", "60"))
+    USER_CACHE_TTL_SEC = int(os.getenv("USER_CACHE_TTL_SEC", "300"))
+    ATTACHMENT_CACHE_DIR = os.getenv("ATTACHMENT_CACHE_DIR", str(BASE_DIR / "attachment_cache"))
+    ATTACHMENT_CACHE_MAX_MB = int(os.getenv("ATTACHMENT_CACHE_MAX_MB", "512"))
+    ATTACHMENT_LIST_TTL_SEC = int(os.getenv("ATTACHMENT_LIST_TTL_SEC", "30"))
+    ATTACHMENT_OPEN_DIR = os.getenv("ATTACHMENT_OPEN_DIR", os.path.join(tempfile.gettempdir(), "supa-meta-budget"))
+
+    IMPORT_METHOD = os.getenv("IMPORT_METHOD", "auto").lower()
+    IMPORT_COPY_CHUNK_SIZE = int(os.getenv("IMPORT_COPY_CHUNK_SIZE", "5000"))
+    IMPORT_MAPPINGS_PATH = os.getenv("IMPORT_MAPPINGS_PATH", str(BASE_DIR / "import_mappings.json"))
+    EXPORT_METHOD = os.getenv("EXPORT_METHOD", "auto").lower()
+    EXPORT_CHUNK_SIZE = int(os.getenv("EXPORT_CHUNK_SIZE", "5000"))
+
+    HTTP2 = os.getenv("HTTP2", "False").lower() == "true"
+    HTTP_POOL_SIZE = int(os.getenv("HTTP_POOL_SIZE", "20"))
+    HTTP_KEEPALIVE_CONNECTIONS = int(os.getenv("HTTP_KEEPALIVE_CONNECTIONS", "10"))
+    HTTP_KEEPALIVE_EXPIRY_SEC = float(os.getenv("HTTP_KEEPALIVE_EXPIRY_SEC", "30"))
+    HTTP_CONNECT_TIMEOUT_SEC = float(os.getenv("HTTP_CONNECT_TIMEOUT_SEC", "10"))
+    HTTP_READ_TIMEOUT_SEC = float(os.getenv("HTTP_READ_TIMEOUT_SEC", "30"))
+    HTTP_WRITE_TIMEOUT_SEC = float(os.getenv("HTTP_WRITE_TIMEOUT_SEC", "60"))
+    HTTP_STORAGE_TIMEOUT_SEC = float(os.getenv("HTTP_STORAGE_TIMEOUT_SEC", "120"))
+
     USERS_MAPPING = {}
     
     @classmethod
@@ -1,5 +1,6 @@
-from supabase import create_client, Client
+from supabase import create_client, Client, ClientOptions
 from core.config import Config
+from core.http_transport import HttpTransport
 
 class Database:
     _client: Client = None
@@ -9,7 +10,8 @@ class Database:
         if cls._client is None:
             cls._client = create_client(
                 Config.SUPABASE_URL, 
-                Config.SUPABASE_SECRET_KEY
+                Config.SUPABASE_SECRET_KEY,
+                options=ClientOptions(httpx_client=HttpTransport.get_client())
             )
         return cls._client
 
@@ -0,0 +1,13 @@
+from PyQt6.QtCore import QObject, pyqtSignal
+
+class EventBus(QObject):
+    _instance = None
+
+    usersChanged = pyqtSignal(int)
+    goalTagsChanged = pyqtSignal(list)
+
+    @classmethod
+    def get(cls) -> "EventBus":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
@@ -0,0 +1,127 @@
+import threading
+from typing import Dict, Any, Optional
+
+import httpx
+
+from core.config import Config
+
+class MeteredTransport(httpx.HTTPTransport):
+    CONNECT_EVENT = "connection.connect_tcp.complete"
+
+    def __init__(self, **kwargs):
+        super().__init__(**kwargs)
+        self._lock = threading.Lock()
+        self.requests = 0
+        self.errors = 0
+        self.in_flight = 0
+        self.peak_in_flight = 0
+        self.connections_opened = 0
+        self.connections_reused = 0
+
+    def handle_request(self, request: httpx.Request) -> httpx.Response:
+        # Connection metrics come from httpcore's public "trace" extension: a request
+        # that never reports a TCP connect was served over a pooled connection.
+        connected = []
+        outer_trace = request.extensions.get("trace")
+
+        def trace(name: str, info: Dict[str, Any]):
+            if name == self.CONNECT_EVENT:
+                connected.append(True)
+            if outer_trace is not None:
+                outer_trace(name, info)
+
+        request.extensions["trace"] = trace
+        with self._lock:
+            self.requests += 1
+            self.in_flight += 1
+            self.peak_in_flight = max(self.peak_in_flight, self.in_flight)
+        try:
+            return super().handle_request(request)
+        except Exception:
+            with self._lock:
+                self.errors += 1
+            raise
+        finally:
+            with self._lock:
+                self.in_flight -= 1
+                if connected:
+                    self.connections_opened += len(connected)
+                else:
+                    self.connections_reused += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            return {
+                "requests": self.requests,
+                "errors": self.errors,
+                "in_flight": self.in_flight,
+                "peak_in_flight": self.peak_in_flight,
+                "connections_opened": self.connections_opened,
+                "connections_reused": self.connections_reused,
+            }
+
+class HttpTransport:
+    STORAGE_PATH = "/storage/v1/"
+    READ_METHODS = ("GET", "HEAD", "OPTIONS")
+
+    _client: Optional[httpx.Client] = None
+    _transport: Optional[MeteredTransport] = None
+    _lock = threading.Lock()
+
+    @classmethod
+    def timeouts(cls) -> Dict[str, httpx.Timeout]:
+        connect = Config.HTTP_CONNECT_TIMEOUT_SEC
+        return {
+            "read": httpx.Timeout(Config.HTTP_READ_TIMEOUT_SEC, connect=connect),
+            "write": httpx.Timeout(Config.HTTP_WRITE_TIMEOUT_SEC, connect=connect),
+            "storage": httpx.Timeout(Config.HTTP_STORAGE_TIMEOUT_SEC, connect=connect),
+        }
+
+    @classmethod
+    def operation_class(cls, request: httpx.Request) -> str:
+        if cls.STORAGE_PATH in request.url.path:
+            return "storage"
+        # PostgREST RPCs are POSTs but read-only here, so they get the read budget.
+        if request.method in cls.READ_METHODS or "/rest/v1/rpc/" in request.url.path:
+            return "read"
+        return "write"
+
+    @classmethod
+    def get_client(cls) -> httpx.Client:
+        with cls._lock:
+            if cls._client is None:
+                timeouts = cls.timeouts()
+
+                def apply_timeout(request: httpx.Request):
+                    request.extensions["timeout"] = timeouts[cls.operation_class(request)].as_dict()
+
+                cls._transport = MeteredTransport(
+                    http2=Config.HTTP2,
+                    limits=httpx.Limits(
+                        max_connections=Config.HTTP_POOL_SIZE,
+                        max_keepalive_connections=Config.HTTP_KEEPALIVE_CONNECTIONS,
+                        keepalive_expiry=Config.HTTP_KEEPALIVE_EXPIRY_SEC,
+                    ),
+                    retries=1,
+                )
+                cls._client = httpx.Client(
+                    transport=cls._transport,
+                    timeout=timeouts["read"],
+                    follow_redirects=True,
+                    event_hooks={"request": [apply_timeout]},
+                )
+        return cls._client
+
+    @classmethod
+    def pool_stats(cls) -> Dict[str, Any]:
+        if cls._transport is None:
+            return {}
+        return cls._transport.stats()
+
+    @classmethod
+    def close(cls):
+        with cls._lock:
+            if cls._client is not None:
+                cls._client.close()
+                cls._client = None
+                cls._transport = None
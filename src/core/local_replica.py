@@ -0,0 +1,256 @@
+import sqlite3
+import threading
+from typing import List, Dict, Any, Optional, Iterable
+from core.config import Config
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS dim_wallets (
+    id text PRIMARY KEY,
+    owner_name text NOT NULL,
+    wallet_name text NOT NULL,
+    is_active integer DEFAULT 1,
+    created_at text,
+    updated_at text,
+    deleted_at text
+);
+
+CREATE TABLE IF NOT EXISTS dim_users (
+    id text PRIMARY KEY,
+    alias text NOT NULL,
+    color_hex text DEFAULT '#888888',
+    default_wallet_fk text REFERENCES dim_wallets(id) ON DELETE SET NULL,
+    created_at text,
+    updated_at text
+);
+
+CREATE TABLE IF NOT EXISTS dim_categories (
+    subcategory_id integer PRIMARY KEY,
+    category_id integer NOT NULL,
+    category text NOT NULL,
+    subcategory text NOT NULL,
+    type text,
+    color_hex text,
+    created_at text,
+    updated_at text,
+    deleted_at text,
+    UNIQUE(category, subcategory)
+);
+
+CREATE TABLE IF NOT EXISTS dim_budget_goals (
+    id integer PRIMARY KEY,
+    tag text NOT NULL UNIQUE,
+    monthly_target_amount numeric NOT NULL,
+    is_active integer DEFAULT 1,
+    created_at text,
+    updated_at text,
+    deleted_at text
+);
+
+CREATE TABLE IF NOT EXISTS fact_transactions (
+    id text PRIMARY KEY,
+    amount text NOT NULL,
+    transaction_date text NOT NULL,
+    wallet_fk text NOT NULL REFERENCES dim_wallets(id),
+    to_wallet_fk text REFERENCES dim_wallets(id),
+    subcategory_fk integer NOT NULL REFERENCES dim_categories(subcategory_id),
+    created_by_fk text NOT NULL REFERENCES dim_users(id),
+    status text DEFAULT 'COMPLETED',
+    sentiment text,
+    tag text,
+    is_excluded_from_stats integer DEFAULT 0,
+    attachment_path text,
+    attachment_type text,
+    description text,
+    created_at text,
+    updated_at text,
+    deleted_at text
+);
+
+CREATE TABLE IF NOT EXISTS sync_state (
+    key text PRIMARY KEY,
+    value text
+);
+
+CREATE INDEX IF NOT EXISTS idx_fact_transactions_date ON fact_transactions(transaction_date);
+CREATE INDEX IF NOT EXISTS idx_fact_transactions_wallet ON fact_transactions(wallet_fk);
+CREATE INDEX IF NOT EXISTS idx_fact_transactions_subcategory ON fact_transactions(subcategory_fk);
+CREATE INDEX IF NOT EXISTS idx_fact_transactions_user ON fact_transactions(created_by_fk);
+CREATE INDEX IF NOT EXISTS idx_fact_transactions_keyset ON fact_transactions(transaction_date DESC, id DESC);
+CREATE INDEX IF NOT EXISTS idx_fact_transactions_tag_date ON fact_transactions(tag, transaction_date) WHERE tag IS NOT NULL;
+"""
+
+TABLE_KEYS = {
+    "dim_wallets": "id",
+    "dim_users": "id",
+    "dim_categories": "subcategory_id",
+    "dim_budget_goals": "id",
+    "fact_transactions": "id",
+}
+
+BOOLEAN_COLUMNS = {"is_active", "is_excluded_from_stats"}
+# Stored with numeric affinity or fetched as numbers: "100.00" and 100 are the same value.
+NUMERIC_COLUMNS = {"amount", "monthly_target_amount"}
+
+TRANSACTIONS_WITH_CATEGORY_SQL = """
+    SELECT t.*, c.type AS c_type, c.category AS c_category,
+           c.subcategory AS c_subcategory, c.color_hex AS c_color_hex
+    FROM fact_transactions t
+    LEFT JOIN dim_categories c ON c.subcategory_id = t.subcategory_fk
+    ORDER BY t.transaction_date DESC, t.id DESC
+"""
+
+class LocalReplica:
+    _instance = None
+
+    @classmethod
+    def get(cls) -> "LocalReplica":
+        if cls._instance is None:
+            cls._instance = cls(Config.LOCAL_REPLICA_PATH)
+        return cls._instance
+
+    def __init__(self, path: str):
+        self.path = path
+        self._lock = threading.RLock()
+        self._conn = sqlite3.connect(path, check_same_thread=False)
+        self._conn.row_factory = sqlite3.Row
+        self._conn.execute("PRAGMA journal_mode=WAL")
+        self._conn.execute("PRAGMA synchronous=NORMAL")
+        self._conn.executescript(SCHEMA)
+        self._columns = {
+            table: [r["name"] for r in self._conn.execute(f"PRAGMA table_info({table})")]
+            for table in TABLE_KEYS
+        }
+
+    def _to_record(self, table: str, row: Dict[str, Any]) -> tuple:
+        values = []
+        for col in self._columns[table]:
+            val = row.get(col)
+            if isinstance(val, bool):
+                val = int(val)
+            elif val is not None and not isinstance(val, (int, float, str)):
+                val = str(val)
+            values.append(val)
+        return tuple(values)
+
+    def _from_record(self, record: sqlite3.Row) -> Dict[str, Any]:
+        row = dict(record)
+        for col in BOOLEAN_COLUMNS.intersection(row):
+            if row[col] is not None:
+                row[col] = bool(row[col])
+        return row
+
+    def _insert_sql(self, table: str) -> str:
+        cols = self._columns[table]
+        placeholders = ", ".join("?" for _ in cols)
+        return f"INSERT OR REPLACE INTO {table} ({', '.join(cols)}) VALUES ({placeholders})"
+
+    @staticmethod
+    def _same_value(column: str, stored: Any, incoming: Any) -> bool:
+        if stored == incoming:
+            return True
+        if column not in NUMERIC_COLUMNS or stored is None or incoming is None:
+            return False
+        try:
+            return float(stored) == float(incoming)
+        except (TypeError, ValueError):
+            return False
+
+    def _same_record(self, table: str, stored: tuple, incoming: tuple) -> bool:
+        return all(map(self._same_value, self._columns[table], stored, incoming))
+
+    def replace_table(self, table: str, rows: Iterable[Dict[str, Any]]):
+        # Dimension tables are re-read on every online load but rarely change: diff them
+        # against the replica and write only changed and vanished rows, or nothing at all.
+        key_pos = self._columns[table].index(TABLE_KEYS[table])
+        incoming = {}
+        for row in rows:
+            record = self._to_record(table, row)
+            incoming[str(record[key_pos])] = record
+
+        with self._lock:
+            stored = {
+                str(r[key_pos]): tuple(r)
+                for r in self._conn.execute(f"SELECT {', '.join(self._columns[table])} FROM {table}")
+            }
+            changed = [
+                record for key, record in incoming.items()
+                if key not in stored or not self._same_record(table, stored[key], record)
+            ]
+            vanished = [key for key in stored if key not in incoming]
+            if changed or vanished:
+                with self._conn:
+                    self._conn.executemany(f"DELETE FROM {table} WHERE {TABLE_KEYS[table]} = ?", [(k,) for k in vanished])
+                    self._conn.executemany(self._insert_sql(table), changed)
+
+    def apply_changes(self, table: str, upserted: Iterable[Dict[str, Any]] = (),
+                      deleted_keys: Iterable[Any] = (), state: Optional[Dict[str, Optional[str]]] = None,
+                      replace: bool = False):
+        records = [self._to_record(table, r) for r in upserted]
+        key_col = TABLE_KEYS[table]
+        with self._lock, self._conn:
+            if replace:
+                self._conn.execute(f"DELETE FROM {table}")
+            self._conn.executemany(f"DELETE FROM {table} WHERE {key_col} = ?", [(str(k),) for k in deleted_keys])
+            self._conn.executemany(self._insert_sql(table), records)
+            if state:
+                self._conn.executemany(
+                    "INSERT OR REPLACE INTO sync_state (key, value) VALUES (?, ?)",
+                    list(state.items())
+                )
+
+    def fetch_all(self, table: str) -> List[Dict[str, Any]]:
+        with self._lock:
+            cursor = self._conn.execute(f"SELECT * FROM {table}")
+            return [self._from_record(r) for r in cursor.fetchall()]
+
+    def fetch_transactions(self) -> List[Dict[str, Any]]:
+        with self._lock:
+            records = self._conn.execute(TRANSACTIONS_WITH_CATEGORY_SQL).fetchall()
+
+        rows = []
+        for record in records:
+            row = self._from_record(record)
+            category = {
+                "type": row.pop("c_type"),
+                "category": row.pop("c_category"),
+                "subcategory": row.pop("c_subcategory"),
+                "color_hex": row.pop("c_color_hex"),
+            }
+            row["dim_categories"] = category if category["category"] is not None else None
+            rows.append(row)
+        return rows
+
+    def fetch_tag_spend(self, tags: List[str], month_start: str, month_end: str) -> Dict[str, tuple]:
+        placeholders = ", ".join("?" for _ in tags)
+        sql = f"""
+            SELECT t.tag, SUM(CAST(t.amount AS REAL)), COUNT(*)
+            FROM fact_transactions t
+            JOIN dim_categories c ON c.subcategory_id = t.subcategory_fk
+            WHERE t.tag IN ({placeholders})
+              AND t.transaction_date >= ? AND t.transaction_date < ?
+              AND t.deleted_at IS NULL
+              AND c.type = 'EXPENSE'
+              AND NOT COALESCE(t.is_excluded_from_stats, 0)
+            GROUP BY t.tag
+        """
+        with self._lock:
+            records = self._conn.execute(sql, [*tags, month_start, month_end]).fetchall()
+        return {r[0]: (r[1] or 0.0, r[2]) for r in records}
+
+    def fetch_tags_for(self, transaction_ids: Iterable[Any]) -> List[str]:
+        ids = [str(i) for i in transaction_ids]
+        tags = set()
+        with self._lock:
+            for start in range(0, len(ids), 500):
+                chunk = ids[start:start + 500]
+                placeholders = ", ".join("?" for _ in chunk)
+                records = self._conn.execute(
+                    f"SELECT DISTINCT tag FROM fact_transactions WHERE tag IS NOT NULL AND id IN ({placeholders})", chunk
+                ).fetchall()
+                tags.update(r[0] for r in records)
+        return sorted(tags)
+
+    def get_state(self, key: str) -> Optional[str]:
+        with self._lock:
+            record = self._conn.execute("SELECT value FROM sync_state WHERE key = ?", (key,)).fetchone()
+        return record["value"] if record else None
@@ -0,0 +1,69 @@
+import csv
+import io
+from typing import Iterable, Iterator, List, Sequence, Dict, Any
+from core.config import Config
+
+def connect():
+    # Imported lazily: the app itself only needs psycopg2 for bulk import and export.
+    import psycopg2
+    return psycopg2.connect(
+        host=Config.DB_HOST,
+        port=Config.DB_PORT,
+        dbname=Config.DB_NAME,
+        user=Config.DB_USER,
+        password=Config.DB_PASSWORD,
+        connect_timeout=int(Config.HTTP_CONNECT_TIMEOUT_SEC)
+    )
+
+class PgCopyLoader:
+    def __init__(self):
+        self.conn = connect()
+
+    @staticmethod
+    def _csv_buffer(rows: Iterable[Sequence]) -> io.StringIO:
+        buffer = io.StringIO()
+        writer = csv.writer(buffer, lineterminator="\n")
+        for row in rows:
+            writer.writerow(["\\N" if v is None else v for v in row])
+        buffer.seek(0)
+        return buffer
+
+    def iter_copy(self, table: str, columns: List[str], chunks: Iterable[List[Sequence]]) -> Iterator[int]:
+        # One transaction for the whole load: progress is reported per chunk, but a
+        # failure part-way leaves nothing behind.
+        sql = f"COPY {table} ({', '.join(columns)}) FROM STDIN WITH (FORMAT csv, NULL '\\N')"
+        try:
+            with self.conn.cursor() as cur:
+                for chunk in chunks:
+                    cur.copy_expert(sql, self._csv_buffer(chunk))
+                    yield len(chunk)
+            self.conn.commit()
+        except BaseException:
+            self.conn.rollback()
+            raise
+        finally:
+            self.conn.close()
+
+class PgCursorStream:
+    def __init__(self):
+        self.conn = connect()
+        self.conn.set_session(readonly=True)
+
+    def iter_chunks(self, sql: str, params: Dict[str, Any], chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+        # A named cursor keeps the result set on the server; only chunk_size rows
+        # are on the client at a time.
+        try:
+            with self.conn.cursor(name="stream_cursor") as cur:
+                cur.itersize = chunk_size
+                cur.execute(sql, params)
+                columns = None
+                while True:
+                    rows = cur.fetchmany(chunk_size)
+                    if not rows:
+                        break
+                    if columns is None:
+                        columns = [d[0] for d in cur.description]
+                    yield [dict(zip(columns, row)) for row in rows]
+        finally:
+            self.conn.rollback()
+            self.conn.close()
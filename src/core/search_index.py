@@ -0,0 +1,74 @@
+from typing import List, Dict, Set, Optional, Sequence
+
+NGRAM = 3
+
+class SearchIndex:
+    def __init__(self):
+        self._texts: List[str] = []
+        self._row_tokens: List[List[int]] = []
+        self._vocab: Dict[str, int] = {}
+        self._tokens: List[str] = []
+        self._postings: List[Set[int]] = []
+        self._grams: Dict[str, List[int]] = {}
+
+    @staticmethod
+    def normalize(text: str) -> str:
+        return text.lower()
+
+    def build(self, texts: Sequence[str]):
+        self._texts = [self.normalize(t) for t in texts]
+        self._vocab = {}
+        self._tokens = []
+        self._postings = []
+        self._grams = {}
+        self._row_tokens = [self._add_row(row, text) for row, text in enumerate(self._texts)]
+
+    def _token_id(self, token: str) -> int:
+        tid = self._vocab.get(token)
+        if tid is None:
+            tid = self._vocab[token] = len(self._tokens)
+            self._tokens.append(token)
+            self._postings.append(set())
+            for gram in {token[j:j + NGRAM] for j in range(len(token) - NGRAM + 1)}:
+                self._grams.setdefault(gram, []).append(tid)
+        return tid
+
+    def _add_row(self, row: int, text: str) -> List[int]:
+        token_ids = [self._token_id(token) for token in set(text.split())]
+        for tid in token_ids:
+            self._postings[tid].add(row)
+        return token_ids
+
+    def update(self, row: int, text: str):
+        for tid in self._row_tokens[row]:
+            self._postings[tid].discard(row)
+        self._texts[row] = self.normalize(text)
+        self._row_tokens[row] = self._add_row(row, self._texts[row])
+
+    def _matching_tokens(self, part: str) -> List[int]:
+        if len(part) < NGRAM:
+            return [tid for token, tid in self._vocab.items() if part in token]
+
+        grams = [part[j:j + NGRAM] for j in range(len(part) - NGRAM + 1)]
+        candidates = min((self._grams.get(g, ()) for g in grams), key=len)
+        tokens = self._tokens
+        return [tid for tid in candidates if part in tokens[tid]]
+
+    def search(self, query: str) -> Optional[Set[int]]:
+        query = self.normalize(query)
+        if not query:
+            return None
+
+        parts = query.split()
+        if not parts:
+            return {row for row, text in enumerate(self._texts) if query in text}
+
+        longest = max(parts, key=len)
+        rows: Set[int] = set()
+        for tid in self._matching_tokens(longest):
+            rows |= self._postings[tid]
+
+        if len(parts) == 1 and longest == query:
+            return rows
+        texts = self._texts
+        return {row for row in rows if query in texts[row]}
@@ -1,37 +1,181 @@
-from typing import Union, Callable
-from PyQt6.QtCore import QObject, pyqtSignal, pyqtSlot
+import inspect
+import threading
+from enum import IntEnum
+from typing import Union, Callable, Dict, Optional
+from PyQt6.QtCore import QObject, QRunnable, QThreadPool, QCoreApplication, QDeadlineTimer, pyqtSignal
 import traceback
 from services.budget_service import BudgetService
 
-class DataLoaderWorker(QObject):
+class TaskPriority(IntEnum):
+    PREFETCH = 0
+    REFRESH = 5
+    USER_EDIT = 10
+
+_thread_state = threading.local()
+
+def _thread_service() -> BudgetService:
+    # Pool threads never expire, so each keeps one service (repositories, caches)
+    # for its whole lifetime.
+    service = getattr(_thread_state, "service", None)
+    if service is None:
+        service = _thread_state.service = BudgetService()
+    return service
+
+def _call_target(service: BudgetService, task_target: Union[str, Callable], args, kwargs):
+    if isinstance(task_target, str):
+        if not hasattr(service, task_target):
+            raise AttributeError(f"Method {task_target} not found")
+        return getattr(service, task_target)(*args, **kwargs)
+    if callable(task_target):
+        return task_target(service, *args, **kwargs)
+    raise TypeError("task_target must be a method name (str) or callable")
+
+class TaskHandle(QObject):
     finished = pyqtSignal(object)
+    progress = pyqtSignal(object)
     error = pyqtSignal(str)
+    done = pyqtSignal()
+
+    def __init__(self, key: str, priority: TaskPriority):
+        super().__init__()
+        self.key = key
+        self.priority = priority
+        self._cancelled = threading.Event()
+
+    def cancel(self):
+        self._cancelled.set()
 
-    def __init__(self, task_target: Union[str, Callable], *args, **kwargs):
+    def is_cancelled(self) -> bool:
+        return self._cancelled.is_set()
+
+    def _guard(self, callback: Callable) -> Callable:
+        return lambda *a: None if self.is_cancelled() else callback(*a)
+
+    def connect(self, finished: Callable = None, progress: Callable = None, error: Callable = None) -> "TaskHandle":
+        if finished: self.finished.connect(self._guard(finished))
+        if progress: self.progress.connect(self._guard(progress))
+        if error: self.error.connect(self._guard(error))
+        return self
+
+class _ScheduledTask(QRunnable):
+    def __init__(self, handle: TaskHandle, task_target: Union[str, Callable], args, kwargs):
         super().__init__()
+        self.handle = handle
         self.task_target = task_target
         self.args = args
         self.kwargs = kwargs
 
-    @pyqtSlot()
     def run(self):
+        handle = self.handle
         try:
-            with BudgetService() as local_service:
+            self._run(handle)
+        finally:
+            handle.done.emit()
+
+    def _run(self, handle: TaskHandle):
+        try:
+            if handle.is_cancelled():
+                return
+            result = _call_target(_thread_service(), self.task_target, self.args, self.kwargs)
+
+            if inspect.isgenerator(result):
+                for chunk in result:
+                    if handle.is_cancelled():
+                        result.close()
+                        return
+                    handle.progress.emit(chunk)
                 result = None
-                
-                if isinstance(self.task_target, str):
-                    if not hasattr(local_service, self.task_target):
-                        raise AttributeError(f"Method {self.task_target} not found")
-                    method = getattr(local_service, self.task_target)
-                    result = method(*self.args, **self.kwargs)
-                    
-                elif callable(self.task_target):
-                    result = self.task_target(local_service, *self.args, **self.kwargs)
-                else:
-                    raise TypeError("task_target must be a method name (str) or callable")
-
-                self.finished.emit(result)
+
+            if not handle.is_cancelled():
+                handle.finished.emit(result)
 
         except Exception as e:
             print(traceback.format_exc())
-            self.error.emit(str(e))
\ No newline at end of file
+            if not handle.is_cancelled():
+                handle.error.emit(str(e))
+
+class TaskScheduler(QObject):
+    MAX_THREADS = 4
+
+    _instance = None
+
+    @classmethod
+    def get(cls) -> "TaskScheduler":
+        if cls._instance is None:
+            cls._instance = cls()
+        return cls._instance
+
+    def __init__(self):
+        super().__init__()
+        self.pool = QThreadPool()
+        self.pool.setMaxThreadCount(self.MAX_THREADS)
+        self.pool.setExpiryTimeout(-1)
+        self._in_flight: Dict[str, TaskHandle] = {}
+        self._handles = set()
+        # Tasks of one key never overlap: a superseded run only stops at its next yield, so
+        # its successor waits in a single pending slot and is started when it is done.
+        self._running: Dict[str, TaskHandle] = {}
+        self._pending: Dict[str, _ScheduledTask] = {}
+
+    def running(self, key: str) -> Optional[TaskHandle]:
+        return self._in_flight.get(key)
+
+    def submit(self, key: str, task_target: Union[str, Callable], *args,
+               priority: TaskPriority = TaskPriority.REFRESH, supersede: bool = False,
+               finished: Callable = None, progress: Callable = None, error: Callable = None,
+               **kwargs) -> TaskHandle:
+        current = self._in_flight.get(key)
+        if current is not None and not current.is_cancelled():
+            if not supersede:
+                return current
+            current.cancel()
+
+        handle = TaskHandle(key, priority)
+        handle.connect(finished=finished, progress=progress, error=error)
+        handle.done.connect(lambda: self._forget(handle))
+        self._in_flight[key] = handle
+        self._handles.add(handle)
+
+        task = _ScheduledTask(handle, task_target, args, kwargs)
+        if key in self._running:
+            self._drop_pending(key)
+            self._pending[key] = task
+        else:
+            self._start(task)
+        return handle
+
+    def _start(self, task: _ScheduledTask):
+        self._running[task.handle.key] = task.handle
+        self.pool.start(task, int(task.handle.priority))
+
+    def _drop_pending(self, key: str):
+        task = self._pending.pop(key, None)
+        if task is not None:
+            task.handle.cancel()
+            self._handles.discard(task.handle)
+
+    def cancel(self, key: str):
+        handle = self._in_flight.pop(key, None)
+        if handle is not None:
+            handle.cancel()
+        self._drop_pending(key)
+
+    def _forget(self, handle: TaskHandle):
+        self._handles.discard(handle)
+        if self._in_flight.get(handle.key) is handle:
+            del self._in_flight[handle.key]
+        if self._running.get(handle.key) is handle:
+            del self._running[handle.key]
+            task = self._pending.pop(handle.key, None)
+            if task is not None:
+                self._start(task)
+
+    def wait_for_done(self, msecs: int = -1) -> bool:
+        # Pending runs start from the done handlers, which need the event loop.
+        deadline = QDeadlineTimer(msecs)
+        while True:
+            if not self.pool.waitForDone(deadline):
+                return False
+            QCoreApplication.processEvents()
+            if not self._running and not self._pending:
+                return True
@@ -0,0 +1,120 @@
+from typing import List, Dict, Any, Optional
+from PyQt6.QtCore import Qt, QAbstractListModel, QModelIndex, pyqtSignal
+from PyQt6.QtGui import QIcon, QPixmap
+from core.workers import TaskScheduler, TaskPriority
+from core.attachment_names import display_name
+
+class AttachmentListModel(QAbstractListModel):
+    PAGE_SIZE = 100
+
+    pageLoaded = pyqtSignal(list)
+    loadingChanged = pyqtSignal(bool)
+
+    def __init__(self, file_icon: QIcon, parent=None):
+        super().__init__(parent)
+        self.file_icon = file_icon
+        self.folder: Optional[str] = None
+        self.search: Optional[str] = None
+        self._files: List[Dict[str, Any]] = []
+        self._rows: Dict[str, int] = {}
+        self._icons: Dict[str, QIcon] = {}
+        self._thumbnails = {}
+        self._has_more = False
+        self._loading = False
+        self._generation = 0
+
+    def reset(self, folder: Optional[str], search: Optional[str] = None):
+        self.beginResetModel()
+        self.folder = folder
+        self.search = search or None
+        self._files = []
+        self._rows = {}
+        self._icons = {}
+        self._thumbnails = {}
+        self._has_more = folder is not None
+        self._loading = False
+        # Pages requested for a previous folder/search are dropped when they arrive.
+        self._generation += 1
+        self.endResetModel()
+        if self._has_more:
+            self.fetchMore(QModelIndex())
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._files)
+
+    def canFetchMore(self, parent=QModelIndex()):
+        return not parent.isValid() and self._has_more and not self._loading
+
+    def fetchMore(self, parent=QModelIndex()):
+        if not self.canFetchMore(parent):
+            return
+        self._loading = True
+        self.loadingChanged.emit(True)
+        generation = self._generation
+        TaskScheduler.get().submit(
+            f"attachment_page:{self.folder}:{self.search}:{len(self._files)}",
+            "get_files_page", self.folder, len(self._files), self.PAGE_SIZE, self.search,
+            priority=TaskPriority.USER_EDIT,
+            finished=lambda page: self._on_page(generation, page),
+            error=lambda _: self._on_page(generation, None)
+        )
+
+    def _on_page(self, generation: int, page: Optional[Dict[str, Any]]):
+        if generation != self._generation:
+            return
+        self._loading = False
+        if page is None:
+            self._has_more = False
+            self.loadingChanged.emit(False)
+            return
+
+        files = [f for f in page["files"] if f["full_path"] not in self._rows]
+        self._has_more = page["has_more"]
+        if files:
+            first = len(self._files)
+            self.beginInsertRows(QModelIndex(), first, first + len(files) - 1)
+            for i, f in enumerate(files):
+                self._rows[f["full_path"]] = first + i
+            self._files.extend(files)
+            self.endInsertRows()
+            self.pageLoaded.emit([f["full_path"] for f in files])
+        elif self._has_more:
+            self.fetchMore(QModelIndex())
+            return
+        self.loadingChanged.emit(self._loading)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        f = self._files[index.row()]
+        if role == Qt.ItemDataRole.DisplayRole:
+            size_kb = (f.get("metadata") or {}).get("size", 0) / 1024
+            return f"{display_name(f.get('name')) or '???'} ({size_kb:.1f} KB)"
+        if role == Qt.ItemDataRole.DecorationRole:
+            return self._icons.get(f["full_path"], self.file_icon)
+        if role == Qt.ItemDataRole.ToolTipRole:
+            return f.get("name")
+        if role == Qt.ItemDataRole.UserRole:
+            return f["full_path"]
+        return None
+
+    def set_thumbnail(self, path: str, image):
+        row = self._rows.get(path)
+        if row is None:
+            return
+        self._thumbnails[path] = image
+        self._icons[path] = QIcon(QPixmap.fromImage(image))
+        index = self.index(row)
+        self.dataChanged.emit(index, index, [Qt.ItemDataRole.DecorationRole])
+
+    def thumbnail(self, path: str):
+        return self._thumbnails.get(path)
+
+    def file_count(self) -> int:
+        return len(self._files)
+
+    def is_loading(self) -> bool:
+        return self._loading
+
+    def has_more(self) -> bool:
+        return self._has_more
@@ -22,4 +22,32 @@ class BudgetGoal:
             "tag": self.tag,
             "monthly_target_amount": self.monthly_target_amount,
             "is_active": self.is_active
-        }
\ No newline at end of file
+        }
+
+@dataclass
+class GoalProgress:
+    goal_id: int
+    tag: str
+    monthly_target_amount: float
+    spent: float
+    tx_count: int
+
+    @property
+    def remaining(self) -> float:
+        return self.monthly_target_amount - self.spent
+
+    @property
+    def progress_pct(self) -> Optional[float]:
+        if self.monthly_target_amount <= 0:
+            return None
+        return self.spent * 100 / self.monthly_target_amount
+
+    @classmethod
+    def from_dict(cls, data: dict):
+        return cls(
+            goal_id=data.get("goal_id"),
+            tag=data.get("tag"),
+            monthly_target_amount=float(data.get("monthly_target_amount") or 0.0),
+            spent=float(data.get("spent") or 0.0),
+            tx_count=int(data.get("tx_count") or 0)
+        )
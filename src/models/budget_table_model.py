@@ -0,0 +1,447 @@
+from datetime import datetime, timedelta
+from typing import List, Dict, Any, Optional, Callable
+
+from PyQt6.QtCore import Qt, QAbstractTableModel, QSortFilterProxyModel, QModelIndex, QDate, pyqtSignal
+from PyQt6.QtGui import QColor, QFont
+
+from models.budget_types import BudgetColumn
+from models.transaction_frame import TransactionFrame, CodedColumn
+from models.totals import TotalsAggregator
+from core.search_index import SearchIndex
+from core.attachment_names import display_name
+
+HEADERS = [
+    "  Typ", "  Status", "  Data", "  Wartość", "  Autor", "  Kategoria", "  Podkategoria",
+    "  Z Portfela", "  Do Portfela", "  Sentyment", "  Tag", "  Opis", "  Wliczony", "  Plik"
+]
+
+COLUMN_KEYS = {
+    BudgetColumn.TYPE: "type",
+    BudgetColumn.STATUS: "status",
+    BudgetColumn.DATE: "date",
+    BudgetColumn.AMOUNT: "amount",
+    BudgetColumn.AUTHOR: "author",
+    BudgetColumn.CATEGORY: "category",
+    BudgetColumn.SUBCATEGORY: "subcategory",
+    BudgetColumn.WALLET_FROM: "from_wallet",
+    BudgetColumn.WALLET_TO: "to_wallet",
+    BudgetColumn.SENTIMENT: "sentiment",
+    BudgetColumn.TAG: "tag",
+    BudgetColumn.DESCRIPTION: "description",
+    BudgetColumn.IN_STATS: "in_stats",
+}
+
+SEARCH_KEYS = ["description", "category", "subcategory", "tag", "amount", "from_wallet", "to_wallet", "author", "sentiment"]
+
+ALIGN_CENTER = Qt.AlignmentFlag.AlignCenter
+ALIGN_RIGHT = Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter
+ALIGN_LEFT = Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter
+
+HIGH_AMOUNT = 1000
+
+EDITED_TODAY = 1
+NEW_TODAY = 2
+
+class BudgetTableModel(QAbstractTableModel):
+    cellEdited = pyqtSignal(int, int, str)
+
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.font_bold = QFont("Segoe UI", 9, QFont.Weight.Bold)
+        self.color_high_amt = QColor("#e3c96d")
+        self.color_bg_high = QColor(255, 215, 0, 25)
+        self.color_success = QColor("#81c784")
+        self.color_default = QColor("#e0e0e0")
+        self.color_header_active = QColor("#81c784")
+        self._color_cache: Dict[str, QColor] = {}
+        self.search_index = SearchIndex()
+        self.totals = TotalsAggregator()
+
+        self.header_filters: Dict[int, str] = {}
+        self.warn_old_date = False
+        self.sort_column = -1
+        self.sort_order = Qt.SortOrder.AscendingOrder
+        self._set_columns(TransactionFrame())
+
+    def _set_columns(self, frame: TransactionFrame):
+        self.frame = frame
+        self._size = len(frame)
+        self._amounts = frame.columns["amount"]
+        self._edited_tips: Dict[int, str] = {}
+        self._edited = self._edited_flags()
+        self.search_index.build([" ".join(parts) for parts in zip(*(frame.text_column(k) for k in SEARCH_KEYS))])
+        columns = frame.columns
+        self.totals.build(zip(columns["type"].codes, columns["status"].codes, columns["author_id"].codes), self._amounts)
+        self._set_order(self._sorted_order())
+
+        one_month_ago = QDate.currentDate().addMonths(-1).toString("yyyy-MM-dd")
+        dates = frame.columns["date"]
+        self.warn_old_date = any(flag and dates[i] < one_month_ago for i, flag in enumerate(self._edited))
+
+    def _edited_flags(self) -> bytearray:
+        # Timestamps are stored in UTC and shown as UTC+1, so "edited today" is the
+        # local day shifted back by one hour, compared on normalized ISO strings.
+        frame = self.frame
+        flags = bytearray(self._size)
+        today = datetime.now().replace(hour=0, minute=0, second=0, microsecond=0)
+        today_str = today.strftime("%Y-%m-%d")
+        lower = (today - timedelta(hours=1)).strftime("%Y-%m-%d %H:%M:%S")
+        upper = (today + timedelta(hours=23)).strftime("%Y-%m-%d %H:%M:%S")
+
+        for i, (ts_raw, date) in enumerate(zip(frame.columns["changed_at"], frame.columns["date"])):
+            if ts_raw:
+                ts = str(ts_raw).replace('T', ' ')[:19]
+                if len(ts) == 19 and lower <= ts < upper:
+                    flags[i] = EDITED_TODAY
+                    continue
+            if date == today_str:
+                flags[i] = NEW_TODAY
+        return flags
+
+    def _tooltip(self, i: int) -> Optional[str]:
+        tip = self._edited_tips.get(i)
+        if tip is not None or not self._edited[i]:
+            return tip
+        if self._edited[i] == NEW_TODAY:
+            return "Nowa transakcja"
+        ts = str(self.frame.get("changed_at", i)).replace('T', ' ')[:19]
+        dt_pl = datetime.strptime(ts, "%Y-%m-%d %H:%M:%S") + timedelta(hours=1)
+        return f"Edytowano: {dt_pl.strftime('%H:%M')}"
+
+    def _cell_text(self, i: int, col: int) -> str:
+        if col == BudgetColumn.AMOUNT:
+            return f"{self._amounts[i]:.2f}"
+        if col == BudgetColumn.WALLET_TO and self.frame.get("type", i) != "TRANSFER":
+            return "-"
+        value = self.frame.get(COLUMN_KEYS[col], i)
+        return "" if value is None else str(value)
+
+    def _search_text(self, i: int) -> str:
+        frame = self.frame
+        return " ".join(f"{self._amounts[i]:.2f}" if k == "amount" else str(frame.get(k, i) or "") for k in SEARCH_KEYS)
+
+    def _sort_keys(self, col: int) -> List[Any]:
+        if col == BudgetColumn.AMOUNT:
+            return self._amounts
+        if col == BudgetColumn.WALLET_TO:
+            return [self._cell_text(i, col) for i in range(self._size)]
+        column = self.frame.column(COLUMN_KEYS[col])
+        if isinstance(column, CodedColumn):
+            return column.sort_keys()
+        return ["" if v is None else str(v) for v in column]
+
+    def _sorted_order(self) -> List[int]:
+        if self.sort_column < 0 or self.sort_column == BudgetColumn.ATTACHMENT:
+            dates = self.frame.columns["date"]
+            statuses = self.frame.columns["status"]
+            pending = statuses.index.get("PENDING")
+            codes = statuses.codes
+            order = sorted(range(self._size), key=dates.__getitem__, reverse=True)
+            order.sort(key=lambda i: 0 if codes[i] == pending else 1)
+            return order
+
+        keys = self._sort_keys(self.sort_column)
+        return sorted(range(self._size), key=keys.__getitem__,
+                      reverse=(self.sort_order == Qt.SortOrder.DescendingOrder))
+
+    def _set_order(self, order: List[int]):
+        # _rows is the inverse permutation: storage index -> view row, so a single
+        # edited row is located without scanning the order.
+        self._order = order
+        rows = [0] * len(order)
+        for row, i in enumerate(order):
+            rows[i] = row
+        self._rows = rows
+
+    def _color(self, hex_value: Optional[str], fallback: str) -> QColor:
+        key = hex_value or fallback
+        color = self._color_cache.get(key)
+        if color is None:
+            color = self._color_cache[key] = QColor(key)
+        return color
+
+    def set_rows(self, frame: TransactionFrame):
+        self.beginResetModel()
+        self._set_columns(frame)
+        self.endResetModel()
+
+    def storage_index(self, row: int) -> int:
+        return self._order[row]
+
+    def storage_size(self) -> int:
+        return self._size
+
+    def amounts(self) -> List[float]:
+        return self._amounts
+
+    def rowCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(self._order)
+
+    def columnCount(self, parent=QModelIndex()):
+        return 0 if parent.isValid() else len(HEADERS)
+
+    def data(self, index, role=Qt.ItemDataRole.DisplayRole):
+        if not index.isValid():
+            return None
+        col = index.column()
+        i = self._order[index.row()]
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            return self.row_text(i, col)
+
+        if role == Qt.ItemDataRole.EditRole:
+            if col == BudgetColumn.DATE:
+                return QDate.fromString(self.frame.get("date", i), "yyyy-MM-dd")
+            if col == BudgetColumn.AMOUNT:
+                return self._amounts[i]
+            if col == BudgetColumn.ATTACHMENT:
+                return ""
+            return self._cell_text(i, col)
+
+        if role == Qt.ItemDataRole.UserRole:
+            if col == BudgetColumn.ATTACHMENT:
+                return self.frame.get("attachment_path", i)
+            return self.frame.get("id", i)
+
+        if role == Qt.ItemDataRole.TextAlignmentRole:
+            if col == BudgetColumn.AMOUNT:
+                return ALIGN_RIGHT
+            if col == BudgetColumn.DESCRIPTION:
+                return ALIGN_LEFT
+            return ALIGN_CENTER
+
+        if role == Qt.ItemDataRole.ForegroundRole:
+            if col == BudgetColumn.DATE and self._edited[i]:
+                return self.color_success
+            if col == BudgetColumn.AMOUNT and self._amounts[i] > HIGH_AMOUNT:
+                return self.color_high_amt
+            if col == BudgetColumn.AUTHOR:
+                return self._color(self.frame.get("author_color", i), "#ffffff")
+            if col == BudgetColumn.SUBCATEGORY:
+                return self._color(self.frame.get("row_color", i), "#888888")
+            return self.color_default
+
+        if role == Qt.ItemDataRole.FontRole:
+            if (col == BudgetColumn.DATE and self._edited[i]) or \
+               (col == BudgetColumn.AMOUNT and self._amounts[i] > HIGH_AMOUNT):
+                return self.font_bold
+            return None
+
+        if role == Qt.ItemDataRole.BackgroundRole:
+            if col == BudgetColumn.AMOUNT and self._amounts[i] > HIGH_AMOUNT:
+                return self.color_bg_high
+            return None
+
+        if role == Qt.ItemDataRole.ToolTipRole:
+            if col == BudgetColumn.DATE:
+                return self._tooltip(i)
+            if col == BudgetColumn.ATTACHMENT:
+                return display_name(self.frame.get("attachment_path", i)) or None
+            return None
+
+        return None
+
+    def headerData(self, section, orientation, role=Qt.ItemDataRole.DisplayRole):
+        if orientation != Qt.Orientation.Horizontal or not 0 <= section < len(HEADERS):
+            return super().headerData(section, orientation, role)
+
+        base_name = HEADERS[section]
+        filter_val = self.header_filters.get(section)
+
+        if role == Qt.ItemDataRole.DisplayRole:
+            if filter_val is None:
+                return base_name
+            filter_val = str(filter_val)
+            if len(filter_val) > 10:
+                filter_val = filter_val[:8] + ".."
+            return f"{base_name} [{filter_val}]"
+        if role == Qt.ItemDataRole.FontRole:
+            font = QFont()
+            font.setBold(filter_val is not None)
+            return font
+        if role == Qt.ItemDataRole.ForegroundRole:
+            return self.color_header_active if filter_val is not None else self.color_default
+        return None
+
+    def set_header_filters(self, filters: Dict[int, str]):
+        self.header_filters = dict(filters)
+        self.headerDataChanged.emit(Qt.Orientation.Horizontal, 0, len(HEADERS) - 1)
+
+    def flags(self, index):
+        if not index.isValid():
+            return Qt.ItemFlag.NoItemFlags
+        base = Qt.ItemFlag.ItemIsEnabled | Qt.ItemFlag.ItemIsSelectable
+        col = index.column()
+        if col in (BudgetColumn.TYPE, BudgetColumn.ATTACHMENT):
+            return base
+        if col == BudgetColumn.WALLET_TO and self.frame.get("type", self._order[index.row()]) != "TRANSFER":
+            return base
+        return base | Qt.ItemFlag.ItemIsEditable
+
+    def setData(self, index, value, role=Qt.ItemDataRole.EditRole):
+        if not index.isValid() or role not in (Qt.ItemDataRole.EditRole, Qt.ItemDataRole.DisplayRole):
+            return False
+        col = index.column()
+        if col not in COLUMN_KEYS:
+            return False
+        if isinstance(value, QDate):
+            value = value.toString("yyyy-MM-dd")
+        value = "" if value is None else str(value)
+
+        i = self._order[index.row()]
+        if self._cell_text(i, col) == value:
+            return True
+
+        self.set_cell(i, col, value)
+        self.cellEdited.emit(i, col, value)
+        return True
+
+    def totals_key(self, i: int) -> tuple:
+        columns = self.frame.columns
+        return columns["type"].codes[i], columns["status"].codes[i], columns["author_id"].codes[i]
+
+    def _set_value(self, i: int, key: str, value):
+        old_key, old_amount = self.totals_key(i), self._amounts[i]
+        self.frame.set(key, i, value)
+        self.totals.move(old_key, old_amount, self.totals_key(i), self._amounts[i])
+
+    def set_cell(self, i: int, col: int, value: str):
+        self._set_value(i, COLUMN_KEYS[col], value)
+        self.search_index.update(i, self._search_text(i))
+        self._emit_row_changed(i)
+
+    def set_row_value(self, i: int, key: str, value):
+        self._set_value(i, key, value)
+
+    def mark_edited(self, i: int):
+        self._edited[i] = EDITED_TODAY
+        self._edited_tips[i] = f"Edytowano: {datetime.now().strftime('%H:%M')}"
+        self._emit_row_changed(i)
+
+    def row_text(self, i: int, col: int) -> str:
+        if col == BudgetColumn.ATTACHMENT:
+            return "📎" if self.frame.get("attachment_path", i) else ""
+        return self._cell_text(i, col)
+
+    def row_id_at(self, i: int):
+        return self.frame.get("id", i)
+
+    def row_amount(self, i: int) -> float:
+        return self._amounts[i]
+
+    def _emit_row_changed(self, i: int):
+        row = self._rows[i]
+        self.dataChanged.emit(self.index(row, 0), self.index(row, len(HEADERS) - 1))
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self.layoutAboutToBeChanged.emit()
+        persistent = self.persistentIndexList()
+        stored = [(self._order[p.row()], p.column()) for p in persistent]
+
+        self.sort_column = column
+        self.sort_order = order
+        self._set_order(self._sorted_order())
+
+        rows = self._rows
+        self.changePersistentIndexList(persistent, [self.index(rows[i], c) for i, c in stored])
+        self.layoutChanged.emit()
+
+class BudgetFilterProxyModel(QSortFilterProxyModel):
+    def __init__(self, parent=None):
+        super().__init__(parent)
+        self.setDynamicSortFilter(False)
+        self.query = ""
+        self.hide_pending = False
+        self.user_id: Optional[str] = None
+        self.column_filters: Dict[int, Callable[[int], bool]] = {}
+        self._accepted: Optional[List[bool]] = []
+        self._pending: Optional[int] = None
+        self._user: Optional[int] = None
+        self.total_income = 0.0
+        self.total_expense = 0.0
+
+    def set_filters(self, query: str, hide_pending: bool, user_id: Optional[str]):
+        self.query = query
+        self.hide_pending = hide_pending
+        self.user_id = user_id
+        self.refilter()
+
+    def set_column_filter(self, col: int, predicate: Optional[Callable[[int], bool]]):
+        if predicate is None:
+            self.column_filters.pop(col, None)
+        else:
+            self.column_filters[col] = predicate
+        self.refilter()
+
+    def clear_column_filters(self):
+        self.column_filters.clear()
+        self.refilter()
+
+    def refilter(self):
+        model = self.sourceModel()
+        columns = model.frame.columns
+        types, statuses, authors = columns["type"], columns["status"], columns["author_id"]
+        income, expense = types.index.get("INCOME"), types.index.get("EXPENSE")
+        self._pending = statuses.index.get("PENDING") if self.hide_pending else None
+        self._user = authors.index.get(self.user_id, -1) if self.user_id else None
+
+        if not self.query and not self.column_filters:
+            # Status and author are part of the aggregator key, so totals come from the
+            # pre-grouped sums and rows are checked lazily in filterAcceptsRow.
+            pending, user = self._pending, self._user
+            visible = lambda key: (pending is None or key[1] != pending) and (user is None or key[2] == user)
+            self._accepted = None
+            self.total_income = model.totals.total(lambda key: key[0] == income and visible(key))
+            self.total_expense = model.totals.total(lambda key: key[0] == expense and visible(key))
+            self.invalidateFilter()
+            return
+
+        size, amounts = model.storage_size(), model.amounts()
+        type_codes = types.codes
+        predicates = list(self.column_filters.values())
+
+        matches = model.search_index.search(self.query)
+        candidates = range(size) if matches is None else sorted(matches)
+
+        accepted = [False] * size
+        total_income = 0.0
+        total_expense = 0.0
+
+        for i in candidates:
+            if not self._passes_codes(i) or (predicates and not all(p(i) for p in predicates)):
+                continue
+
+            accepted[i] = True
+            t = type_codes[i]
+            if t == income:
+                total_income += amounts[i]
+            elif t == expense:
+                total_expense += amounts[i]
+
+        self._accepted = accepted
+        self.total_income = total_income
+        self.total_expense = total_expense
+        self.invalidateFilter()
+
+    def _passes_codes(self, i: int) -> bool:
+        columns = self.sourceModel().frame.columns
+        return (self._pending is None or columns["status"].codes[i] != self._pending) and \
+               (self._user is None or columns["author_id"].codes[i] == self._user)
+
+    def is_accepted(self, i: int) -> bool:
+        if self._accepted is None:
+            return self._passes_codes(i)
+        return i < len(self._accepted) and self._accepted[i]
+
+    def balance(self) -> float:
+        return self.total_income - self.total_expense
+
+    def filterAcceptsRow(self, source_row, source_parent):
+        return self.is_accepted(self.sourceModel().storage_index(source_row))
+
+    def sort(self, column, order=Qt.SortOrder.AscendingOrder):
+        self.sourceModel().sort(column, order)
+
+    def visible_values(self, col: int) -> List[str]:
+        model = self.sourceModel()
+        return sorted({model.row_text(i, col) for i in range(model.storage_size()) if self.is_accepted(i)})
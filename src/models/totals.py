@@ -0,0 +1,47 @@
+from typing import Dict, Tuple, Callable, Iterable, Iterator, List
+
+def _to_minor(amount: float) -> int:
+    return round(amount * 100)
+
+class TotalsAggregator:
+    # Sums are kept in integer minor units, so moving a row back and forth between
+    # groups never leaves float residue behind.
+    def __init__(self):
+        self._groups: Dict[Tuple, List[int]] = {}
+
+    def clear(self):
+        self._groups = {}
+
+    def build(self, keys: Iterable[Tuple], amounts: Iterable[float]):
+        groups: Dict[Tuple, List[int]] = {}
+        for key, amount in zip(keys, amounts):
+            minor = _to_minor(amount)
+            group = groups.get(key)
+            if group is None:
+                groups[key] = [minor, 1]
+            else:
+                group[0] += minor
+                group[1] += 1
+        self._groups = groups
+
+    def add(self, key: Tuple, amount: float, count: int = 1):
+        group = self._groups.setdefault(key, [0, 0])
+        group[0] += _to_minor(amount)
+        group[1] += count
+        if group[1] <= 0:
+            del self._groups[key]
+
+    def remove(self, key: Tuple, amount: float):
+        self.add(key, -amount, -1)
+
+    def move(self, old_key: Tuple, old_amount: float, new_key: Tuple, new_amount: float):
+        if old_key != new_key or old_amount != new_amount:
+            self.remove(old_key, old_amount)
+            self.add(new_key, new_amount)
+
+    def groups(self) -> Iterator[Tuple[Tuple, float, int]]:
+        for key, (total, count) in self._groups.items():
+            yield key, total / 100, count
+
+    def total(self, predicate: Callable[[Tuple], bool]) -> float:
+        return sum(total for key, (total, _) in self._groups.items() if predicate(key)) / 100
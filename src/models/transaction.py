@@ -1,8 +1,8 @@
 from dataclasses import dataclass
 from datetime import date
-from decimal import Decimal
+from decimal import Decimal, ROUND_HALF_UP
 from enum import Enum
-from typing import Optional, Any
+from typing import Optional, Any, Dict, Iterable, List
 from uuid import UUID
 
 class TransactionType(Enum):
@@ -23,9 +23,95 @@ class TransactionSentiment(Enum):
     RUTYNA = "Rutyna"
     TRAGEDIA = 'Tragedia'
 
-@dataclass
+_CENT = Decimal(1)
+
+def to_minor_units(amount: Any) -> int:
+    if isinstance(amount, int):
+        return amount * 100
+    # Through str(), not float arithmetic: 2.675 stays 2.675 and rounds half up to 268.
+    return int(Decimal(str(amount)).scaleb(2).quantize(_CENT, ROUND_HALF_UP))
+
+class TransactionDecoder:
+    # Wallets, authors, dates and enum members repeat across rows, so each distinct
+    # raw value is converted once and the same object is shared by every row.
+    # The tables live as long as the decoder: use one per load, not one per process.
+    _statuses = {s.value: s for s in TransactionStatus}
+    _sentiments = {s.value: s for s in TransactionSentiment}
+
+    def __init__(self):
+        self._uuids: Dict[Any, UUID] = {}
+        self._dates: Dict[str, date] = {}
+        self._strings: Dict[str, str] = {}
+
+    def _uuid(self, value: Any) -> Optional[UUID]:
+        if value is None or isinstance(value, UUID):
+            return value
+        u = self._uuids.get(value)
+        if u is None:
+            u = self._uuids[value] = UUID(str(value))
+        return u
+
+    def _date(self, value: Any) -> date:
+        if not isinstance(value, str):
+            return value
+        d = self._dates.get(value)
+        if d is None:
+            d = self._dates[value] = date.fromisoformat(value)
+        return d
+
+    def decode(self, data: dict) -> "Transaction":
+        return self.decode_many((data,))[0]
+
+    def decode_many(self, rows: Iterable[dict]) -> List["Transaction"]:
+        uuids, dates, strings = self._uuids, self._dates, self._strings
+        statuses, sentiments = self._statuses, self._sentiments
+        uuid_of, date_of, intern = self._uuid, self._date, strings.setdefault
+        completed = TransactionStatus.COMPLETED
+        to_minor = to_minor_units
+        new = Transaction
+        result = []
+        append = result.append
+
+        for data in rows:
+            get = data.get
+            cat_data = get("dim_categories") or {}
+            raw_id = get("id")
+            status = get("status")
+            sentiment = get("sentiment")
+            tag = get("tag")
+            to_wallet = get("to_wallet_fk")
+            amount = data["amount"]
+            tx_date = data["transaction_date"]
+            resolved_type = cat_data.get("type") or get("type") or get("transaction_type") or "UNKNOWN"
+
+            # Positional in field order - keyword binding dominates the per-row cost.
+            append(new(
+                to_minor(amount),
+                uuids.get(data["wallet_fk"]) or uuid_of(data["wallet_fk"]),
+                int(data["subcategory_fk"]),
+                uuids.get(data["created_by_fk"]) or uuid_of(data["created_by_fk"]),
+                intern(resolved_type, resolved_type),
+                intern(cat_data.get("category", "-"), cat_data.get("category", "-")),
+                intern(cat_data.get("subcategory", "-"), cat_data.get("subcategory", "-")),
+                None if raw_id is None else str(raw_id),
+                dates.get(tx_date) or date_of(tx_date),
+                None if to_wallet is None else uuids.get(to_wallet) or uuid_of(to_wallet),
+                statuses[status] if status else completed,
+                sentiments[sentiment] if sentiment else None,
+                None if tag is None else intern(tag, tag),
+                bool(get("is_excluded_from_stats", False)),
+                get("attachment_path"),
+                get("attachment_type"),
+                get("description"),
+                get("created_at"),
+                get("updated_at"),
+                get("deleted_at"),
+            ))
+        return result
+
+@dataclass(slots=True)
 class Transaction:
-    amount: Decimal
+    amount_minor: int
     wallet_fk: UUID
     subcategory_fk: int
     created_by_fk: UUID
@@ -34,7 +120,7 @@ class Transaction:
     category_name: str
     subcategory_name: str
     
-    id: Optional[UUID] = None
+    id: Optional[str] = None
     transaction_date: date = date.today()
     to_wallet_fk: Optional[UUID] = None
     status: TransactionStatus = TransactionStatus.COMPLETED
@@ -46,51 +132,23 @@ class Transaction:
     description: Optional[str] = None
     created_at: Optional[Any] = None
     updated_at: Optional[Any] = None
+    deleted_at: Optional[Any] = None
 
-    @staticmethod
-    def _to_uuid(value: Any) -> Optional[UUID]:
-        if value is None or isinstance(value, UUID):
-            return value
-        return UUID(str(value))
+    @property
+    def amount(self) -> Decimal:
+        return Decimal(self.amount_minor).scaleb(-2)
 
     @classmethod
     def from_dict(cls, data: dict) -> "Transaction":
-        cat_data = data.get("dim_categories") or {}
-        
-        resolved_type = (
-            cat_data.get("type") or 
-            data.get("type") or 
-            data.get("transaction_type") or 
-            "UNKNOWN"
-        )
-        
-        return cls(
-            id=cls._to_uuid(data.get("id")),
-            amount=Decimal(str(data["amount"])),
-            transaction_date=date.fromisoformat(data["transaction_date"]) if isinstance(data["transaction_date"], str) else data["transaction_date"],
-            
-            type=resolved_type,
-            category_name=cat_data.get("category", "-"),
-            subcategory_name=cat_data.get("subcategory", "-"),
-            
-            wallet_fk=cls._to_uuid(data["wallet_fk"]),
-            to_wallet_fk=cls._to_uuid(data.get("to_wallet_fk")),
-            status=TransactionStatus(data.get("status", "COMPLETED")),
-            subcategory_fk=int(data["subcategory_fk"]),
-            created_by_fk=cls._to_uuid(data["created_by_fk"]),
-            sentiment=TransactionSentiment(data["sentiment"]) if data.get("sentiment") else None,
-            tag=data.get("tag"),
-            is_excluded_from_stats=bool(data.get("is_excluded_from_stats", False)),
-            attachment_path=data.get("attachment_path"),
-            attachment_type=data.get("attachment_type"),
-            description=data.get("description"),
-            created_at=data.get("created_at"),
-            updated_at=data.get("updated_at")
-        )
+        return TransactionDecoder().decode(data)
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[dict], decoder: Optional[TransactionDecoder] = None) -> List["Transaction"]:
+        return (decoder or TransactionDecoder()).decode_many(rows)
 
     def to_dict(self) -> dict:
         data = {
-            "amount": float(self.amount),
+            "amount": self.amount_minor / 100,
             "transaction_date": self.transaction_date.isoformat(),
             "wallet_fk": str(self.wallet_fk),
             "status": self.status.value,
@@ -105,4 +163,5 @@ class Transaction:
         if self.id: data["id"] = str(self.id)
         if self.to_wallet_fk: data["to_wallet_fk"] = str(self.to_wallet_fk)
         if self.sentiment: data["sentiment"] = self.sentiment.value
-        return data
\ No newline at end of file
+        return data
+
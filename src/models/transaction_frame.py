@@ -0,0 +1,107 @@
+from array import array
+from typing import List, Dict, Any, Iterable
+
+class CodedColumn:
+    __slots__ = ("values", "index", "codes")
+
+    def __init__(self):
+        self.values: List[Any] = []
+        self.index: Dict[Any, int] = {}
+        self.codes = array('i')
+
+    def code(self, value: Any) -> int:
+        c = self.index.get(value)
+        if c is None:
+            c = self.index[value] = len(self.values)
+            self.values.append(value)
+        return c
+
+    def append(self, value: Any):
+        self.codes.append(self.code(value))
+
+    def extend(self, other: "CodedColumn"):
+        remap = [self.code(v) for v in other.values]
+        self.codes.extend(array('i', [remap[c] for c in other.codes]))
+
+    def sort_keys(self) -> List[int]:
+        order = sorted(range(len(self.values)), key=lambda c: (self.values[c] is None, str(self.values[c])))
+        rank = [0] * len(self.values)
+        for position, c in enumerate(order):
+            rank[c] = position
+        return [rank[c] for c in self.codes]
+
+    def materialize(self) -> List[Any]:
+        values = self.values
+        return [values[c] for c in self.codes]
+
+    def __getitem__(self, i: int) -> Any:
+        return self.values[self.codes[i]]
+
+    def __setitem__(self, i: int, value: Any):
+        self.codes[i] = self.code(value)
+
+    def __len__(self) -> int:
+        return len(self.codes)
+
+class TransactionFrame:
+    PLAIN_COLUMNS = ("id", "date", "description", "attachment_path", "attachment_type", "changed_at")
+    CODED_COLUMNS = (
+        "type", "status", "category", "subcategory", "row_color", "from_wallet", "to_wallet",
+        "author", "author_id", "author_color", "sentiment", "tag", "in_stats"
+    )
+
+    def __init__(self):
+        self.columns: Dict[str, Any] = {key: [] for key in self.PLAIN_COLUMNS}
+        self.columns.update({key: CodedColumn() for key in self.CODED_COLUMNS})
+        self.columns["amount"] = array('d')
+
+    def __len__(self) -> int:
+        return len(self.columns["id"])
+
+    def column(self, key: str):
+        return self.columns[key]
+
+    def get(self, key: str, i: int) -> Any:
+        return self.columns[key][i]
+
+    def set(self, key: str, i: int, value: Any):
+        if key == "amount":
+            try:
+                value = float(value)
+            except (TypeError, ValueError):
+                value = 0.0
+        self.columns[key][i] = value
+
+    def append(self, row: Dict[str, Any]):
+        for key, column in self.columns.items():
+            column.append(row.get(key))
+
+    def append_row(self, row: Dict[str, Any]):
+        row = dict(row)
+        try:
+            row["amount"] = float(row.get("amount") or 0)
+        except (TypeError, ValueError):
+            row["amount"] = 0.0
+        row.setdefault("changed_at", row.get("updated_at") or row.get("created_at"))
+        self.append(row)
+
+    def extend(self, other: "TransactionFrame"):
+        for key, column in self.columns.items():
+            column.extend(other.columns[key])
+
+    def text_column(self, key: str) -> List[str]:
+        if key == "amount":
+            return [f"{a:.2f}" for a in self.columns["amount"]]
+        column = self.columns[key]
+        values = column.materialize() if isinstance(column, CodedColumn) else column
+        return ["" if v is None else str(v) for v in values]
+
+    def row(self, i: int) -> Dict[str, Any]:
+        return {key: column[i] for key, column in self.columns.items()}
+
+    @classmethod
+    def from_rows(cls, rows: Iterable[Dict[str, Any]]) -> "TransactionFrame":
+        frame = cls()
+        for row in rows:
+            frame.append_row(row)
+        return frame
@@ -1,18 +1,60 @@
+from datetime import date
 from typing import List, Optional
 from core.database import supabase
-from models.budget_goal import BudgetGoal
+from core.local_replica import LocalReplica
+from models.budget_goal import BudgetGoal, GoalProgress
 
 class BudgetGoalRepository:
     def __init__(self):
         self.supabase = supabase
         self.table = "dim_budget_goals"
+        self.replica = LocalReplica.get()
+        self.progress_function = "fn_budget_goal_progress"
 
     def get_all(self) -> List[BudgetGoal]:
-        response = self.supabase.table(self.table)\
-            .select("*")\
-            .order("monthly_target_amount", desc=True)\
-            .execute()
-        return [BudgetGoal.from_dict(row) for row in response.data]
+        try:
+            rows = self.supabase.table(self.table)\
+                .select("*")\
+                .order("monthly_target_amount", desc=True)\
+                .execute().data
+            self.replica.replace_table(self.table, rows)
+        except Exception as e:
+            rows = self.replica.fetch_all(self.table)
+            if not rows:
+                raise
+            print(f"REPO WARNING (Budget Goals offline): {e}")
+            rows.sort(key=lambda r: float(r.get("monthly_target_amount") or 0), reverse=True)
+        return [BudgetGoal.from_dict(row) for row in rows]
+
+    def get_progress(self, month_start: date, tags: Optional[List[str]] = None) -> List[GoalProgress]:
+        params = {"p_month": month_start.isoformat()}
+        if tags is not None:
+            params["p_tags"] = tags
+        try:
+            rows = self.supabase.rpc(self.progress_function, params).execute().data
+            return [GoalProgress.from_dict(row) for row in rows]
+        except Exception as e:
+            print(f"REPO WARNING (Goal progress offline): {e}")
+            return self._get_progress_local(month_start, tags)
+
+    def _get_progress_local(self, month_start: date, tags: Optional[List[str]]) -> List[GoalProgress]:
+        goals = [
+            g for g in self.replica.fetch_all(self.table)
+            if g.get("is_active", True) and not g.get("deleted_at") and (tags is None or g["tag"] in tags)
+        ]
+        if not goals:
+            return []
+        next_month = date(month_start.year + month_start.month // 12, month_start.month % 12 + 1, 1)
+        spend = self.replica.fetch_tag_spend([g["tag"] for g in goals], month_start.isoformat(), next_month.isoformat())
+        progress = [
+            GoalProgress.from_dict({
+                "goal_id": g["id"], "tag": g["tag"], "monthly_target_amount": g["monthly_target_amount"],
+                "spent": spend.get(g["tag"], (0.0, 0))[0], "tx_count": spend.get(g["tag"], (0.0, 0))[1]
+            })
+            for g in goals
+        ]
+        progress.sort(key=lambda p: p.monthly_target_amount, reverse=True)
+        return progress
 
     def upsert(self, tag: str, amount: float) -> bool:
         data = {
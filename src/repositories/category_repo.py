@@ -1,15 +1,27 @@
 from typing import List, Any
 from core.database import supabase
+from core.local_replica import LocalReplica
 from models.category import Category
 
 class CategoryRepository:
     def __init__(self):
         self.supabase = supabase
         self.table = "dim_categories"
+        self.replica = LocalReplica.get()
 
     def get_all(self) -> List[Category]:
-        response = self.supabase.table(self.table).select("*").is_("deleted_at", "null").execute()
-        return [Category.from_dict(row) for row in response.data]
+        try:
+            rows = self.supabase.table(self.table).select("*").is_("deleted_at", "null").execute().data
+            self.replica.replace_table(self.table, rows)
+        except Exception as e:
+            rows = self.replica.fetch_all(self.table)
+            if not rows:
+                raise
+            print(f"REPO WARNING (Categories offline): {e}")
+        return [Category.from_dict(row) for row in rows]
+
+    def get_all_local(self) -> List[Category]:
+        return [Category.from_dict(row) for row in self.replica.fetch_all(self.table)]
 
     def create(self, category_data: dict) -> bool:
         response = self.supabase.table(self.table).insert(category_data).execute()
@@ -1,30 +1,199 @@
-from typing import List, Optional, Any
+from dataclasses import dataclass
+from datetime import datetime
+from typing import List, Optional, Any, Iterator, Dict, Iterable
 from uuid import UUID
+from postgrest.types import ReturnMethod
 from core.database import supabase
-from models.transaction import Transaction
+from core.local_replica import LocalReplica
+from core.pg_copy import PgCopyLoader, PgCursorStream
+from models.transaction import Transaction, TransactionDecoder
+
+@dataclass
+class ChunkResult:
+    ids: List[str]
+    ok: bool
+    error: Optional[str] = None
+
+@dataclass
+class InsertResult:
+    rows: List[Dict[str, Any]]
+    error: Optional[str] = None
 
 class TransactionRepository:
+    SELECT_COLUMNS = "*, dim_categories(type, category, subcategory, color_hex)"
+    # Must not exceed the PostgREST max-rows setting (Supabase default: 1000),
+    # a short page is treated as the last one.
+    DEFAULT_PAGE_SIZE = 1000
+    # Ids travel in the query string as id=in.(...); 100 UUIDs keep the URL around
+    # 4 KB, well below common proxy and PostgREST limits.
+    IN_FILTER_CHUNK_SIZE = 100
+    INSERT_CHUNK_SIZE = 500
+    COPY_COLUMNS = [
+        "amount", "transaction_date", "wallet_fk", "to_wallet_fk", "subcategory_fk", "created_by_fk", "status",
+        "sentiment", "tag", "is_excluded_from_stats", "attachment_path", "attachment_type", "description"
+    ]
+
+    EXPORT_SELECT = "id, transaction_date, amount, wallet_fk, to_wallet_fk, created_by_fk, status, sentiment, tag, " \
+        "description, is_excluded_from_stats, attachment_path, dim_categories(type, category, subcategory)"
+    EXPORT_SQL = """
+        SELECT t.id::text AS id, t.transaction_date, t.amount, t.wallet_fk::text AS wallet_fk,
+               t.to_wallet_fk::text AS to_wallet_fk, t.created_by_fk::text AS created_by_fk,
+               t.status::text AS status, t.sentiment::text AS sentiment, t.tag, t.description,
+               t.is_excluded_from_stats, t.attachment_path,
+               c.type::text AS type, c.category, c.subcategory
+        FROM fact_transactions t
+        JOIN dim_categories c ON c.subcategory_id = t.subcategory_fk
+        WHERE t.deleted_at IS NULL
+          AND (%(date_from)s::date IS NULL OR t.transaction_date >= %(date_from)s::date)
+          AND (%(date_to)s::date IS NULL OR t.transaction_date <= %(date_to)s::date)
+          AND (%(wallets)s::uuid[] IS NULL OR t.wallet_fk = ANY(%(wallets)s::uuid[]))
+          AND (%(authors)s::uuid[] IS NULL OR t.created_by_fk = ANY(%(authors)s::uuid[]))
+        ORDER BY t.transaction_date, t.id
+    """
+
     def __init__(self):
         self.supabase = supabase
         self.table = "fact_transactions"
+        self.tombstone_table = "sync_tombstones"
+        self.tombstone_horizon_table = "sync_tombstone_horizon"
+        self.tags_view = "v_distinct_tags"
+        self.authors_view = "v_distinct_authors"
+        self.replica = LocalReplica.get()
 
     def get_all(self) -> List[Transaction]:
-        response = self.supabase.table(self.table)\
-            .select("*, dim_categories(type, category, subcategory, color_hex)")\
-            .order("transaction_date", desc=True)\
-            .range(0, 9999)\
+        return list(self.iter_all())
+
+    def iter_pages(self, page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[List[Transaction]]:
+        # Keyset pagination on (transaction_date, id) - stable under concurrent inserts
+        # and independent of the PostgREST max-rows cap, unlike offset ranges.
+        # Soft-deleted rows are skipped, as in the delta sync and the exports.
+        last_date, last_id = None, None
+        decoder = TransactionDecoder()
+        while True:
+            query = self.supabase.table(self.table)\
+                .select(self.SELECT_COLUMNS)\
+                .is_("deleted_at", "null")\
+                .order("transaction_date", desc=True)\
+                .order("id", desc=True)\
+                .limit(page_size)
+            if last_date is not None:
+                query = query.or_(
+                    f"transaction_date.lt.{last_date},"
+                    f"and(transaction_date.eq.{last_date},id.lt.{last_id})"
+                )
+            rows = query.execute().data
+            if rows:
+                yield Transaction.from_rows(rows, decoder)
+            if len(rows) < page_size:
+                return
+            last_date, last_id = rows[-1]["transaction_date"], rows[-1]["id"]
+
+    def iter_all(self, page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[Transaction]:
+        for page in self.iter_pages(page_size):
+            yield from page
+
+    def iter_changed_pages(self, updated_since: datetime, created_since: datetime,
+                           page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[List[Transaction]]:
+        last_id = None
+        decoder = TransactionDecoder()
+        while True:
+            query = self.supabase.table(self.table)\
+                .select(self.SELECT_COLUMNS)\
+                .or_(f"updated_at.gte.{updated_since.isoformat()},created_at.gte.{created_since.isoformat()}")\
+                .order("id")\
+                .limit(page_size)
+            if last_id is not None:
+                query = query.gt("id", last_id)
+            rows = query.execute().data
+            if rows:
+                yield Transaction.from_rows(rows, decoder)
+            if len(rows) < page_size:
+                return
+            last_id = rows[-1]["id"]
+
+    def iter_tombstones_since(self, since: datetime, page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[Dict[str, Any]]:
+        # Keyset pagination on (deleted_at, id): a bulk delete can leave more tombstones
+        # than the PostgREST max-rows cap returns in one response.
+        last_at, last_id = None, None
+        while True:
+            query = self.supabase.table(self.tombstone_table)\
+                .select("id, row_id, deleted_at")\
+                .eq("table_name", self.table)\
+                .gte("deleted_at", since.isoformat())\
+                .order("deleted_at")\
+                .order("id")\
+                .limit(page_size)
+            if last_at is not None:
+                query = query.or_(f"deleted_at.gt.{last_at},and(deleted_at.eq.{last_at},id.gt.{last_id})")
+            rows = query.execute().data
+            yield from rows
+            if len(rows) < page_size:
+                return
+            last_at, last_id = rows[-1]["deleted_at"], rows[-1]["id"]
+
+    def get_latest_tombstone_at(self) -> Optional[str]:
+        response = self.supabase.table(self.tombstone_table)\
+            .select("deleted_at")\
+            .eq("table_name", self.table)\
+            .order("deleted_at", desc=True)\
+            .limit(1)\
             .execute()
-        return [Transaction.from_dict(row) for row in response.data]
+        return response.data[0]["deleted_at"] if response.data else None
+
+    def get_tombstone_horizon(self) -> Optional[str]:
+        response = self.supabase.table(self.tombstone_horizon_table)\
+            .select("pruned_through")\
+            .eq("table_name", self.table)\
+            .execute()
+        return response.data[0]["pruned_through"] if response.data else None
+
+    def _iter_distinct(self, view: str, column: str, page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[Any]:
+        # Keyset paging on the value itself; a plain select would be cut off silently
+        # at the PostgREST max-rows cap.
+        last = None
+        while True:
+            query = self.supabase.table(view)\
+                .select(column)\
+                .order(column)\
+                .limit(page_size)
+            if last is not None:
+                query = query.gt(column, last)
+            rows = query.execute().data
+            for row in rows:
+                yield row[column]
+            if len(rows) < page_size:
+                return
+            last = rows[-1][column]
+
+    def get_distinct_tags(self) -> List[str]:
+        return list(self._iter_distinct(self.tags_view, "tag"))
+
+    def get_distinct_author_ids(self) -> List[str]:
+        return [str(author_id) for author_id in self._iter_distinct(self.authors_view, "created_by_fk")]
+
+    def get_all_local(self) -> List[Transaction]:
+        return Transaction.from_rows(self.replica.fetch_transactions())
 
     def get_by_id(self, transaction_id: UUID) -> Optional[Transaction]:
         response = self.supabase.table(self.table)\
-            .select("*, dim_categories(type, category, subcategory, color_hex)")\
+            .select(self.SELECT_COLUMNS)\
             .eq("id", str(transaction_id))\
             .execute()
         if response.data:
             return Transaction.from_dict(response.data[0])
         return None
 
+    def get_many(self, transaction_ids: Iterable[UUID], chunk_size: int = IN_FILTER_CHUNK_SIZE) -> List[Transaction]:
+        ids = list(dict.fromkeys(str(i) for i in transaction_ids))
+        rows = {}
+        for chunk in self._chunks(ids, chunk_size):
+            response = self.supabase.table(self.table)\
+                .select(self.SELECT_COLUMNS)\
+                .in_("id", chunk)\
+                .execute()
+            rows.update((str(row["id"]), row) for row in response.data)
+        return Transaction.from_rows(rows[i] for i in ids if i in rows)
+
     def create(self, transaction: Transaction):
         data = transaction.to_dict()
         if "id" in data:
@@ -32,6 +201,77 @@ class TransactionRepository:
         response = self.supabase.table(self.table).insert(data).execute()
         return response.data
 
+    def _insert_rows(self, transactions: List[Transaction]) -> List[Dict[str, Any]]:
+        rows = [t.to_dict() for t in transactions]
+        for row in rows:
+            row.pop("id", None)
+        # PostgREST takes the column list of a bulk insert from the first object,
+        # so every row has to carry the same keys.
+        keys = set().union(*rows) if rows else set()
+        return [{k: row.get(k) for k in keys} for row in rows]
+
+    def create_many(self, transactions: List[Transaction], chunk_size: int = INSERT_CHUNK_SIZE) -> InsertResult:
+        rows = self._insert_rows(transactions)
+        inserted = []
+        for start in range(0, len(rows), chunk_size):
+            try:
+                response = self.supabase.table(self.table).insert(rows[start:start + chunk_size]).execute()
+            except Exception as e:
+                # Earlier chunks are already committed; stop here and report them with the error.
+                return InsertResult(inserted, str(e))
+            inserted.extend(response.data)
+        return InsertResult(inserted)
+
+    def insert_chunk(self, transactions: List[Transaction]) -> int:
+        rows = self._insert_rows(transactions)
+        self.supabase.table(self.table).insert(rows, returning=ReturnMethod.minimal).execute()
+        return len(rows)
+
+    def iter_copy_insert(self, chunks: Iterable[List[Transaction]]) -> Iterator[int]:
+        columns = self.COPY_COLUMNS
+        records = ([tuple(row.get(c) for c in columns) for row in map(Transaction.to_dict, chunk)] for chunk in chunks)
+        return PgCopyLoader().iter_copy(self.table, columns, records)
+
+    def iter_export_cursor(self, filters: Dict[str, Any], chunk_size: int) -> Iterator[List[Dict[str, Any]]]:
+        params = {key: filters.get(key) for key in ("date_from", "date_to", "wallets", "authors")}
+        return PgCursorStream().iter_chunks(self.EXPORT_SQL, params, chunk_size)
+
+    def iter_export_pages(self, filters: Dict[str, Any], page_size: int = DEFAULT_PAGE_SIZE) -> Iterator[List[Dict[str, Any]]]:
+        # Same keyset walk as iter_pages, oldest first, with the export filters applied
+        # server-side. Rows stay raw dicts - an export never needs Transaction objects.
+        last_date, last_id = None, None
+        while True:
+            query = self.supabase.table(self.table)\
+                .select(self.EXPORT_SELECT)\
+                .is_("deleted_at", "null")\
+                .order("transaction_date")\
+                .order("id")\
+                .limit(page_size)
+            if filters.get("date_from"):
+                query = query.gte("transaction_date", filters["date_from"])
+            if filters.get("date_to"):
+                query = query.lte("transaction_date", filters["date_to"])
+            if filters.get("wallets") is not None:
+                query = query.in_("wallet_fk", filters["wallets"])
+            if filters.get("authors") is not None:
+                query = query.in_("created_by_fk", filters["authors"])
+            if last_date is not None:
+                query = query.or_(
+                    f"transaction_date.gt.{last_date},"
+                    f"and(transaction_date.eq.{last_date},id.gt.{last_id})"
+                )
+            rows = query.execute().data
+            if rows:
+                for row in rows:
+                    category = row.pop("dim_categories", None) or {}
+                    row["type"] = category.get("type")
+                    row["category"] = category.get("category")
+                    row["subcategory"] = category.get("subcategory")
+                yield rows
+            if len(rows) < page_size:
+                return
+            last_date, last_id = rows[-1]["transaction_date"], rows[-1]["id"]
+
     def update(self, transaction_id: UUID, fields: dict) -> bool:
         try:
             self.supabase.table(self.table).update(fields).eq("id", str(transaction_id)).execute()
@@ -46,6 +286,37 @@ class TransactionRepository:
         except Exception:
             return False
 
+    def _chunks(self, ids: Iterable[Any], chunk_size: int) -> Iterator[List[str]]:
+        unique_ids = list(dict.fromkeys(str(i) for i in ids))
+        for start in range(0, len(unique_ids), chunk_size):
+            yield unique_ids[start:start + chunk_size]
+
+    def delete_many(self, transaction_ids: Iterable[UUID], chunk_size: int = IN_FILTER_CHUNK_SIZE) -> List[ChunkResult]:
+        results = []
+        for chunk in self._chunks(transaction_ids, chunk_size):
+            try:
+                self.supabase.table(self.table)\
+                    .delete(returning=ReturnMethod.minimal)\
+                    .in_("id", chunk)\
+                    .execute()
+                results.append(ChunkResult(chunk, True))
+            except Exception as e:
+                results.append(ChunkResult(chunk, False, str(e)))
+        return results
+
+    def update_many(self, transaction_ids: Iterable[UUID], fields: dict, chunk_size: int = IN_FILTER_CHUNK_SIZE) -> List[ChunkResult]:
+        results = []
+        for chunk in self._chunks(transaction_ids, chunk_size):
+            try:
+                self.supabase.table(self.table)\
+                    .update(fields, returning=ReturnMethod.minimal)\
+                    .in_("id", chunk)\
+                    .execute()
+                results.append(ChunkResult(chunk, True))
+            except Exception as e:
+                results.append(ChunkResult(chunk, False, str(e)))
+        return results
+
     def delete_by_field(self, field_name: str, value: Any) -> bool:
         try:
             self.supabase.table(self.table).delete().eq(field_name, value).execute()
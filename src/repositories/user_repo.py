@@ -1,14 +1,24 @@
 from typing import List, Optional, Dict, Any
 from core.database import supabase
+from core.local_replica import LocalReplica
 
 class UserRepository:
     def __init__(self):
         self.supabase = supabase
         self.table = "dim_users"
+        self.replica = LocalReplica.get()
 
     def get_all(self) -> List[Dict[str, Any]]:
-        response = self.supabase.table(self.table).select("*").execute()
-        return response.data
+        try:
+            rows = self.supabase.table(self.table).select("*").execute().data
+            self.replica.replace_table(self.table, rows)
+            return rows
+        except Exception as e:
+            rows = self.replica.fetch_all(self.table)
+            if not rows:
+                raise
+            print(f"REPO WARNING (Users offline): {e}")
+            return rows
 
     def get_by_id(self, user_id: str) -> Optional[Dict[str, Any]]:
         response = self.supabase.table(self.table).select("*").eq("id", user_id).execute()
@@ -1,16 +1,28 @@
 from typing import List, Optional, Any
 from uuid import UUID
 from core.database import supabase
+from core.local_replica import LocalReplica
 from models.wallet import Wallet
 
 class WalletRepository:
     def __init__(self):
         self.supabase = supabase
         self.table = "dim_wallets"
+        self.replica = LocalReplica.get()
 
     def get_all_active(self) -> List[Wallet]:
-        response = self.supabase.table(self.table).select("*").eq("is_active", True).execute()
-        return [Wallet.from_dict(row) for row in response.data]
+        try:
+            rows = self.supabase.table(self.table).select("*").eq("is_active", True).execute().data
+            self.replica.replace_table(self.table, rows)
+        except Exception as e:
+            rows = [row for row in self.replica.fetch_all(self.table) if row.get("is_active", True)]
+            if not rows:
+                raise
+            print(f"REPO WARNING (Wallets offline): {e}")
+        return [Wallet.from_dict(row) for row in rows]
+
+    def get_all_local(self) -> List[Wallet]:
+        return [Wallet.from_dict(row) for row in self.replica.fetch_all(self.table) if row.get("is_active", True)]
 
     def create(self, wallet_data: dict) -> bool:
         response = self.supabase.table(self.table).insert(wallet_data).execute()
@@ -0,0 +1,348 @@
+import hashlib
+import mimetypes
+import os
+import shutil
+import threading
+import time
+from collections import OrderedDict
+from urllib.parse import quote
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from dataclasses import dataclass
+from typing import List, Optional, Iterator, Tuple, Dict, Any
+from storage3.exceptions import StorageApiError
+from core.config import Config
+from core.database import supabase
+from core.http_transport import HttpTransport
+from core.attachment_cache import AttachmentCache
+from core.attachment_names import SHA256_HEX_LEN, hashed_name, hash_key, display_name
+
+MAGIC_TYPES = [
+    (b"%PDF", "application/pdf"),
+    (b"\x89PNG\r\n\x1a\n", "image/png"),
+    (b"\xff\xd8\xff", "image/jpeg"),
+    (b"GIF87a", "image/gif"),
+    (b"GIF89a", "image/gif"),
+    (b"BM", "image/bmp"),
+]
+
+@dataclass
+class PreparedUpload:
+    source: str
+    storage_path: str
+    sha256: str
+    size: int
+    content_type: str
+
+    @property
+    def content_key(self) -> Tuple[str, str, str]:
+        folder, _, ext = hash_key(self.storage_path)
+        return folder, self.sha256, ext
+
+@dataclass
+class UploadResult:
+    source: str
+    storage_path: Optional[str]
+    uploaded: bool = False
+    error: Optional[str] = None
+
+    @property
+    def ok(self) -> bool:
+        return self.error is None
+
+class AttachmentService:
+    BUCKET = "attachments"
+    CHUNK_SIZE = 1024 * 1024
+    MAX_PARALLEL_UPLOADS = 4
+    PAGE_SIZE = 100
+    PLACEHOLDER_NAME = ".emptyFolderPlaceholder"
+    LISTING_CACHE_SIZE = 256
+    FIND_BLOB_FUNCTION = "fn_find_attachment"
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(AttachmentService, cls).__new__(cls)
+            cls._instance.supabase = supabase
+            cls._instance._lock = threading.Lock()
+            cls._instance._paths_by_hash = {}
+            cls._instance.cache = AttachmentCache.get()
+            cls._instance._listings = OrderedDict()
+        return cls._instance
+
+    def _bucket(self):
+        return self.supabase.storage.from_(self.BUCKET)
+
+    @staticmethod
+    def detect_content_type(head: bytes, file_name: str) -> str:
+        for magic, content_type in MAGIC_TYPES:
+            if head.startswith(magic):
+                return content_type
+        if head[:4] == b"RIFF" and head[8:12] == b"WEBP":
+            return "image/webp"
+        guessed, _ = mimetypes.guess_type(file_name)
+        return guessed or "application/octet-stream"
+
+    def prepare(self, file_path: str, folder: str) -> PreparedUpload:
+        digest = hashlib.sha256()
+        size = 0
+        head = b""
+        with open(file_path, "rb") as f:
+            while chunk := f.read(self.CHUNK_SIZE):
+                if not head:
+                    head = chunk[:16]
+                digest.update(chunk)
+                size += len(chunk)
+
+        sha = digest.hexdigest()
+        return PreparedUpload(
+            source=file_path,
+            storage_path=f"{folder}/{hashed_name(file_path, sha)}",
+            sha256=sha,
+            size=size,
+            content_type=self.detect_content_type(head, file_path),
+        )
+
+    def _remember(self, storage_path: str, sha256: Optional[str] = None):
+        key = hash_key(storage_path)
+        if key is None:
+            return
+        # A short hash in the name identifies nothing on its own; only a full digest does.
+        sha256 = sha256 or (key[1] if len(key[1]) == SHA256_HEX_LEN else None)
+        if sha256 is not None:
+            with self._lock:
+                self._paths_by_hash.setdefault((key[0], sha256, key[2]), storage_path)
+
+    def _known_blob(self, item: PreparedUpload) -> Optional[str]:
+        # Same content under another name in the same folder: filled from uploads and listings.
+        with self._lock:
+            return self._paths_by_hash.get(item.content_key)
+
+    def _find_blob(self, item: PreparedUpload) -> Optional[str]:
+        found = self._known_blob(item)
+        if found is not None:
+            return found
+        folder, digest, ext = item.content_key
+        try:
+            # Server-side, so blobs uploaded by other sessions under other names count too.
+            found = self.supabase.rpc(self.FIND_BLOB_FUNCTION, {
+                "p_bucket": self.BUCKET, "p_folder": folder, "p_hash": digest, "p_ext": ext
+            }).execute().data
+        except Exception as e:
+            # The upload below still never overwrites: a taken path is checked by content.
+            print(f"SERVICE WARNING (Attachment dedupe): hash lookup failed: {e}")
+            return None
+        if found:
+            self._remember(found, digest)
+        return found or None
+
+    @staticmethod
+    def _is_duplicate(error: Exception) -> bool:
+        return isinstance(error, StorageApiError) and str(error.status) == "409"
+
+    def _has_content(self, storage_path: str, sha256: str) -> bool:
+        local_path = self.fetch(storage_path)
+        if local_path is None:
+            return False
+        digest = hashlib.sha256()
+        with open(local_path, "rb") as f:
+            while chunk := f.read(self.CHUNK_SIZE):
+                digest.update(chunk)
+        return digest.hexdigest() == sha256
+
+    def _put(self, item: PreparedUpload, storage_path: str) -> bool:
+        try:
+            with open(item.source, "rb") as f:
+                self._bucket().upload(
+                    path=storage_path,
+                    file=f,
+                    file_options={
+                        "content-type": item.content_type,
+                        "cache-control": "31536000",
+                        "x-upsert": "false",
+                        "metadata": {"original_name": os.path.basename(item.source), "sha256": item.sha256},
+                    }
+                )
+            return True
+        except Exception as e:
+            if self._is_duplicate(e):
+                return False
+            raise
+
+    def upload_prepared(self, item: PreparedUpload) -> UploadResult:
+        try:
+            existing = self._find_blob(item)
+            if existing is not None:
+                return UploadResult(item.source, existing, uploaded=False)
+
+            storage_path = item.storage_path
+            uploaded = self._put(item, storage_path)
+            # The path was taken: by a concurrent upload of this file, or by other content
+            # with the same name and short hash, which moves this one to the full-hash name.
+            if not uploaded and not self._has_content(storage_path, item.sha256):
+                storage_path = f"{os.path.dirname(storage_path)}/{hashed_name(item.source, item.sha256, full=True)}"
+                uploaded = self._put(item, storage_path)
+
+            self._remember(storage_path, item.sha256)
+            if uploaded:
+                self.invalidate_listing(os.path.dirname(storage_path))
+            return UploadResult(item.source, storage_path, uploaded=uploaded)
+        except Exception as e:
+            return UploadResult(item.source, None, error=str(e))
+
+    def _prepare_or_fail(self, file_path: str, folder: str) -> Tuple[Optional[PreparedUpload], Optional[UploadResult]]:
+        try:
+            return self.prepare(file_path, folder), None
+        except OSError as e:
+            return None, UploadResult(file_path, None, error=str(e))
+
+    def iter_upload(self, file_paths: List[str], folder: str) -> Iterator[Tuple[int, int, UploadResult]]:
+        total = len(file_paths)
+        done = 0
+        with ThreadPoolExecutor(max_workers=self.MAX_PARALLEL_UPLOADS) as pool:
+            prepared: List[PreparedUpload] = []
+            for item, failure in pool.map(lambda p: self._prepare_or_fail(p, folder), file_paths):
+                if failure is not None:
+                    done += 1
+                    yield done, total, failure
+                else:
+                    prepared.append(item)
+
+            # Identical files in one batch map to one blob: upload it once, report it for each source.
+            by_path = {}
+            for item in prepared:
+                by_path.setdefault(item.content_key, []).append(item)
+
+            futures = {pool.submit(self.upload_prepared, items[0]): items for items in by_path.values()}
+            for future in as_completed(futures):
+                result = future.result()
+                for i, item in enumerate(futures[future]):
+                    done += 1
+                    yield done, total, UploadResult(item.source, result.storage_path, result.uploaded and i == 0, result.error)
+
+    def upload_many(self, file_paths: List[str], folder: str) -> List[UploadResult]:
+        return [result for _, _, result in self.iter_upload(file_paths, folder)]
+
+    def upload(self, file_path: str, folder: str) -> UploadResult:
+        prepared, failure = self._prepare_or_fail(file_path, folder)
+        return failure or self.upload_prepared(prepared)
+
+    @staticmethod
+    def is_content_addressed(storage_path: str) -> bool:
+        return hash_key(storage_path) is not None
+
+    def _conditional_get(self, storage_path: str, etag: Optional[str]):
+        url = f"{Config.SUPABASE_URL.rstrip('/')}{HttpTransport.STORAGE_PATH}object/{self.BUCKET}/{quote(storage_path)}"
+        headers = {
+            "apikey": Config.SUPABASE_SECRET_KEY,
+            "Authorization": f"Bearer {Config.SUPABASE_SECRET_KEY}",
+        }
+        if etag:
+            headers["If-None-Match"] = etag
+        response = HttpTransport.get_client().get(url, headers=headers)
+        if response.status_code != 304:
+            response.raise_for_status()
+        return response
+
+    def fetch(self, storage_path: str) -> Optional[str]:
+        storage_path = storage_path.lstrip("/")
+        entry = self.cache.lookup(storage_path)
+        # Content-addressed blobs never change under their name, so a cached copy is final.
+        if entry is not None and self.is_content_addressed(storage_path):
+            self.cache.touch(storage_path)
+            return entry["local_path"]
+
+        try:
+            response = self._conditional_get(storage_path, entry["etag"] if entry else None)
+        except Exception as e:
+            if entry is not None:
+                print(f"SERVICE WARNING (Attachment cache): revalidation failed, serving cached copy: {e}")
+                self.cache.touch(storage_path)
+                return entry["local_path"]
+            raise
+
+        if response.status_code == 304:
+            self.cache.touch(storage_path)
+            return entry["local_path"]
+        return self.cache.put(storage_path, response.content, response.headers.get("etag"))
+
+    def open_copy(self, storage_path: str) -> Optional[str]:
+        local_path = self.fetch(storage_path)
+        if local_path is None:
+            return None
+        # External viewers may save into or lock what they open, and eviction may delete
+        # the cache file meanwhile: they get a private copy under a readable name.
+        storage_path = storage_path.lstrip("/")
+        target_dir = os.path.join(Config.ATTACHMENT_OPEN_DIR, hashlib.sha1(storage_path.encode("utf-8")).hexdigest()[:12])
+        os.makedirs(target_dir, exist_ok=True)
+        target = os.path.join(target_dir, display_name(storage_path))
+        try:
+            shutil.copyfile(local_path, target)
+        except OSError:
+            # Still open from an earlier view (Windows); that copy has the same content.
+            if not os.path.exists(target):
+                raise
+        return target
+
+    def read(self, storage_path: str) -> Optional[bytes]:
+        if self.fetch(storage_path) is None:
+            return None
+        return self.cache.read(storage_path.lstrip("/"))
+
+    def _cached_listing(self, key: Tuple, loader):
+        with self._lock:
+            cached = self._listings.get(key)
+            if cached is not None and time.monotonic() - cached[0] < Config.ATTACHMENT_LIST_TTL_SEC:
+                self._listings.move_to_end(key)
+                return cached[1]
+        items = loader()
+        with self._lock:
+            now = time.monotonic()
+            # Every search keystroke and page is its own key: expired ones go on insert,
+            # and the least recently used go once the cap is reached.
+            for stale in [k for k, (at, _) in self._listings.items() if now - at >= Config.ATTACHMENT_LIST_TTL_SEC]:
+                del self._listings[stale]
+            self._listings[key] = (now, items)
+            self._listings.move_to_end(key)
+            while len(self._listings) > self.LISTING_CACHE_SIZE:
+                self._listings.popitem(last=False)
+        return items
+
+    def invalidate_listing(self, folder: Optional[str] = None):
+        with self._lock:
+            if folder is None:
+                self._listings.clear()
+            else:
+                for key in [k for k in self._listings if k[0] in (folder, "")]:
+                    del self._listings[key]
+
+    def list_page(self, folder: str, offset: int = 0, limit: int = PAGE_SIZE,
+                  search: Optional[str] = None) -> Tuple[List[Dict[str, Any]], bool]:
+        def load():
+            options = {"limit": limit, "offset": offset, "sortBy": {"column": "name", "order": "asc"}}
+            if search:
+                options["search"] = search
+            res = self._bucket().list(folder, options)
+            files = []
+            for item in res:
+                if item.get("name") == self.PLACEHOLDER_NAME or item.get("id") is None:
+                    continue
+                item["full_path"] = f"{folder}/{item['name']}" if folder else item["name"]
+                self._remember(item["full_path"])
+                files.append(item)
+            # A full raw page means another one may follow, even if filtering shrank this one.
+            return files, len(res) >= limit
+
+        return self._cached_listing((folder, offset, limit, search or ""), load)
+
+    def list_folders(self) -> List[str]:
+        def load():
+            folders, offset = [], 0
+            while True:
+                res = self._bucket().list("", {"limit": self.PAGE_SIZE, "offset": offset, "sortBy": {"column": "name", "order": "asc"}})
+                folders.extend(item["name"] for item in res if item.get("id") is None)
+                if len(res) < self.PAGE_SIZE:
+                    return folders
+                offset += self.PAGE_SIZE
+
+        return list(self._cached_listing(("", "folders"), load))
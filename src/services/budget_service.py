@@ -5,27 +5,33 @@ import json
 import unicodedata
 import hashlib
 import colorsys
-import httpx 
-from typing import List, Dict, Any
-from uuid import UUID, uuid4
-from repositories.transaction_repo import TransactionRepository
+from datetime import date
+from typing import List, Dict, Any, Iterator, Tuple, Callable, Optional, Iterable
+from uuid import UUID
+from repositories.transaction_repo import TransactionRepository, ChunkResult
 from repositories.wallet_repo import WalletRepository
 from repositories.category_repo import CategoryRepository
 from repositories.budget_goal_repo import BudgetGoalRepository
 from models.transaction import Transaction
+from models.transaction_frame import TransactionFrame
 from core.config import settings
+from core.events import EventBus
+from models.budget_goal import GoalProgress
 from services.user_service import UserService
+from services.sync_service import TransactionSyncService, SyncResult
+from services.attachment_service import AttachmentService
+from services.thumbnail_service import ThumbnailService
+from services.import_service import ImportService, ImportOptions
+from services.export_service import ExportService
 
-_original_client_init = httpx.Client.__init__
-
-def _patched_client_init(self, *args, **kwargs):
-    if "http2" not in kwargs:
-        kwargs["http2"] = False
-    _original_client_init(self, *args, **kwargs)
-
-httpx.Client.__init__ = _patched_client_init
+# Fields whose change can move a transaction's amount into or out of a goal's monthly spend.
+GOAL_SPEND_FIELDS = {"amount", "tag", "transaction_date", "subcategory_fk", "transaction_type", "is_excluded_from_stats"}
 
 class BudgetService:
+    # Shared by every BudgetService instance (UI and workers); entries are keyed by
+    # the sync service version, so any synced change or local write invalidates them.
+    _lookup_cache: Dict[str, Tuple[int, List[str]]] = {}
+
     def __init__(self):
         if settings.SUPABASE_URL and not settings.SUPABASE_URL.endswith("/"):
             settings.SUPABASE_URL = f"{settings.SUPABASE_URL}/"
@@ -34,17 +40,22 @@ class BudgetService:
         self.category_repo = CategoryRepository()
         self.goal_repo = BudgetGoalRepository()
         self.user_service = UserService()
+        self.sync_service = TransactionSyncService()
+        self.attachments = AttachmentService()
+        self.thumbnails = ThumbnailService()
+        self.importer = ImportService(self.transaction_repo)
+        self.exporter = ExportService(self.transaction_repo)
         
         self.supabase = self.transaction_repo.supabase
         
         self._wallets_cache = {}
+        self._wallet_list = []
         self._categories_cache = []
         #self.reload_cache()
 
     def reload_cache(self):
         self._categories_cache = self.category_repo.get_all()
-        wallets = self.wallet_repo.get_all_active()
-        self._wallets_cache = {str(w.id): w.wallet_name for w in wallets}
+        self._set_wallets(self.wallet_repo.get_all_active())
 
     def _get_dynamic_color(self, name_str: str, alpha: float = 0.8) -> str:
         if not name_str:
@@ -65,57 +76,128 @@ class BudgetService:
     def get_active_user_id(self) -> str:
         return self.user_service.get_active_user_id()
 
-    def get_unique_authors(self) -> List[str]:
-        txs = self.transaction_repo.get_all()
-        authors = set(str(t.created_by_fk) for t in txs if t.created_by_fk)
-        return list(authors)
+    def _cached_lookup(self, key: str, fetch: Callable[[], List[str]], fallback: Callable[[], List[str]]) -> List[str]:
+        version = self.sync_service.version()
+        cached = self._lookup_cache.get(key)
+        if cached and cached[0] == version:
+            return list(cached[1])
 
-    def get_ui_transactions(self) -> List[Dict[str, Any]]:
+        try:
+            values = fetch()
+        except Exception as e:
+            print(f"SERVICE WARNING (Lookup {key}): {e}")
+            if not self.sync_service.is_loaded():
+                return []
+            values = fallback()
+
+        self._lookup_cache[key] = (version, values)
+        return list(values)
+
+    def get_unique_authors(self) -> List[str]:
+        return self._cached_lookup(
+            "authors",
+            self.transaction_repo.get_distinct_author_ids,
+            lambda: list(set(str(t.created_by_fk) for t in self.sync_service.snapshot() if t.created_by_fk))
+        )
+
+    def get_ui_transactions(self) -> TransactionFrame:
+        frame = TransactionFrame()
+        for page in self.iter_ui_transaction_pages():
+            frame.extend(page)
+        return frame
+
+    def iter_ui_transaction_pages(self, page_size: int = TransactionRepository.DEFAULT_PAGE_SIZE) -> Iterator[TransactionFrame]:
         self.reload_cache()
-        transactions = self.transaction_repo.get_all()
         categories_map = {c.subcategory_id: c for c in self._categories_cache}
-        
         users_map = self.user_service.get_users()
-        
-        ui_data = []
-        
+
+        if self.sync_service.is_loaded():
+            self.sync_service.sync(page_size)
+            pages = [self.sync_service.snapshot()]
+        else:
+            pages = self.sync_service.iter_full_load(page_size)
+
+        for page in pages:
+            yield self._to_ui_frame(page, categories_map, users_map)
+
+    def iter_local_ui_transaction_pages(self) -> Iterator[TransactionFrame]:
+        categories_map = {c.subcategory_id: c for c in self._categories_cache}
+        users_map = self.user_service.get_cached_users()
+        yield self._to_ui_frame(self.sync_service.snapshot(), categories_map, users_map)
+
+    def sync_transactions(self) -> SyncResult:
+        return self.sync_service.sync()
+
+    def _category_display(self, tx: Transaction, categories_map: Dict[int, Any]) -> Tuple[Any, Any, str]:
+        bg_color = "#1b1c1d"
+        cat_obj = categories_map.get(tx.subcategory_fk)
+
+        if cat_obj and cat_obj.color_hex:
+            bg_color = cat_obj.color_hex
+        elif cat_obj:
+            bg_color = self._get_dynamic_color(cat_obj.category)
+        return tx.category_name, tx.subcategory_name, bg_color
+
+    def _author_display(self, author_id: str, users_map: Dict[str, str]) -> Tuple[str, str, str]:
+        author_display = users_map.get(author_id, f"...{author_id[-4:]}")
+        return author_display, author_id, self.user_service.get_user_color(author_id)
+
+    def _to_ui_frame(self, transactions: List[Transaction], categories_map: Dict[int, Any], users_map: Dict[str, str]) -> TransactionFrame:
+        # Joins and color lookups run once per distinct key; rows only store codes
+        # into the shared value tables of each column.
+        frame = TransactionFrame()
+        cols = frame.columns
+        category_cols = [cols["category"], cols["subcategory"], cols["row_color"]]
+        author_cols = [cols["author"], cols["author_id"], cols["author_color"]]
+        type_col, status_col = cols["type"], cols["status"]
+        from_col, to_col = cols["from_wallet"], cols["to_wallet"]
+        sentiment_col, tag_col, in_stats_col = cols["sentiment"], cols["tag"], cols["in_stats"]
+        category_codes: Dict[Any, List[int]] = {}
+        author_codes: Dict[Any, List[int]] = {}
+        wallet_codes: Dict[Any, int] = {}
+        to_wallet_codes: Dict[Any, int] = {}
+
         for tx in transactions:
-            bg_color = "#1b1c1d"
-            cat_obj = categories_map.get(tx.subcategory_fk)
-            
-            if cat_obj and cat_obj.color_hex:
-                bg_color = cat_obj.color_hex
-            elif cat_obj:
-                bg_color = self._get_dynamic_color(cat_obj.category)
-            
-            author_id = str(tx.created_by_fk)
-            author_display = users_map.get(author_id, f"...{author_id[-4:]}")
-            author_color = self.user_service.get_user_color(author_id)
-
-            ui_data.append({
-                "id": tx.id,
-                "date": tx.transaction_date.isoformat(),
-                "amount": f"{tx.amount:.2f}",
-                "author": author_display,
-                "author_id": author_id,
-                "author_color": author_color,
-                "category": tx.category_name,
-                "subcategory": tx.subcategory_name,
-                "type": tx.type, 
-                "status": tx.status.value,
-                "from_wallet": self._wallets_cache.get(str(tx.wallet_fk), "Nieznany"),
-                "to_wallet": self._wallets_cache.get(str(tx.to_wallet_fk), "-") if tx.to_wallet_fk else "-",
-                "sentiment": tx.sentiment.value if tx.sentiment else "-",
-                "tag": tx.tag or "",
-                "description": tx.description or "",
-                "in_stats": "Tak" if not tx.is_excluded_from_stats else "Nie",
-                "attachment_path": tx.attachment_path,
-                "attachment_type": tx.attachment_type,
-                "row_color": bg_color,
-                "updated_at": str(tx.updated_at) if hasattr(tx, "updated_at") and tx.updated_at else None,
-                "created_at": str(tx.created_at) if hasattr(tx, "created_at") and tx.created_at else None
-            })
-        return ui_data
+            codes = category_codes.get(tx.subcategory_fk)
+            if codes is None:
+                values = self._category_display(tx, categories_map)
+                codes = category_codes[tx.subcategory_fk] = [c.code(v) for c, v in zip(category_cols, values)]
+            for column, code in zip(category_cols, codes):
+                column.codes.append(code)
+
+            codes = author_codes.get(tx.created_by_fk)
+            if codes is None:
+                values = self._author_display(str(tx.created_by_fk), users_map)
+                codes = author_codes[tx.created_by_fk] = [c.code(v) for c, v in zip(author_cols, values)]
+            for column, code in zip(author_cols, codes):
+                column.codes.append(code)
+
+            code = wallet_codes.get(tx.wallet_fk)
+            if code is None:
+                code = wallet_codes[tx.wallet_fk] = from_col.code(self._wallets_cache.get(str(tx.wallet_fk), "Nieznany"))
+            from_col.codes.append(code)
+
+            code = to_wallet_codes.get(tx.to_wallet_fk)
+            if code is None:
+                name = self._wallets_cache.get(str(tx.to_wallet_fk), "-") if tx.to_wallet_fk else "-"
+                code = to_wallet_codes[tx.to_wallet_fk] = to_col.code(name)
+            to_col.codes.append(code)
+
+            type_col.append(tx.type)
+            status_col.append(tx.status.value)
+            sentiment_col.append(tx.sentiment.value if tx.sentiment else "-")
+            tag_col.append(tx.tag or "")
+            in_stats_col.append("Tak" if not tx.is_excluded_from_stats else "Nie")
+
+            cols["id"].append(tx.id)
+            cols["date"].append(tx.transaction_date.isoformat())
+            cols["amount"].append(tx.amount_minor / 100)
+            cols["description"].append(tx.description or "")
+            cols["attachment_path"].append(tx.attachment_path)
+            cols["attachment_type"].append(tx.attachment_type)
+            cols["changed_at"].append(tx.updated_at or tx.created_at)
+
+        return frame
 
     def _sanitize_filename(self, filename: str) -> str:
         filename = unicodedata.normalize('NFKD', filename).encode('ascii', 'ignore').decode('ascii')
@@ -132,47 +214,16 @@ class BudgetService:
             self.close()
         return False
     def upload_attachment(self, file_path: str, folder: str = "transactions") -> str:
-        try:
-            original_name = os.path.basename(file_path)
-            safe_name = self._sanitize_filename(original_name)
-            
-            if not safe_name or safe_name.strip() == "":
-                safe_name = f"{uuid4()}{os.path.splitext(original_name)[1]}"
+        result = self.attachments.upload(file_path, self._sanitize_filename(folder))
+        if not result.ok:
+            print(f"SERVICE ERROR (Upload): {result.error}")
+        return result.storage_path
 
-            safe_folder = self._sanitize_filename(folder)
-            bucket_name = "attachments"
-
-            existing_files = []
-            try:
-                res = self.supabase.storage.from_(bucket_name).list(safe_folder)
-                if res:
-                    existing_files = [f['name'] for f in res]
-            except Exception:
-                pass 
-
-            final_name = safe_name
-            name_root, ext = os.path.splitext(safe_name)
-            counter = 2
-
-            while final_name in existing_files:
-                final_name = f"{name_root}_{counter}{ext}"
-                counter += 1
-
-            storage_path = f"{safe_folder}/{final_name}"
-
-            with open(file_path, "rb") as f:
-                self.supabase.storage.from_(bucket_name).upload(
-                    path=storage_path,
-                    file=f,
-                    file_options={
-                        "content-type": "application/octet-stream",
-                        "x-upsert": "false" 
-                    }
-                )
-            return storage_path
-        except Exception as e:
-            print(f"SERVICE ERROR (Upload): {e}")
-            return None
+    def iter_upload_attachments(self, file_paths: List[str], folder: str = "transactions") -> Iterator[Dict[str, Any]]:
+        for done, total, result in self.attachments.iter_upload(file_paths, self._sanitize_filename(folder)):
+            if not result.ok:
+                print(f"SERVICE ERROR (Upload): {result.source}: {result.error}")
+            yield {"done": done, "total": total, "result": result}
 
     def get_attachment_url(self, storage_path: str) -> str:
         try:
@@ -185,49 +236,111 @@ class BudgetService:
             print(f"SERVICE ERROR (URL): {e}")
             return None
             
-    def download_attachment_content(self, storage_path: str) -> bytes:
+    def download_attachment_content(self, storage_path: str) -> Optional[bytes]:
         try:
-            data = self.supabase.storage.from_("attachments").download(storage_path)
-            return data
+            return self.attachments.read(storage_path)
         except Exception as e:
             print(f"SERVICE ERROR (Download bytes): {e}")
             return None
 
-    def delete_transactions(self, transaction_ids: List[UUID]) -> bool:
+    def iter_attachment_thumbnails(self, storage_paths: List[str], edge: int = ThumbnailService.THUMB_EDGE) -> Iterator[Dict[str, Any]]:
+        for path, image in self.thumbnails.iter_thumbnails(storage_paths, edge):
+            yield {"path": path, "image": image}
+
+    def load_attachment_preview(self, storage_path: str, max_edge: int):
+        local_path = self.get_attachment_local_path(storage_path)
+        if not local_path:
+            return None
+        image = self.thumbnails.decode_scaled(local_path, max_edge)
+        return None if image.isNull() else image
+
+    def get_attachment_local_path(self, storage_path: str) -> Optional[str]:
         try:
-            for tx_id in transaction_ids:
-                self.transaction_repo.delete(tx_id)
-            return True
-        except Exception:
-            return False
-    def get_storage_folders(self) -> List[str]:
+            return self.attachments.fetch(storage_path)
+        except Exception as e:
+            print(f"SERVICE ERROR (Download file): {e}")
+            return None
+
+    def get_attachment_open_path(self, storage_path: str) -> Optional[str]:
         try:
-            res = self.supabase.storage.from_("attachments").list()
-            folders = [item['name'] for item in res if item.get('id') is None or item.get('metadata') is None]
-            defaults = ["Paragony", "Faktury", "Gwarancje", "Inne"]
-            combined = set(folders + defaults)
-            return sorted(list(combined))
-        except Exception:
-            return ["Paragony", "Faktury", "Gwarancje", "Inne"]
+            return self.attachments.open_copy(storage_path)
+        except Exception as e:
+            print(f"SERVICE ERROR (Open file): {e}")
+            return None
+
+    def _report_chunks(self, operation: str, results: List[ChunkResult]) -> bool:
+        failed = [r for r in results if not r.ok]
+        for r in failed:
+            print(f"SERVICE ERROR ({operation}): {len(r.ids)} rows failed: {r.error}")
+        return not failed
 
-    def get_files_in_folder(self, folder_name: str) -> List[Dict[str, Any]]:
+    def _notify_goal_tags(self, tags: Iterable[Optional[str]]):
+        tags = sorted({t for t in tags if t})
+        if tags:
+            EventBus.get().goalTagsChanged.emit(tags)
+
+    def _goal_tags_of(self, transaction_ids: List[UUID]) -> List[str]:
         try:
-            res = self.supabase.storage.from_("attachments").list(folder_name)
-            files = []
-            for item in res:
-                if item.get('name') != ".emptyFolderPlaceholder":
-                    item['full_path'] = f"{folder_name}/{item['name']}"
-                    files.append(item)
-            return files
-        except Exception:
+            return self.transaction_repo.replica.fetch_tags_for(transaction_ids)
+        except Exception as e:
+            print(f"SERVICE WARNING (Goal tags): {e}")
             return []
+
+    def delete_transactions(self, transaction_ids: List[UUID]) -> int:
+        old_tags = self._goal_tags_of(transaction_ids)
+        results = self.transaction_repo.delete_many(transaction_ids)
+        if any(r.ok for r in results):
+            self.sync_service.invalidate()
+            self._notify_goal_tags(old_tags)
+        self._report_chunks("Bulk Delete", results)
+        # Earlier chunks stay deleted when a later one fails, so callers get the count.
+        return sum(len(r.ids) for r in results if r.ok)
+
+    def update_transactions_many(self, transaction_ids: List[UUID], fields: Dict[str, Any]) -> bool:
+        affects_goals = bool(GOAL_SPEND_FIELDS & fields.keys())
+        old_tags = self._goal_tags_of(transaction_ids) if affects_goals else []
+        results = self.transaction_repo.update_many(transaction_ids, fields)
+        if {"tag", "created_by_fk"} & fields.keys() and any(r.ok for r in results):
+            self.sync_service.invalidate()
+        if affects_goals and any(r.ok for r in results):
+            self._notify_goal_tags(old_tags + [fields.get("tag")])
+        return self._report_chunks("Bulk Update", results)
+    def get_storage_folders(self, force: bool = False) -> List[str]:
+        defaults = ["Paragony", "Faktury", "Gwarancje", "Inne"]
+        try:
+            if force:
+                self.attachments.invalidate_listing()
+            return sorted(set(self.attachments.list_folders() + defaults))
+        except Exception:
+            return defaults
+
+    def get_files_in_folder(self, folder_name: str, offset: int = 0, limit: int = AttachmentService.PAGE_SIZE,
+                            search: Optional[str] = None) -> List[Dict[str, Any]]:
+        return self.get_files_page(folder_name, offset, limit, search)["files"]
+
+    def get_files_page(self, folder_name: str, offset: int = 0, limit: int = AttachmentService.PAGE_SIZE,
+                       search: Optional[str] = None) -> Dict[str, Any]:
+        try:
+            files, has_more = self.attachments.list_page(folder_name, offset, limit, search)
+        except Exception as e:
+            print(f"SERVICE ERROR (List files): {e}")
+            files, has_more = [], False
+        return {"folder": folder_name, "offset": offset, "search": search, "files": files, "has_more": has_more}
+
     def get_transaction_by_id(self, transaction_id: UUID) -> Dict[str, Any]:
         tx = self.transaction_repo.get_by_id(transaction_id)
         if not tx:
             return None
+        return self._copyable_fields(tx)
+
+    def duplicate_transactions(self, transaction_ids: List[UUID]) -> int:
+        originals = self.transaction_repo.get_many(transaction_ids)
+        return self.add_transactions_bulk([self._copyable_fields(tx) for tx in originals])
+
+    def _copyable_fields(self, tx: Transaction) -> Dict[str, Any]:
         return {
             "transaction_date": tx.transaction_date.isoformat(),
-            "amount": float(tx.amount),
+            "amount": tx.amount_minor / 100,
             "type": tx.type,
             "wallet_fk": str(tx.wallet_fk),
             "to_wallet_fk": str(tx.to_wallet_fk) if tx.to_wallet_fk else None,
@@ -257,7 +370,14 @@ class BudgetService:
                 if "author" in fields:
                     fields["created_by_fk"] = fields.pop("author")
 
-                return self.transaction_repo.update(transaction_id, fields)
+                affects_goals = bool(GOAL_SPEND_FIELDS & fields.keys())
+                old_tags = self._goal_tags_of([transaction_id]) if affects_goals else []
+                success = self.transaction_repo.update(transaction_id, fields)
+                if success and {"tag", "created_by_fk"} & fields.keys():
+                    self.sync_service.invalidate()
+                if success and affects_goals:
+                    self._notify_goal_tags(old_tags + [fields.get("tag")])
+                return success
             except Exception:
                 return False
 
@@ -270,7 +390,11 @@ class BudgetService:
             
         return self.update_transaction_multiple_fields(transaction_id, {field_name: value})
     def get_wallets_for_combo(self):
-        return self.wallet_repo.get_all_active()
+        # Served from the cache reload_cache/load_local_cache fill, never from the network:
+        # combos are filled on the GUI thread.
+        if not self._wallet_list:
+            self._set_wallets(self.wallet_repo.get_all_local())
+        return list(self._wallet_list)
 
     def get_categories_for_combo(self):
         return self._categories_cache
@@ -292,6 +416,45 @@ class BudgetService:
                 })
         return sorted(result, key=lambda x: x["name"])
 
+    def _get_transfer_category(self):
+        if not self._categories_cache:
+            self.reload_cache()
+        transfer_cat = next(
+            (c for c in self._categories_cache 
+             if c.type == "TRANSFER" and c.category == "System" and c.subcategory == "Transfer"), 
+            None
+        )
+        
+        if not transfer_cat:
+            print("DEBUG: Tworzę nową kategorię System/Transfer...")
+            self.category_repo.create({
+                "category_id": -1, "category": "System", "subcategory": "Transfer",
+                "type": "TRANSFER", "color_hex": "#60a5fa"
+            })
+            self.reload_cache()
+            transfer_cat = next((c for c in self._categories_cache if c.subcategory == "Transfer"), None)
+        return transfer_cat
+
+    def _prepare_transaction(self, data: Dict[str, Any], user_id: str) -> Transaction:
+        data["created_by_fk"] = user_id
+
+        tx_type = data.get("transaction_type")
+        if tx_type:
+            data["type"] = tx_type
+        
+        if tx_type == "TRANSFER" and not data.get("subcategory_fk"):
+            transfer_cat = self._get_transfer_category()
+            if not transfer_cat:
+                raise ValueError("Nie udało się utworzyć/znaleźć kategorii dla Transferu.")
+            data["subcategory_fk"] = transfer_cat.subcategory_id
+
+        if not data.get("to_wallet_fk"): data["to_wallet_fk"] = None
+        if not data.get("sentiment"): data["sentiment"] = None
+        if not data.get("tag"): data["tag"] = None
+        if not data.get("description"): data["description"] = None
+
+        return Transaction.from_dict(data)
+
     def add_transaction(self, data: Dict[str, Any]) -> bool:
         print("\n--- ROZPOCZYNAM DODAWANIE TRANSAKCJI ---")
         try:
@@ -302,49 +465,17 @@ class BudgetService:
                 print("❌ BŁĄD: Nie znaleziono aktywnego użytkownika (get_active_user_id zwrócił None).")
                 print("Sugestia: Wybierz użytkownika w zakładce Opcje lub na górnym pasku.")
                 return False
-            
-            data["created_by_fk"] = user_id
-
-            tx_type = data.get("transaction_type")
-            if tx_type:
-                data["type"] = tx_type
-            
-            if tx_type == "TRANSFER" and not data.get("subcategory_fk"):
-                print("DEBUG: Typ TRANSFER - szukam kategorii systemowej...")
-                transfer_cat = next(
-                    (c for c in self._categories_cache 
-                     if c.type == "TRANSFER" and c.category == "System" and c.subcategory == "Transfer"), 
-                    None
-                )
-                
-                if not transfer_cat:
-                    print("DEBUG: Tworzę nową kategorię System/Transfer...")
-                    self.category_repo.create({
-                        "category_id": -1, "category": "System", "subcategory": "Transfer",
-                        "type": "TRANSFER", "color_hex": "#60a5fa"
-                    })
-                    self.reload_cache()
-                    transfer_cat = next((c for c in self._categories_cache if c.subcategory == "Transfer"), None)
-
-                if transfer_cat:
-                    data["subcategory_fk"] = transfer_cat.subcategory_id
-                else:
-                    print("❌ BŁĄD: Nie udało się utworzyć/znaleźć kategorii dla Transferu.")
-                    return False
-
-            if not data.get("to_wallet_fk"): data["to_wallet_fk"] = None
-            if not data.get("sentiment"): data["sentiment"] = None
-            if not data.get("tag"): data["tag"] = None
-            if not data.get("description"): data["description"] = None
 
             print(f"DEBUG: Dane przed konwersją do modelu: {json.dumps(data, default=str)}")
-            transaction = Transaction.from_dict(data)
+            transaction = self._prepare_transaction(data, user_id)
             
             print("DEBUG: Wysyłanie do repozytorium...")
             result = self.transaction_repo.create(transaction)
             
             if result:
                 print("✅ SUKCES: Transakcja zapisana w bazie.")
+                self.sync_service.invalidate()
+                self._notify_goal_tags([transaction.tag])
                 return True
             else:
                 print("❌ BŁĄD BAZY: Repo zwróciło pusty wynik (None). Sprawdź połączenie z Supabase.")
@@ -356,6 +487,49 @@ class BudgetService:
             print(traceback.format_exc())
             return False
 
+    def add_transactions_bulk(self, rows: List[Dict[str, Any]]) -> int:
+        user_id = self.get_active_user_id()
+        if not user_id:
+            print("SERVICE ERROR (Bulk Add): No active user")
+            return 0
+
+        try:
+            transactions = [self._prepare_transaction(dict(row), user_id) for row in rows]
+        except Exception as e:
+            print(f"SERVICE ERROR (Bulk Add validation): {e}")
+            return 0
+
+        result = self.transaction_repo.create_many(transactions)
+        if result.error:
+            print(f"SERVICE ERROR (Bulk Add): saved {len(result.rows)} of {len(transactions)} rows before: {result.error}")
+
+        if result.rows:
+            self.sync_service.invalidate()
+            self._notify_goal_tags(row.get("tag") for row in result.rows)
+        return len(result.rows)
+
+    def iter_import_statement(self, file_path: str, options: ImportOptions) -> Iterator[Dict[str, Any]]:
+        user_id = self.get_active_user_id()
+        if not user_id:
+            raise ValueError("Nie wybrano aktywnego użytkownika.")
+
+        imported = 0
+        try:
+            for progress in self.importer.iter_import(file_path, options, user_id):
+                imported = progress["imported"]
+                yield progress
+        finally:
+            if imported:
+                self.sync_service.invalidate()
+                self._notify_goal_tags([options.tag])
+
+    def iter_export_transactions(self, file_path: str, fmt: str, filters: Dict[str, Any]) -> Iterator[Dict[str, Any]]:
+        if not self._wallets_cache:
+            self.reload_cache()
+        return self.exporter.iter_export(
+            file_path, fmt, filters, self._wallets_cache.copy(), self.user_service.get_cached_users()
+        )
+
     def add_wallet(self, name: str, owner_id: str) -> bool:
         try:
             if self.wallet_repo.create({"wallet_name": name, "owner_name": owner_id, "is_active": True}):
@@ -425,6 +599,14 @@ class BudgetService:
     def get_budget_goals(self):
         return self.goal_repo.get_all()
 
+    def get_budget_goal_progress(self, tags: Optional[List[str]] = None, month: Optional[date] = None) -> List[GoalProgress]:
+        month_start = (month or date.today()).replace(day=1)
+        try:
+            return self.goal_repo.get_progress(month_start, tags)
+        except Exception as e:
+            print(f"SERVICE ERROR (Goal progress): {e}")
+            return []
+
     def set_budget_goal(self, tag: str, amount: float) -> bool:
         try:
             return self.goal_repo.upsert(tag, amount)
@@ -440,9 +622,19 @@ class BudgetService:
             return False
 
     def get_unique_tags(self) -> List[str]:
-        txs = self.transaction_repo.get_all()
-        tags = set(t.tag for t in txs if t.tag)
-        return sorted(list(tags))
+        return self._cached_lookup(
+            "tags",
+            self.transaction_repo.get_distinct_tags,
+            lambda: sorted(set(t.tag for t in self.sync_service.snapshot() if t.tag))
+        )
+
+    def get_cached_tags(self) -> List[str]:
+        # GUI-thread variant of get_unique_tags: the last fetched list even if a sync has
+        # moved the version on since, else the tags of the in-memory dataset.
+        cached = self._lookup_cache.get("tags")
+        if cached:
+            return list(cached[1])
+        return sorted(set(t.tag for t in self.sync_service.snapshot() if t.tag))
 
     def save_last_entry_prefs(self, prefs: Dict[str, Any]) -> None:
         try:
@@ -464,17 +656,30 @@ class BudgetService:
     
     def reload_cache(self) -> None:
         self._categories_cache = self.category_repo.get_all()
-        wallets = self.wallet_repo.get_all_active()
+        self._set_wallets(self.wallet_repo.get_all_active())
+
+    def load_local_cache(self) -> bool:
+        categories = self.category_repo.get_all_local()
+        wallets = self.wallet_repo.get_all_local()
+        if not categories or not self.sync_service.hydrate_from_replica():
+            return False
+        self._categories_cache = categories
+        self._set_wallets(wallets)
+        return True
+
+    def _set_wallets(self, wallets):
+        self._wallet_list = list(wallets)
         self._wallets_cache = {str(w.id): w.wallet_name for w in wallets}
 
-    def get_cache_snapshot(self) -> Dict[str, Any]:
+    def get_cache_snapshot(self, refresh_users: bool = True) -> Dict[str, Any]:
         if hasattr(self.user_service, 'load_users'):
              self.user_service.load_users()
              
         return {
             "wallets": self._wallets_cache.copy(),
+            "wallet_list": list(self._wallet_list),
             "categories": list(self._categories_cache),
-            "users": self.user_service.get_users()
+            "users": self.user_service.get_users() if refresh_users else self.user_service.get_cached_users()
         }
 
     def hydrate_cache(self, snapshot: Dict[str, Any]) -> None:
@@ -483,6 +688,9 @@ class BudgetService:
         
         if "wallets" in snapshot:
             self._wallets_cache = snapshot["wallets"]
+
+        if "wallet_list" in snapshot:
+            self._wallet_list = snapshot["wallet_list"]
             
         if "categories" in snapshot:
             self._categories_cache = snapshot["categories"]
\ No newline at end of file
@@ -0,0 +1,157 @@
+import csv
+import importlib.util
+import json
+import os
+import time
+from datetime import date
+from decimal import Decimal
+from typing import Optional, Iterator, Iterable, List, Dict, Any, Tuple
+from core.config import Config
+from repositories.transaction_repo import TransactionRepository
+
+EXPORT_FIELDS = [
+    "id", "transaction_date", "type", "category", "subcategory", "amount", "wallet", "to_wallet", "author",
+    "status", "sentiment", "tag", "description", "is_excluded_from_stats", "attachment_path"
+]
+
+FORMAT_EXTENSIONS = {"csv": ".csv", "jsonl": ".jsonl", "parquet": ".parquet"}
+
+_CENT = Decimal("0.01")
+
+def parquet_available() -> bool:
+    return importlib.util.find_spec("pyarrow") is not None
+
+def available_formats() -> List[str]:
+    return [fmt for fmt in FORMAT_EXTENSIONS if fmt != "parquet" or parquet_available()]
+
+def format_for_path(path: str) -> Optional[str]:
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".ndjson", ".json"):
+        return "jsonl"
+    return next((fmt for fmt, e in FORMAT_EXTENSIONS.items() if e == ext), None)
+
+class _CsvWriter:
+    def __init__(self, path: str):
+        # utf-8-sig so Excel picks up Polish characters without an import wizard.
+        self.file = open(path, "w", encoding="utf-8-sig", newline="")
+        self.writer = csv.writer(self.file, delimiter=";")
+        self.writer.writerow(EXPORT_FIELDS)
+
+    def write(self, records: List[Tuple]):
+        self.writer.writerows(records)
+
+    def close(self):
+        self.file.close()
+
+class _JsonlWriter:
+    def __init__(self, path: str):
+        self.file = open(path, "w", encoding="utf-8")
+
+    @staticmethod
+    def _default(value):
+        if isinstance(value, Decimal):
+            return float(value)
+        if isinstance(value, date):
+            return value.isoformat()
+        return str(value)
+
+    def write(self, records: List[Tuple]):
+        dumps, default = json.dumps, self._default
+        self.file.write("".join(
+            dumps(dict(zip(EXPORT_FIELDS, record)), ensure_ascii=False, default=default) + "\n" for record in records
+        ))
+
+    def close(self):
+        self.file.close()
+
+class _ParquetWriter:
+    def __init__(self, path: str):
+        try:
+            import pyarrow as pa
+            import pyarrow.parquet as pq
+        except ImportError:
+            raise RuntimeError("Eksport do Parquet wymaga pakietu pyarrow (pip install pyarrow).")
+        self.pa = pa
+        types = {"transaction_date": pa.date32(), "amount": pa.decimal128(18, 2), "is_excluded_from_stats": pa.bool_()}
+        self.schema = pa.schema([(name, types.get(name, pa.string())) for name in EXPORT_FIELDS])
+        # Every chunk becomes one row group, so the writer never buffers more than a chunk.
+        self.writer = pq.ParquetWriter(path, self.schema, compression="zstd")
+
+    def write(self, records: List[Tuple]):
+        columns = list(zip(*records))
+        arrays = [self.pa.array(col, type=field.type) for col, field in zip(columns, self.schema)]
+        self.writer.write_table(self.pa.Table.from_arrays(arrays, schema=self.schema))
+
+    def close(self):
+        self.writer.close()
+
+WRITERS = {"csv": _CsvWriter, "jsonl": _JsonlWriter, "parquet": _ParquetWriter}
+
+class ExportService:
+    def __init__(self, transaction_repo: Optional[TransactionRepository] = None):
+        self.transaction_repo = transaction_repo or TransactionRepository()
+
+    @staticmethod
+    def _to_record(row: Dict[str, Any], wallets: Dict[str, str], authors: Dict[str, str]) -> Tuple:
+        tx_date, amount = row["transaction_date"], row["amount"]
+        wallet, to_wallet, author = row.get("wallet_fk"), row.get("to_wallet_fk"), row.get("created_by_fk")
+        return (
+            str(row["id"]),
+            date.fromisoformat(tx_date) if isinstance(tx_date, str) else tx_date,
+            row.get("type"),
+            row.get("category"),
+            row.get("subcategory"),
+            (amount if isinstance(amount, Decimal) else Decimal(str(amount))).quantize(_CENT),
+            wallets.get(str(wallet), wallet),
+            None if to_wallet is None else wallets.get(str(to_wallet), to_wallet),
+            authors.get(str(author), author),
+            row.get("status"),
+            row.get("sentiment"),
+            row.get("tag"),
+            row.get("description"),
+            bool(row.get("is_excluded_from_stats")),
+            row.get("attachment_path"),
+        )
+
+    def _open_source(self, filters: Dict[str, Any], method: str) -> Tuple[str, Iterable[List[Dict[str, Any]]]]:
+        if method in ("auto", "cursor"):
+            try:
+                # Connects eagerly, so an unreachable database falls back before any row is read.
+                return "cursor", self.transaction_repo.iter_export_cursor(filters, Config.EXPORT_CHUNK_SIZE)
+            except Exception as e:
+                if method == "cursor":
+                    raise
+                print(f"SERVICE WARNING (Export): server-side cursor unavailable, falling back to REST pages: {str(e).strip()}")
+        return "rest", self.transaction_repo.iter_export_pages(filters)
+
+    def iter_export(self, path: str, fmt: str, filters: Dict[str, Any], wallets: Dict[str, str],
+                    authors: Dict[str, str], method: Optional[str] = None) -> Iterator[Dict[str, Any]]:
+        if fmt not in WRITERS:
+            raise ValueError(f"Nieobsługiwany format eksportu: {fmt}")
+        method = (method or Config.EXPORT_METHOD).lower()
+        if method not in ("auto", "cursor", "rest"):
+            raise ValueError(f"Nieznana metoda eksportu: {method}")
+
+        started = time.perf_counter()
+        # Written next to the target and renamed at the end: a failed or cancelled
+        # export never leaves a truncated file under the chosen name.
+        part_path = f"{path}.part"
+        writer = WRITERS[fmt](part_path)
+        chunks = None
+        exported = 0
+        try:
+            source, chunks = self._open_source(filters, method)
+            to_record = self._to_record
+            for rows in chunks:
+                writer.write([to_record(row, wallets, authors) for row in rows])
+                exported += len(rows)
+                yield {"source": source, "exported": exported, "elapsed": time.perf_counter() - started}
+            writer.close()
+            os.replace(part_path, path)
+        finally:
+            close = getattr(chunks, "close", None)
+            if close is not None:
+                close()
+            if os.path.exists(part_path):
+                writer.close()
+                os.remove(part_path)
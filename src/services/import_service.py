@@ -0,0 +1,108 @@
+import time
+from collections import deque
+from concurrent.futures import ThreadPoolExecutor
+from dataclasses import dataclass
+from itertools import islice
+from typing import Optional, Iterator, Iterable, List, Dict, Any
+from core.config import Config
+from models.transaction import Transaction, TransactionDecoder
+from repositories.transaction_repo import TransactionRepository
+from services.statement_parsers import StatementRow, ColumnMap, iter_statement_rows
+
+@dataclass
+class ImportOptions:
+    wallet_fk: str
+    expense_subcategory_fk: int
+    income_subcategory_fk: int
+    fmt: Optional[str] = None
+    column_map: Optional[ColumnMap] = None
+    status: str = "COMPLETED"
+    tag: Optional[str] = None
+    method: Optional[str] = None
+
+class ImportService:
+    MAX_PARALLEL_INSERTS = 4
+
+    def __init__(self, transaction_repo: Optional[TransactionRepository] = None):
+        self.transaction_repo = transaction_repo or TransactionRepository()
+
+    @staticmethod
+    def _to_record(row: StatementRow, options: ImportOptions, user_id: str) -> Dict[str, Any]:
+        expense = row.amount < 0
+        description = f"{row.counterparty}: {row.description}" if row.counterparty and row.description else row.counterparty or row.description
+        return {
+            "amount": abs(row.amount),
+            "transaction_date": row.booking_date,
+            "wallet_fk": options.wallet_fk,
+            "subcategory_fk": options.expense_subcategory_fk if expense else options.income_subcategory_fk,
+            "type": "EXPENSE" if expense else "INCOME",
+            "created_by_fk": user_id,
+            "status": options.status,
+            "tag": options.tag,
+            "description": description or None,
+        }
+
+    def iter_transaction_chunks(self, file_path: str, options: ImportOptions, user_id: str, chunk_size: int) -> Iterator[List[Transaction]]:
+        records = (self._to_record(row, options, user_id) for row in iter_statement_rows(file_path, options.fmt, options.column_map))
+        decoder = TransactionDecoder()
+        while True:
+            chunk = list(islice(records, chunk_size))
+            if not chunk:
+                return
+            yield Transaction.from_rows(chunk, decoder)
+
+    def _resolve_method(self, requested: Optional[str]) -> str:
+        method = (requested or Config.IMPORT_METHOD).lower()
+        if method not in ("auto", "copy", "rest"):
+            raise ValueError(f"Nieznana metoda importu: {method}")
+        return method
+
+    def _iter_rest(self, chunks: Iterable[List[Transaction]]) -> Iterator[Dict[str, Any]]:
+        # Chunks go out on the shared HTTP pool a few at a time; the window keeps at
+        # most MAX_PARALLEL_INSERTS parsed chunks in memory.
+        def insert(chunk):
+            try:
+                return {"loaded": self.transaction_repo.insert_chunk(chunk), "failed": 0, "error": None}
+            except Exception as e:
+                return {"loaded": 0, "failed": len(chunk), "error": str(e)}
+
+        with ThreadPoolExecutor(max_workers=self.MAX_PARALLEL_INSERTS) as pool:
+            window = deque()
+            for chunk in chunks:
+                window.append(pool.submit(insert, chunk))
+                if len(window) >= self.MAX_PARALLEL_INSERTS:
+                    yield window.popleft().result()
+            while window:
+                yield window.popleft().result()
+
+    def iter_import(self, file_path: str, options: ImportOptions, user_id: str) -> Iterator[Dict[str, Any]]:
+        method = self._resolve_method(options.method)
+        started = time.perf_counter()
+
+        loader = None
+        if method in ("auto", "copy"):
+            chunks = self.iter_transaction_chunks(file_path, options, user_id, Config.IMPORT_COPY_CHUNK_SIZE)
+            try:
+                # Connects eagerly, so an unreachable database falls back before any row is read.
+                counts = self.transaction_repo.iter_copy_insert(chunks)
+                loader = ({"loaded": count, "failed": 0, "error": None} for count in counts)
+                method = "copy"
+            except Exception as e:
+                if method == "copy":
+                    raise
+                print(f"SERVICE WARNING (Import): COPY unavailable, falling back to REST inserts: {str(e).strip()}")
+        if loader is None:
+            chunks = self.iter_transaction_chunks(file_path, options, user_id, TransactionRepository.INSERT_CHUNK_SIZE)
+            loader = self._iter_rest(chunks)
+            method = "rest"
+
+        loaded = failed = 0
+        for result in loader:
+            loaded += result["loaded"]
+            failed += result["failed"]
+            if result["error"]:
+                print(f"SERVICE ERROR (Import): {result['failed']} rows failed: {result['error']}")
+            yield {
+                "method": method, "imported": loaded, "failed": failed, "error": result["error"],
+                "elapsed": time.perf_counter() - started,
+            }
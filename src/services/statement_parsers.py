@@ -0,0 +1,312 @@
+import csv
+import json
+import os
+import re
+import xml.etree.ElementTree as ET
+from dataclasses import dataclass, field, fields
+from datetime import date, datetime
+from decimal import Decimal, InvalidOperation
+from typing import Optional, List, Union, Iterator, Dict
+from core.config import Config
+
+@dataclass(slots=True)
+class StatementRow:
+    booking_date: date
+    amount: Decimal
+    description: str = ""
+    counterparty: str = ""
+    reference: str = ""
+    currency: str = ""
+
+Column = Union[str, int, None]
+
+@dataclass
+class ColumnMap:
+    date_column: Column = "Data"
+    amount_column: Column = "Kwota"
+    debit_column: Column = None
+    credit_column: Column = None
+    description_columns: List[Column] = field(default_factory=lambda: ["Opis"])
+    counterparty_column: Column = None
+    reference_column: Column = None
+    currency_column: Column = None
+    date_format: Optional[str] = None
+    delimiter: Optional[str] = None
+    encoding: Optional[str] = None
+    has_header: bool = True
+
+    @classmethod
+    def from_dict(cls, data: dict) -> "ColumnMap":
+        known = {f.name for f in fields(cls)}
+        return cls(**{k: v for k, v in data.items() if k in known})
+
+PRESETS: Dict[str, ColumnMap] = {
+    "Ogólny (Data;Kwota;Opis)": ColumnMap(counterparty_column="Kontrahent"),
+    "Generic (Date,Amount,Description)": ColumnMap(
+        date_column="Date", amount_column="Amount", description_columns=["Description"], counterparty_column="Payee"
+    ),
+}
+
+def load_column_maps() -> Dict[str, ColumnMap]:
+    maps = dict(PRESETS)
+    path = Config.IMPORT_MAPPINGS_PATH
+    if path and os.path.exists(path):
+        try:
+            with open(path, "r", encoding="utf-8") as f:
+                for name, data in json.load(f).items():
+                    maps[name] = ColumnMap.from_dict(data)
+        except (OSError, ValueError, TypeError) as e:
+            print(f"CONFIG WARNING: Niepoprawny plik mapowań importu ({path}): {e}")
+    return maps
+
+DATE_FORMATS = ("%Y-%m-%d", "%d.%m.%Y", "%d-%m-%Y", "%d/%m/%Y", "%Y.%m.%d", "%Y%m%d")
+_AMOUNT_JUNK = re.compile(r"[^\d,.\-+]")
+# One kind of separator between 3-digit groups is grouping only: "1,234", "1.234.567".
+_GROUPED_ONLY = re.compile(r"[+-]?[1-9]\d{0,2}(?P<sep>[,.])\d{3}(?:(?P=sep)\d{3})*")
+
+def parse_amount(text: str) -> Optional[Decimal]:
+    text = _AMOUNT_JUNK.sub("", (text or "").replace("−", "-"))
+    # Some banks put the sign last: "12,50-".
+    if text[-1:] in ("-", "+") and text[:-1] and text[0] not in "+-":
+        text = text[-1] + text[:-1]
+    if not text:
+        return None
+    grouped = _GROUPED_ONLY.fullmatch(text)
+    if grouped:
+        text = text.replace(grouped.group("sep"), "")
+    else:
+        # Otherwise the right-most separator is the decimal one: "1.234,56", "1,234.56", "-12,5".
+        last = max(text.rfind(","), text.rfind("."))
+        if last >= 0:
+            text = text[:last].replace(",", "").replace(".", "") + "." + text[last + 1:]
+    try:
+        return Decimal(text)
+    except InvalidOperation:
+        return None
+
+def parse_date(text: str, fmt: Optional[str] = None) -> Optional[date]:
+    text = (text or "").strip()
+    for candidate in ((fmt,) if fmt else DATE_FORMATS):
+        # "2026-03-01 12:30" and "2026-03-01T12:30:00" exports carry a time part.
+        for value in (text, text[:10]):
+            try:
+                return datetime.strptime(value, candidate).date()
+            except ValueError:
+                continue
+    return None
+
+def sniff_encoding(path: str) -> str:
+    with open(path, "rb") as f:
+        head = f.read(64 * 1024)
+    if head.startswith(b"\xef\xbb\xbf"):
+        return "utf-8-sig"
+    try:
+        head.decode("utf-8")
+        return "utf-8"
+    except UnicodeDecodeError as e:
+        # A multi-byte character cut at the end of the sample is still UTF-8.
+        return "utf-8" if e.start >= len(head) - 3 else "cp1250"
+
+def detect_format(path: str) -> str:
+    ext = os.path.splitext(path)[1].lower()
+    if ext in (".sta", ".mt940", ".940"):
+        return "mt940"
+    with open(path, "rb") as f:
+        head = f.read(4096)
+    if head.lstrip(b"\xef\xbb\xbf \r\n\t").startswith(b"<"):
+        return "camt053"
+    if re.search(rb"^:20:", head, re.M) and re.search(rb"^:61:|^:60[FM]:", head, re.M):
+        return "mt940"
+    return "csv"
+
+def _column_index(header: List[str], column: Column) -> Optional[int]:
+    if column is None or isinstance(column, int):
+        return column
+    wanted = column.strip().lower()
+    for i, name in enumerate(header):
+        if name.strip().lower() == wanted:
+            return i
+    raise ValueError(f"Brak kolumny '{column}' w pliku")
+
+def iter_csv_rows(path: str, column_map: ColumnMap) -> Iterator[StatementRow]:
+    encoding = column_map.encoding or sniff_encoding(path)
+    with open(path, "r", encoding=encoding, newline="") as f:
+        delimiter = column_map.delimiter
+        if delimiter is None:
+            sample = f.read(16 * 1024)
+            f.seek(0)
+            try:
+                delimiter = csv.Sniffer().sniff(sample, delimiters=";,\t|").delimiter
+            except csv.Error:
+                delimiter = ";"
+        reader = csv.reader(f, delimiter=delimiter)
+
+        header: List[str] = []
+        if column_map.has_header:
+            # Bank exports often start with an account summary; the header is the
+            # first line that names the date column.
+            date_name = str(column_map.date_column).strip().lower()
+            for row in reader:
+                if isinstance(column_map.date_column, int) or any(c.strip().lower() == date_name for c in row):
+                    header = row
+                    break
+            else:
+                return
+
+        date_i = _column_index(header, column_map.date_column)
+        amount_i = _column_index(header, column_map.amount_column) if column_map.debit_column is None else None
+        debit_i = _column_index(header, column_map.debit_column)
+        credit_i = _column_index(header, column_map.credit_column)
+        desc_is = [_column_index(header, c) for c in column_map.description_columns]
+        party_i = _column_index(header, column_map.counterparty_column)
+        ref_i = _column_index(header, column_map.reference_column)
+        ccy_i = _column_index(header, column_map.currency_column)
+        cell = lambda row, i: row[i].strip() if i is not None and i < len(row) else ""
+
+        for row in reader:
+            booking_date = parse_date(cell(row, date_i), column_map.date_format)
+            if booking_date is None:
+                continue
+            if amount_i is not None:
+                amount = parse_amount(cell(row, amount_i))
+            else:
+                debit, credit = parse_amount(cell(row, debit_i)), parse_amount(cell(row, credit_i))
+                amount = (credit or Decimal(0)) - abs(debit or Decimal(0)) if debit is not None or credit is not None else None
+            if not amount:
+                continue
+            yield StatementRow(
+                booking_date, amount,
+                " ".join(filter(None, (cell(row, i) for i in desc_is))),
+                cell(row, party_i), cell(row, ref_i), cell(row, ccy_i)
+            )
+
+_MT940_TAG = re.compile(r"^:(\d{2}[A-Z]?):(.*)$")
+_MT940_61 = re.compile(r"^(\d{6})(\d{4})?(RC|RD|C|D)([A-Z])?(\d+(?:,\d*)?)")
+_MT940_SUBFIELD = re.compile(r"[~^?](\d{2})")
+
+def _mt940_date(yymmdd: str) -> date:
+    year = int(yymmdd[:2])
+    return date(year + (1900 if year > 79 else 2000), int(yymmdd[2:4]), int(yymmdd[4:6]))
+
+def _mt940_details(text: str):
+    # Structured :86: (Polish banks, SEPA) carries ~NN / ^NN / ?NN subfields:
+    # 20-27 remittance text, 32-33 counterparty name.
+    parts = _MT940_SUBFIELD.split(text)
+    if len(parts) < 3:
+        return text.strip(), ""
+    subfields: Dict[int, str] = {}
+    for code, value in zip(parts[1::2], parts[2::2]):
+        subfields[int(code)] = subfields.get(int(code), "") + value
+    description = "".join(subfields.get(i, "") for i in range(20, 28)) or "".join(subfields.get(i, "") for i in range(60, 64))
+    return description.strip(), "".join(subfields.get(i, "") for i in (32, 33)).strip()
+
+def iter_mt940_rows(path: str, encoding: Optional[str] = None) -> Iterator[StatementRow]:
+    currency = ""
+    pending: Optional[StatementRow] = None
+    details: List[str] = []
+    tag = None
+
+    def flush():
+        if pending is None:
+            return None
+        if details:
+            pending.description, pending.counterparty = _mt940_details("".join(details))
+        return pending
+
+    with open(path, "r", encoding=encoding or sniff_encoding(path), errors="replace") as f:
+        for raw in f:
+            line = raw.rstrip("\r\n")
+            match = _MT940_TAG.match(line)
+            if match is None:
+                if tag == "86":
+                    details.append(line)
+                continue
+            tag, value = match.groups()
+            if tag in ("60F", "60M"):
+                currency = value[7:10]
+            elif tag == "61":
+                row = flush()
+                if row is not None:
+                    yield row
+                details = []
+                m = _MT940_61.match(value)
+                if m is None:
+                    pending = None
+                    continue
+                amount = Decimal(m.group(5).replace(",", "."))
+                # Debit or reversed credit takes money out of the account.
+                if m.group(3) in ("D", "RC"):
+                    amount = -amount
+                reference = value[m.end():]
+                pending = StatementRow(_mt940_date(m.group(1)), amount, reference=reference[4:].split("//")[0].strip(), currency=currency)
+            elif tag == "86":
+                details = [value]
+            elif tag in ("62F", "62M", "64", "65"):
+                row = flush()
+                if row is not None:
+                    yield row
+                pending, details = None, []
+        row = flush()
+        if row is not None:
+            yield row
+
+def _local(tag: str) -> str:
+    return tag.rsplit("}", 1)[-1]
+
+def _text(element, path: str) -> str:
+    found = element.find(path)
+    return (found.text or "").strip() if found is not None and found.text else ""
+
+def iter_camt053_rows(path: str) -> Iterator[StatementRow]:
+    statement = None
+    currency = ""
+    for event, element in ET.iterparse(path, events=("start", "end")):
+        name = _local(element.tag)
+        if event == "start":
+            if name == "Stmt":
+                statement, currency = element, ""
+            continue
+        if name == "Acct" and statement is not None:
+            currency = _text(element, "{*}Ccy") or currency
+            continue
+        if name != "Ntry":
+            continue
+
+        amount_el = element.find("{*}Amt")
+        amount = Decimal(amount_el.text.strip()) if amount_el is not None and amount_el.text else Decimal(0)
+        debit = _text(element, "{*}CdtDbtInd") == "DBIT"
+        if _text(element, "{*}RvslInd").lower() == "true":
+            debit = not debit
+        booked = _text(element, "{*}BookgDt/{*}Dt") or _text(element, "{*}BookgDt/{*}DtTm")[:10] \
+            or _text(element, "{*}ValDt/{*}Dt") or _text(element, "{*}ValDt/{*}DtTm")[:10]
+
+        tx = element.find("{*}NtryDtls/{*}TxDtls")
+        description, counterparty, reference = "", "", _text(element, "{*}AcctSvcrRef") or _text(element, "{*}NtryRef")
+        if tx is not None:
+            description = " ".join(u.text.strip() for u in tx.iterfind("{*}RmtInf/{*}Ustrd") if u.text)
+            party = "Cdtr" if debit else "Dbtr"
+            counterparty = _text(tx, f"{{*}}RltdPties/{{*}}{party}/{{*}}Nm") or _text(tx, f"{{*}}RltdPties/{{*}}{party}/{{*}}Pty/{{*}}Nm")
+            reference = reference or _text(tx, "{*}Refs/{*}EndToEndId")
+            description = description or _text(tx, "{*}AddtlTxInf")
+        description = description or _text(element, "{*}AddtlNtryInf")
+
+        if booked and amount:
+            yield StatementRow(
+                date.fromisoformat(booked), -amount if debit else amount, description, counterparty, reference,
+                (amount_el.get("Ccy") if amount_el is not None else "") or currency
+            )
+        # Entries are detached once read, so memory stays flat on year-long statements.
+        if statement is not None:
+            statement.remove(element)
+        else:
+            element.clear()
+
+def iter_statement_rows(path: str, fmt: Optional[str] = None, column_map: Optional[ColumnMap] = None) -> Iterator[StatementRow]:
+    fmt = fmt or detect_format(path)
+    if fmt == "mt940":
+        return iter_mt940_rows(path)
+    if fmt == "camt053":
+        return iter_camt053_rows(path)
+    if fmt == "csv":
+        return iter_csv_rows(path, column_map or ColumnMap())
+    raise ValueError(f"Nieobsługiwany format wyciągu: {fmt}")
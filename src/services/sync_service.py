@@ -0,0 +1,256 @@
+import threading
+from dataclasses import dataclass, field
+from datetime import datetime, timedelta, timezone
+from typing import Dict, List, Optional, Iterator, Any
+from core.config import Config
+from models.transaction import Transaction
+from repositories.transaction_repo import TransactionRepository
+
+EPOCH = datetime(1970, 1, 1, tzinfo=timezone.utc)
+
+@dataclass
+class SyncResult:
+    upserted: List[Transaction] = field(default_factory=list)
+    deleted_ids: List[str] = field(default_factory=list)
+
+    @property
+    def has_changes(self) -> bool:
+        return bool(self.upserted or self.deleted_ids)
+
+class TransactionSyncService:
+    _instance = None
+    # updated_at is set with NOW() (transaction start time), so a row committed late can
+    # carry a timestamp below the watermark. Re-reading a short window catches it;
+    # merging is idempotent.
+    SAFETY_OVERLAP = timedelta(minutes=2)
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(TransactionSyncService, cls).__new__(cls)
+            cls._instance.repo = TransactionRepository()
+            cls._instance._lock = threading.RLock()
+            cls._instance._sync_lock = threading.Lock()
+            cls._instance._version = 0
+            cls._instance._load_generation = 0
+            cls._instance._reset_state()
+        return cls._instance
+
+    STATE_KEYS = {
+        "loaded": "fact_transactions.loaded",
+        "source": "fact_transactions.source_url",
+        "updated": "fact_transactions.updated_watermark",
+        "created": "fact_transactions.created_watermark",
+        "tombstone": "fact_transactions.tombstone_watermark",
+    }
+
+    def _reset_state(self):
+        # Supersedes a full load still paging in another thread.
+        self._load_generation += 1
+        self._transactions: Dict[str, Transaction] = {}
+        self._updated_watermark: Optional[datetime] = None
+        self._created_watermark: Optional[datetime] = None
+        self._tombstone_watermark: Optional[datetime] = None
+        self._is_loaded = False
+
+    @staticmethod
+    def _parse_ts(value: Any) -> Optional[datetime]:
+        if not value:
+            return None
+        if isinstance(value, datetime):
+            return value
+        try:
+            return datetime.fromisoformat(str(value).replace("Z", "+00:00"))
+        except ValueError:
+            return None
+
+    def _since(self, watermark: Optional[datetime]) -> datetime:
+        if watermark is None:
+            return EPOCH
+        return watermark - self.SAFETY_OVERLAP
+
+    def _advance_watermarks(self, tx: Transaction):
+        updated = self._parse_ts(tx.updated_at)
+        if updated and (self._updated_watermark is None or updated > self._updated_watermark):
+            self._updated_watermark = updated
+
+        created = self._parse_ts(tx.created_at)
+        if created and (self._created_watermark is None or created > self._created_watermark):
+            self._created_watermark = created
+
+    def version(self) -> int:
+        return self._version
+
+    def invalidate(self):
+        with self._lock:
+            self._version += 1
+
+    def is_loaded(self) -> bool:
+        return self._is_loaded
+
+    @staticmethod
+    def _to_replica_row(tx: Transaction) -> Dict[str, Any]:
+        row = tx.to_dict()
+        row.update({
+            "id": str(tx.id),
+            "amount": str(tx.amount),
+            "to_wallet_fk": str(tx.to_wallet_fk) if tx.to_wallet_fk else None,
+            "sentiment": tx.sentiment.value if tx.sentiment else None,
+            "created_at": tx.created_at,
+            "updated_at": tx.updated_at,
+            "deleted_at": tx.deleted_at,
+        })
+        return row
+
+    def _watermark_state(self) -> Dict[str, Optional[str]]:
+        def fmt(value: Optional[datetime]) -> Optional[str]:
+            return value.isoformat() if value else None
+
+        return {
+            self.STATE_KEYS["loaded"]: "1",
+            self.STATE_KEYS["source"]: Config.SUPABASE_URL,
+            self.STATE_KEYS["updated"]: fmt(self._updated_watermark),
+            self.STATE_KEYS["created"]: fmt(self._created_watermark),
+            self.STATE_KEYS["tombstone"]: fmt(self._tombstone_watermark),
+        }
+
+    def _persist(self, upserted: List[Transaction], deleted_ids: List[str], replace: bool = False):
+        if replace or upserted or deleted_ids:
+            self._version += 1
+        try:
+            self.repo.replica.apply_changes(
+                self.repo.table,
+                upserted=[self._to_replica_row(tx) for tx in upserted],
+                deleted_keys=deleted_ids,
+                state=self._watermark_state(),
+                replace=replace
+            )
+        except Exception as e:
+            print(f"SYNC WARNING (Replica): {e}")
+
+    def hydrate_from_replica(self) -> bool:
+        with self._lock:
+            if self._is_loaded:
+                return True
+
+            replica = self.repo.replica
+            if replica.get_state(self.STATE_KEYS["loaded"]) != "1":
+                return False
+            if replica.get_state(self.STATE_KEYS["source"]) != Config.SUPABASE_URL:
+                return False
+
+            try:
+                transactions = self.repo.get_all_local()
+            except Exception as e:
+                print(f"SYNC WARNING (Replica): {e}")
+                return False
+
+            self._transactions = {str(tx.id): tx for tx in transactions}
+            self._updated_watermark = self._parse_ts(replica.get_state(self.STATE_KEYS["updated"]))
+            self._created_watermark = self._parse_ts(replica.get_state(self.STATE_KEYS["created"]))
+            self._tombstone_watermark = self._parse_ts(replica.get_state(self.STATE_KEYS["tombstone"]))
+            self._is_loaded = True
+            return True
+
+    def reset(self):
+        with self._lock:
+            self._reset_state()
+
+    def iter_full_load(self, page_size: int = TransactionRepository.DEFAULT_PAGE_SIZE) -> Iterator[List[Transaction]]:
+        # The lock is taken per step rather than around the whole generator, so an
+        # abandoned generator can never leave it held. A newer load or reset bumps the
+        # generation: this one still pages for its caller but no longer writes shared state.
+        tombstone_watermark = None
+        try:
+            # Pruned tombstones are older than anything this load reads, so the watermark
+            # starts at least at the prune horizon.
+            marks = [self._parse_ts(self.repo.get_latest_tombstone_at()), self._parse_ts(self.repo.get_tombstone_horizon())]
+            tombstone_watermark = max((m for m in marks if m), default=None)
+        except Exception as e:
+            print(f"SYNC WARNING (Tombstones): {e}")
+
+        with self._lock:
+            self._reset_state()
+            generation = self._load_generation
+            self._tombstone_watermark = tombstone_watermark
+
+        loaded: Dict[str, Transaction] = {}
+        for page in self.repo.iter_pages(page_size):
+            with self._lock:
+                current = generation == self._load_generation
+                for tx in page:
+                    loaded[str(tx.id)] = tx
+                    if current:
+                        self._advance_watermarks(tx)
+            yield page
+
+        with self._lock:
+            if generation != self._load_generation:
+                return
+            self._transactions = loaded
+            self._is_loaded = True
+            self._persist(list(loaded.values()), [], replace=True)
+
+    def _full_sync(self, page_size: int) -> SyncResult:
+        result = SyncResult()
+        for page in self.iter_full_load(page_size):
+            result.upserted.extend(page)
+        return result
+
+    def sync(self, page_size: int = TransactionRepository.DEFAULT_PAGE_SIZE) -> SyncResult:
+        # Syncs run one at a time; _lock is only taken to read the watermarks and to merge,
+        # so snapshot(), invalidate() and hydrate_from_replica() never wait on the network.
+        with self._sync_lock:
+            with self._lock:
+                loaded = self._is_loaded
+                generation = self._load_generation
+                updated_since = self._since(self._updated_watermark)
+                created_since = self._since(self._created_watermark)
+                tombstone_watermark = self._tombstone_watermark
+            if not loaded:
+                return self._full_sync(page_size)
+
+            changed = [tx for page in self.repo.iter_changed_pages(updated_since, created_since, page_size) for tx in page]
+            try:
+                pruned_through = self._parse_ts(self.repo.get_tombstone_horizon())
+                tombstones = list(self.repo.iter_tombstones_since(self._since(tombstone_watermark), page_size))
+            except Exception as e:
+                print(f"SYNC WARNING (Tombstones): {e} - falling back to full reload")
+                return self._full_sync(page_size)
+            if pruned_through and (tombstone_watermark is None or pruned_through > tombstone_watermark):
+                print("SYNC: tombstones newer than the local watermark were pruned - full reload")
+                return self._full_sync(page_size)
+
+            with self._lock:
+                # A reset or full load replaced the state while this one was fetching.
+                if generation != self._load_generation:
+                    return SyncResult()
+
+                result = SyncResult()
+                for tx in changed:
+                    key = str(tx.id)
+                    self._advance_watermarks(tx)
+
+                    if tx.deleted_at:
+                        if self._transactions.pop(key, None) is not None:
+                            result.deleted_ids.append(key)
+                        continue
+
+                    if self._transactions.get(key) != tx:
+                        self._transactions[key] = tx
+                        result.upserted.append(tx)
+
+                for stone in tombstones:
+                    deleted_at = self._parse_ts(stone.get("deleted_at"))
+                    if deleted_at and (self._tombstone_watermark is None or deleted_at > self._tombstone_watermark):
+                        self._tombstone_watermark = deleted_at
+                    if self._transactions.pop(str(stone["row_id"]), None) is not None:
+                        result.deleted_ids.append(str(stone["row_id"]))
+
+                self._persist(result.upserted, result.deleted_ids)
+                return result
+
+    def snapshot(self) -> List[Transaction]:
+        with self._lock:
+            transactions = list(self._transactions.values())
+        transactions.sort(key=lambda t: (t.transaction_date, str(t.id)), reverse=True)
+        return transactions
@@ -0,0 +1,108 @@
+import hashlib
+import os
+from concurrent.futures import ThreadPoolExecutor, as_completed
+from typing import Optional, Union, List, Iterator, Tuple
+from PyQt6.QtCore import Qt, QBuffer, QByteArray, QIODevice
+from PyQt6.QtGui import QImage, QImageReader
+from core.config import Config
+from services.attachment_service import AttachmentService
+
+IMAGE_EXTENSIONS = {".jpg", ".jpeg", ".png", ".bmp", ".gif", ".webp"}
+
+class ThumbnailService:
+    THUMB_EDGE = 160
+    MAX_PARALLEL = 4
+    SUBDIR = "thumbnails"
+
+    _instance = None
+
+    def __new__(cls):
+        if cls._instance is None:
+            cls._instance = super(ThumbnailService, cls).__new__(cls)
+            cls._instance.attachments = AttachmentService()
+            os.makedirs(os.path.join(Config.ATTACHMENT_CACHE_DIR, cls.SUBDIR), exist_ok=True)
+            cls._instance.attachments.cache.drop_unindexed(cls.SUBDIR)
+        return cls._instance
+
+    @staticmethod
+    def is_image(storage_path: str) -> bool:
+        return os.path.splitext(storage_path)[1].lower() in IMAGE_EXTENSIONS
+
+    @staticmethod
+    def decode_scaled(source: Union[str, bytes], max_edge: int) -> QImage:
+        # QImageReader decodes straight to the target size (JPEG via DCT scaling),
+        # so a 12 MP photo never materializes at full resolution.
+        if isinstance(source, str):
+            reader = QImageReader(source)
+        else:
+            buffer = QBuffer()
+            buffer.setData(QByteArray(bytes(source)))
+            buffer.open(QIODevice.OpenModeFlag.ReadOnly)
+            reader = QImageReader(buffer)
+        reader.setAutoTransform(True)
+        size = reader.size()
+        if size.isValid() and max(size.width(), size.height()) > max_edge:
+            reader.setScaledSize(size.scaled(max_edge, max_edge, Qt.AspectRatioMode.KeepAspectRatio))
+        return reader.read()
+
+    @staticmethod
+    def _thumb_key(storage_path: str, edge: int) -> str:
+        return f"{storage_path}#thumb{edge}"
+
+    def _cached_thumbnail(self, storage_path: str, edge: int) -> Optional[QImage]:
+        cache = self.attachments.cache
+        thumb_key = self._thumb_key(storage_path, edge)
+        thumb = cache.lookup(thumb_key)
+        if thumb is None:
+            return None
+        # The thumbnail remembers the ETag it was made from; a blob refetched since then
+        # under a new ETag makes it stale, an evicted blob does not.
+        if not self.attachments.is_content_addressed(storage_path):
+            blob = cache.lookup(storage_path)
+            if blob is not None and blob["etag"] != thumb["etag"]:
+                return None
+        cache.touch(thumb_key)
+        return QImage(thumb["local_path"])
+
+    def thumbnail(self, storage_path: str, edge: int = THUMB_EDGE) -> Optional[QImage]:
+        storage_path = storage_path.lstrip("/")
+        if not self.is_image(storage_path):
+            return None
+
+        image = self._cached_thumbnail(storage_path, edge)
+        if image is not None and not image.isNull():
+            return image
+
+        local_path = self.attachments.fetch(storage_path)
+        if local_path is None:
+            return None
+        blob = self.attachments.cache.lookup(storage_path)
+
+        image = self.decode_scaled(local_path, edge)
+        if image.isNull():
+            return None
+        buffer = QBuffer()
+        buffer.open(QIODevice.OpenModeFlag.WriteOnly)
+        if image.save(buffer, "PNG"):
+            # Indexed like any blob, so thumbnails count toward the cache limit and are evicted with it.
+            thumb_key = self._thumb_key(storage_path, edge)
+            file_name = os.path.join(self.SUBDIR, hashlib.sha1(thumb_key.encode("utf-8")).hexdigest() + ".png")
+            self.attachments.cache.put(thumb_key, bytes(buffer.data()), blob["etag"] if blob else None, file_name=file_name)
+        return image
+
+    def iter_thumbnails(self, storage_paths: List[str], edge: int = THUMB_EDGE) -> Iterator[Tuple[str, QImage]]:
+        paths = [p for p in storage_paths if self.is_image(p)]
+        pool = ThreadPoolExecutor(max_workers=self.MAX_PARALLEL)
+        try:
+            futures = {pool.submit(self.thumbnail, p, edge): p for p in paths}
+            for future in as_completed(futures):
+                try:
+                    image = future.result()
+                except Exception as e:
+                    print(f"SERVICE WARNING (Thumbnail): {futures[future]}: {e}")
+                    continue
+                if image is not None:
+                    yield futures[future], image
+        finally:
+            # A superseded grid (folder switched, dialog closed) drops the downloads not yet started.
+            pool.shutdown(wait=False, cancel_futures=True)
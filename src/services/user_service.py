@@ -1,4 +1,8 @@
+import threading
+import time
 from typing import Dict, Optional, List
+from core.config import Config
+from core.events import EventBus
 from repositories.user_repo import UserRepository
 
 class UserService:
@@ -9,20 +13,57 @@ class UserService:
             cls._instance = super(UserService, cls).__new__(cls)
             cls._instance.repo = UserRepository()
             cls._instance._users_cache = {} 
+            cls._instance._lock = threading.RLock()
+            cls._instance._loaded_at = None
+            cls._instance._version = 0
             cls._instance._load_cache()
             cls._instance.active_user_id = None
         return cls._instance
 
     def _load_cache(self):
         data = self.repo.get_all()
-        self._users_cache = {u['id']: u for u in data}
+        with self._lock:
+            users = {u['id']: u for u in data}
+            self._loaded_at = time.monotonic()
+            if users != self._users_cache:
+                self._users_cache = users
+                self._bump_version()
 
-    def get_users(self) -> Dict[str, str]:
-        self._load_cache()
-        return {uid: data['alias'] for uid, data in self._users_cache.items()}
+    def _bump_version(self):
+        self._version += 1
+        EventBus.get().usersChanged.emit(self._version)
+
+    def _is_stale(self) -> bool:
+        return self._loaded_at is None or time.monotonic() - self._loaded_at > Config.USER_CACHE_TTL_SEC
+
+    def _update_cached(self, user_id: str, field: str, value):
+        with self._lock:
+            user = self._users_cache.get(str(user_id))
+            if user is None:
+                self._loaded_at = None
+                return
+            self._users_cache[str(user_id)] = {**user, field: value}
+            self._bump_version()
+
+    def invalidate(self):
+        with self._lock:
+            self._loaded_at = None
+
+    def version(self) -> int:
+        return self._version
+
+    def get_users(self, force: bool = False) -> Dict[str, str]:
+        if force or self._is_stale():
+            self._load_cache()
+        return self.get_cached_users()
+
+    def get_cached_users(self) -> Dict[str, str]:
+        with self._lock:
+            return {uid: data['alias'] for uid, data in self._users_cache.items()}
 
     def register_discovered_users(self, uuid_list: List[str]):
         self._load_cache()
+        added = False
         for uid in uuid_list:
             suid = str(uid)
             if suid not in self._users_cache:
@@ -33,16 +74,21 @@ class UserService:
                     "color_hex": "#888888",
                     "default_wallet_fk": None
                 }
-                self.repo.upsert(new_user)
-        self._load_cache()
+                if self.repo.upsert(new_user):
+                    with self._lock:
+                        self._users_cache[suid] = new_user
+                    added = True
+        if added:
+            with self._lock:
+                self._bump_version()
 
     def rename_user(self, user_id: str, new_alias: str):
         if self.repo.update_field(str(user_id), "alias", new_alias):
-            self._load_cache()
+            self._update_cached(user_id, "alias", new_alias)
 
     def set_user_color(self, user_id: str, color_hex: str):
         if self.repo.update_field(str(user_id), "color_hex", color_hex):
-            self._load_cache()
+            self._update_cached(user_id, "color_hex", color_hex)
 
     def get_user_color(self, user_id: str) -> str:
         u = self._users_cache.get(str(user_id))
@@ -64,4 +110,4 @@ class UserService:
         target = user_id or self.active_user_id
         if target:
             if self.repo.update_field(str(target), "default_wallet_fk", str(wallet_id)):
-                self._load_cache()
\ No newline at end of file
+                self._update_cached(target, "default_wallet_fk", str(wallet_id))
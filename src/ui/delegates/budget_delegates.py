@@ -166,8 +166,8 @@ class TagDelegate(QStyledItemDelegate):
     def createEditor(self, parent, option, index):
         editor = QComboBox(parent)
         editor.setEditable(True)
-        if hasattr(self.service, 'get_unique_tags'):
-            editor.addItems(self.service.get_unique_tags())
+        if hasattr(self.service, 'get_cached_tags'):
+            editor.addItems(self.service.get_cached_tags())
         return editor
 
     def setEditorData(self, editor, index):
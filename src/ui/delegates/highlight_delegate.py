@@ -1,25 +1,85 @@
-from PyQt6.QtWidgets import QStyledItemDelegate
-from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QTextDocument
-from html import escape
 import re
+from collections import OrderedDict
+from PyQt6.QtWidgets import QStyledItemDelegate, QStyle, QStyleOptionViewItem, QApplication
+from PyQt6.QtCore import Qt, QPointF, QRectF
+from PyQt6.QtGui import QColor, QFont, QFontMetricsF
+
+LAYOUT_CACHE_SIZE = 4096
 
 class HighlightDelegate(QStyledItemDelegate):
     def __init__(self, parent=None, original_delegate=None):
         super().__init__(parent)
         self.search_query = ""
-        self.neon_color = "#69f0ae" 
+        self._pattern = None
+        self.neon_color = "#69f0ae"
         self.original_delegate = original_delegate
+        self._neon = QColor(self.neon_color)
+        self._layouts = OrderedDict()
+        self._bold_fonts = {}
 
     def setSearchQuery(self, query):
+        if query != self.search_query:
+            self._layouts.clear()
         self.search_query = query
+        # Matched on the original text: lower() may change the length (e.g. "İ"), which
+        # would shift the highlighted spans.
+        self._pattern = re.compile(re.escape(query), re.IGNORECASE) if query else None
+
+    def _bold(self, font: QFont) -> QFont:
+        key = font.key()
+        bold = self._bold_fonts.get(key)
+        if bold is None:
+            bold = self._bold_fonts[key] = QFont(font)
+            bold.setBold(True)
+        return bold
+
+    def _layout(self, text: str, font: QFont, width: int):
+        key = (text, self.search_query, font.key(), width)
+        layout = self._layouts.get(key)
+        if layout is not None:
+            self._layouts.move_to_end(key)
+            return layout
+
+        metrics = QFontMetricsF(font)
+        bold_metrics = QFontMetricsF(self._bold(font))
+        # Elided with the regular font, the bold runs may still overflow: shrink until they fit.
+        limit = width
+        while True:
+            shown = metrics.elidedText(text, Qt.TextElideMode.ElideRight, limit)
+            segments, x = self._segments(shown, metrics, bold_metrics)
+            if x <= width or not shown or limit <= 0:
+                break
+            limit -= max(1, int(x - width + 0.5))
+
+        layout = (tuple(segments), x, metrics.ascent(), metrics.height())
+        self._layouts[key] = layout
+        if len(self._layouts) > LAYOUT_CACHE_SIZE:
+            self._layouts.popitem(last=False)
+        return layout
+
+    def _segments(self, shown: str, metrics: QFontMetricsF, bold_metrics: QFontMetricsF):
+        segments = []
+        x = 0.0
+        pos = 0
+        for match in self._pattern.finditer(shown):
+            if match.start() > pos:
+                plain = shown[pos:match.start()]
+                segments.append((x, plain, False))
+                x += metrics.horizontalAdvance(plain)
+            segments.append((x, match.group(), True))
+            x += bold_metrics.horizontalAdvance(match.group())
+            pos = match.end()
+        if pos < len(shown):
+            plain = shown[pos:]
+            segments.append((x, plain, False))
+            x += metrics.horizontalAdvance(plain)
+        return segments, x
 
     def paint(self, painter, option, index):
         text = index.data(Qt.ItemDataRole.DisplayRole)
-        
-        should_highlight = (text and self.search_query and 
-                            self.search_query.lower() in text.lower())
-        
+
+        should_highlight = bool(text and self._pattern and self._pattern.search(text))
+
         if not should_highlight:
             if self.original_delegate:
                 self.original_delegate.paint(painter, option, index)
@@ -27,40 +87,31 @@ class HighlightDelegate(QStyledItemDelegate):
                 super().paint(painter, option, index)
             return
 
-        escaped_text = escape(text)
-        escaped_query = escape(self.search_query)
-        pattern = re.compile(re.escape(escaped_query), re.IGNORECASE)
-        
-        highlighted_html = pattern.sub(
-            lambda m: f'<span style="color: {self.neon_color}; font-weight: bold; text-shadow: 0 0 5px {self.neon_color}, 0 0 15px {self.neon_color};">{m.group(0)}</span>',
-            escaped_text
-        )
+        opt = QStyleOptionViewItem(option)
+        self.initStyleOption(opt, index)
+        opt.text = ""
+        style = opt.widget.style() if opt.widget else QApplication.style()
+        style.drawControl(QStyle.ControlElement.CE_ItemViewItem, opt, painter, opt.widget)
 
-        painter.save()
-        
-        doc = QTextDocument()
-        doc.setDefaultFont(option.font)
-        text_color = option.palette.text().color().name()
-        doc.setDefaultStyleSheet(f"body {{ color: {text_color}; }}")
-        doc.setHtml(highlighted_html)
-
-        align = option.displayAlignment
-        rect = option.rect
-        doc_height = doc.size().height()
-        y_offset = (rect.height() - doc_height) / 2
-        translate_x = rect.left()
-        translate_y = rect.top()
-
-        if align & Qt.AlignmentFlag.AlignVCenter:
-            translate_y += y_offset
+        rect = option.rect.adjusted(4, 0, -4, 0)
+        segments, text_width, ascent, height = self._layout(text, opt.font, rect.width())
 
+        align = opt.displayAlignment
+        x = rect.left()
         if align & Qt.AlignmentFlag.AlignRight:
-            translate_x = rect.right() - doc.idealWidth()
+            x = rect.right() - text_width
         elif align & Qt.AlignmentFlag.AlignHCenter:
-             translate_x = rect.left() + (rect.width() - doc.idealWidth()) / 2
-        
-        painter.translate(translate_x, translate_y)
-        doc.drawContents(painter)
+            x = rect.left() + (rect.width() - text_width) / 2
+        y = rect.top() + (rect.height() - height) / 2 + ascent
+
+        painter.save()
+        painter.setClipRect(QRectF(option.rect))
+        text_color = opt.palette.text().color()
+        bold = self._bold(opt.font)
+        for offset, segment, is_match in segments:
+            painter.setFont(bold if is_match else opt.font)
+            painter.setPen(self._neon if is_match else text_color)
+            painter.drawText(QPointF(x + offset, y), segment)
         painter.restore()
 
     def createEditor(self, parent, option, index):
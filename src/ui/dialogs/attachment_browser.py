@@ -1,11 +1,16 @@
-import tempfile
 import os
 import subprocess
 import platform
-from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QListWidget, 
-                             QLabel, QPushButton, QSplitter, QMessageBox, QListWidgetItem)
-from PyQt6.QtCore import Qt
+from PyQt6.QtWidgets import (QDialog, QVBoxLayout, QHBoxLayout, QListWidget, QListView, QStyle, QLineEdit,
+                             QLabel, QPushButton, QSplitter, QMessageBox, QListWidgetItem, QFileDialog)
+from PyQt6.QtCore import Qt, QSize, QTimer
+from PyQt6.QtGui import QIcon
+from core.workers import TaskScheduler, TaskPriority
+from models.attachment_list_model import AttachmentListModel
 from ui.dialogs.image_preview_dialog import ImagePreviewDialog
+from services.thumbnail_service import ThumbnailService
+
+THUMB_EDGE = ThumbnailService.THUMB_EDGE
 
 class AttachmentBrowserDialog(QDialog):
     def __init__(self, service, parent=None):
@@ -18,10 +23,24 @@ class AttachmentBrowserDialog(QDialog):
         
         top_layout = QHBoxLayout()
         self.refresh_btn = QPushButton("Odśwież")
-        self.refresh_btn.clicked.connect(self.load_folders)
+        self.refresh_btn.clicked.connect(lambda: self.load_folders(force=True))
+        self.upload_btn = QPushButton("Wyślij pliki")
+        self.upload_btn.clicked.connect(self.handle_upload_files)
+        self.current_folder = None
         
+        self.search_input = QLineEdit()
+        self.search_input.setPlaceholderText("Szukaj w folderze (początek nazwy)...")
+        self.search_input.setClearButtonEnabled(True)
+        self.search_timer = QTimer(self)
+        self.search_timer.setSingleShot(True)
+        self.search_timer.setInterval(300)
+        self.search_timer.timeout.connect(self.apply_search)
+        self.search_input.textChanged.connect(self.search_timer.start)
+
         top_layout.addWidget(QLabel("STREFA PLIKÓW"))
         top_layout.addStretch()
+        top_layout.addWidget(self.search_input)
+        top_layout.addWidget(self.upload_btn)
         top_layout.addWidget(self.refresh_btn)
         self.layout.addLayout(top_layout)
 
@@ -30,8 +49,24 @@ class AttachmentBrowserDialog(QDialog):
         self.folder_list = QListWidget()
         self.folder_list.itemClicked.connect(self.on_folder_clicked)
         
-        self.file_list = QListWidget()
-        self.file_list.itemDoubleClicked.connect(self.on_file_double_clicked)
+        self.file_model = AttachmentListModel(QIcon(self.style().standardPixmap(QStyle.StandardPixmap.SP_FileIcon)), self)
+        self.file_model.pageLoaded.connect(self.on_page_loaded)
+        self.file_model.loadingChanged.connect(self.update_info)
+        self._thumbnail_handles = []
+        self._status_note = None
+
+        self.file_list = QListView()
+        self.file_list.setModel(self.file_model)
+        self.file_list.setViewMode(QListView.ViewMode.IconMode)
+        self.file_list.setIconSize(QSize(THUMB_EDGE, THUMB_EDGE))
+        self.file_list.setGridSize(QSize(THUMB_EDGE + 40, THUMB_EDGE + 50))
+        self.file_list.setResizeMode(QListView.ResizeMode.Adjust)
+        self.file_list.setMovement(QListView.Movement.Static)
+        self.file_list.setUniformItemSizes(True)
+        self.file_list.setWordWrap(True)
+        self.file_list.setLayoutMode(QListView.LayoutMode.Batched)
+        self.file_list.doubleClicked.connect(self.on_file_double_clicked)
+        self.finished.connect(lambda _: self.cancel_thumbnails())
         
         splitter.addWidget(self.folder_list)
         splitter.addWidget(self.file_list)
@@ -44,59 +79,110 @@ class AttachmentBrowserDialog(QDialog):
 
         self.load_folders()
 
-    def load_folders(self):
+    def load_folders(self, force: bool = False):
         self.folder_list.clear()
-        self.file_list.clear()
-        folders = self.service.get_storage_folders()
+        self.show_folder(None)
+        folders = self.service.get_storage_folders(force=force)
         for f in folders:
             item = QListWidgetItem(f"📁 {f}")
             item.setData(Qt.ItemDataRole.UserRole, f)
             self.folder_list.addItem(item)
 
     def on_folder_clicked(self, item):
-        folder_name = item.data(Qt.ItemDataRole.UserRole)
-        self.file_list.clear()
-        self.info_lbl.setText(f"Ładowanie: {folder_name}...")
-        
-        files = self.service.get_files_in_folder(folder_name)
-        
-        if not files:
-            self.info_lbl.setText(f"Folder '{folder_name}' jest pusty.")
+        self.show_folder(item.data(Qt.ItemDataRole.UserRole))
+
+    def show_folder(self, folder_name, search=None):
+        self.current_folder = folder_name
+        self._status_note = None
+        self.cancel_thumbnails()
+        self.file_model.reset(folder_name, search)
+        self.update_info()
+
+    def apply_search(self):
+        if self.current_folder:
+            self.show_folder(self.current_folder, self.search_input.text().strip())
+
+    def update_info(self, loading=None):
+        if not self.current_folder:
+            self.info_lbl.setText("")
             return
+        loading = self.file_model.is_loading() if loading is None else loading
+        count = self.file_model.file_count()
+        if loading:
+            self.info_lbl.setText(f"Ładowanie: {self.current_folder}... ({count})")
+        elif count == 0:
+            self.info_lbl.setText(f"Folder '{self.current_folder}' jest pusty." if not self.file_model.search else "Brak wyników.")
+        else:
+            more = "+ (przewiń, aby wczytać więcej)" if self.file_model.has_more() else ""
+            self.info_lbl.setText(f"Pliki: {count}{more}")
+        if self._status_note and not loading:
+            self.info_lbl.setText(f"{self.info_lbl.text()} | {self._status_note}")
 
-        self.info_lbl.setText(f"Pliki: {len(files)}")
-        
-        for f in files:
-            name = f.get('name', '???')
-            size_kb = f.get('metadata', {}).get('size', 0) / 1024
-            full_path = f.get('full_path')
-            
-            display_text = f"📄 {name} ({size_kb:.1f} KB)"
-            item = QListWidgetItem(display_text)
-            item.setData(Qt.ItemDataRole.UserRole, full_path)
-            self.file_list.addItem(item)
-
-    def on_file_double_clicked(self, item):
-        full_path = item.data(Qt.ItemDataRole.UserRole)
-        content = self.service.download_attachment_content(full_path)
-        if not content:
+    def on_page_loaded(self, paths):
+        self._thumbnail_handles.append(TaskScheduler.get().submit(
+            f"attachment_thumbnails:{self.current_folder}:{paths[0]}", "iter_attachment_thumbnails", paths, THUMB_EDGE,
+            priority=TaskPriority.PREFETCH,
+            progress=lambda chunk: self.file_model.set_thumbnail(chunk["path"], chunk["image"])
+        ))
+
+    def cancel_thumbnails(self):
+        for handle in self._thumbnail_handles:
+            handle.cancel()
+        self._thumbnail_handles = []
+
+    def handle_upload_files(self):
+        if not self.current_folder:
+            QMessageBox.warning(self, "Błąd", "Wybierz folder docelowy.")
             return
-            
+        paths, _ = QFileDialog.getOpenFileNames(self, "Wybierz pliki", "", "Pliki (*.pdf *.jpg *.jpeg *.png)")
+        if not paths:
+            return
+
+        self.upload_btn.setDisabled(True)
+        self._upload_folder = self.current_folder
+        self._upload_stats = {"uploaded": 0, "skipped": 0, "failed": 0}
+        self.info_lbl.setText(f"Wysyłanie 0/{len(paths)}...")
+        TaskScheduler.get().submit(
+            "upload_attachments", "iter_upload_attachments", paths, self._upload_folder,
+            priority=TaskPriority.USER_EDIT,
+            progress=self.on_upload_progress, finished=self.on_upload_finished, error=self.on_upload_error
+        )
+
+    def on_upload_progress(self, chunk):
+        result = chunk["result"]
+        key = "failed" if not result.ok else "uploaded" if result.uploaded else "skipped"
+        self._upload_stats[key] += 1
+        self.info_lbl.setText(f"Wysyłanie {chunk['done']}/{chunk['total']}...")
+
+    def on_upload_finished(self, _=None):
+        self.upload_btn.setDisabled(False)
+        stats = self._upload_stats
+        summary = f"Wysłano: {stats['uploaded']}, duplikaty pominięte: {stats['skipped']}, błędy: {stats['failed']}"
+        if self.current_folder == self._upload_folder:
+            self.show_folder(self.current_folder, self.file_model.search)
+        self._status_note = summary
+        self.update_info()
+
+    def on_upload_error(self, error_msg):
+        self.upload_btn.setDisabled(False)
+        QMessageBox.critical(self, "Błąd", f"Nie udało się wysłać plików: {error_msg}")
+
+    def on_file_double_clicked(self, index):
+        full_path = index.data(Qt.ItemDataRole.UserRole)
         ext = full_path.split('.')[-1].lower()
-        if ext in ['jpg', 'jpeg', 'png', 'bmp', 'gif']:
-            preview = ImagePreviewDialog(content, self)
+        if ext in ['jpg', 'jpeg', 'png', 'bmp', 'gif', 'webp']:
+            preview = ImagePreviewDialog(parent=self, storage_path=full_path, placeholder=self.file_model.thumbnail(full_path))
             preview.exec()
         else:
+            local_path = self.service.get_attachment_open_path(full_path)
+            if not local_path:
+                return
             try:
-                with tempfile.NamedTemporaryFile(delete=False, suffix=f".{ext}") as tmp:
-                    tmp.write(content)
-                    tmp_path = tmp.name
-                
                 if platform.system() == 'Darwin':
-                    subprocess.call(('open', tmp_path))
+                    subprocess.call(('open', local_path))
                 elif platform.system() == 'Windows':
-                    os.startfile(tmp_path)
+                    os.startfile(local_path)
                 else:
-                    subprocess.call(('xdg-open', tmp_path))
+                    subprocess.call(('xdg-open', local_path))
             except Exception:
                 pass
\ No newline at end of file
@@ -2,10 +2,14 @@ from PyQt6.QtWidgets import (
     QDialog, QVBoxLayout, QScrollArea, QLabel, QPushButton
 )
 from PyQt6.QtCore import Qt
-from PyQt6.QtGui import QImage, QPixmap
+from PyQt6.QtGui import QPixmap
+from core.workers import TaskScheduler, TaskPriority
+from services.thumbnail_service import ThumbnailService
 
 class ImagePreviewDialog(QDialog):
-    def __init__(self, image_data, parent=None):
+    MAX_EDGE = 1200
+
+    def __init__(self, image_data=None, parent=None, storage_path=None, placeholder=None):
         super().__init__(parent)
         self.setWindowTitle("Podgląd Załącznika")
         self.resize(800, 600)
@@ -15,25 +19,45 @@ class ImagePreviewDialog(QDialog):
         scroll = QScrollArea()
         scroll.setWidgetResizable(True)
         scroll.setStyleSheet("border: none;")
-        
+
         self.label = QLabel()
         self.label.setAlignment(Qt.AlignmentFlag.AlignCenter)
-        
-        image = QImage()
-        image.loadFromData(image_data)
-        pixmap = QPixmap.fromImage(image)
-        
-        if pixmap.width() > 1200 or pixmap.height() > 1200:
-            pixmap = pixmap.scaled(1200, 1200, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.SmoothTransformation)
-            
-        self.label.setPixmap(pixmap)
+        self.label.setStyleSheet("color: #888;")
         scroll.setWidget(self.label)
         layout.addWidget(scroll)
-        
+
         btn_close = QPushButton("Zamknij")
         btn_close.clicked.connect(self.close)
         btn_close.setStyleSheet("""
             QPushButton { background-color: #333; color: white; border: 1px solid #555; padding: 8px; border-radius: 6px; }
             QPushButton:hover { background-color: #444; }
         """)
-        layout.addWidget(btn_close)
\ No newline at end of file
+        layout.addWidget(btn_close)
+
+        self._handle = None
+        if storage_path:
+            # Blurry thumbnail first, full decode off the GUI thread replaces it.
+            if placeholder is not None and not placeholder.isNull():
+                self.label.setPixmap(QPixmap.fromImage(placeholder).scaled(
+                    600, 600, Qt.AspectRatioMode.KeepAspectRatio, Qt.TransformationMode.FastTransformation
+                ))
+            else:
+                self.label.setText("Ładowanie podglądu...")
+            self._handle = TaskScheduler.get().submit(
+                f"preview:{storage_path}", "load_attachment_preview", storage_path, self.MAX_EDGE,
+                priority=TaskPriority.USER_EDIT,
+                finished=self.on_image_loaded, error=self.on_image_error
+            )
+            self.finished.connect(lambda _: self._handle.cancel())
+        elif image_data is not None:
+            self.on_image_loaded(ThumbnailService.decode_scaled(image_data, self.MAX_EDGE))
+
+    def on_image_loaded(self, image):
+        if image is None or image.isNull():
+            self.on_image_error("Nie udało się wczytać obrazu.")
+            return
+        self.label.setPixmap(QPixmap.fromImage(image))
+
+    def on_image_error(self, error_msg):
+        self.label.setPixmap(QPixmap())
+        self.label.setText(f"Błąd podglądu: {error_msg}")
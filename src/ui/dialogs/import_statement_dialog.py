@@ -0,0 +1,187 @@
+import os
+from PyQt6.QtWidgets import (
+    QDialog, QVBoxLayout, QGridLayout, QLabel, QComboBox, QLineEdit,
+    QHBoxLayout, QPushButton, QFileDialog, QProgressBar, QMessageBox
+)
+from core.workers import TaskScheduler, TaskPriority
+from services.import_service import ImportOptions
+from services.statement_parsers import load_column_maps, detect_format
+
+FORMATS = [("Wykryj automatycznie", None), ("CSV", "csv"), ("MT940", "mt940"), ("camt.053 (XML)", "camt053")]
+
+class ImportStatementDialog(QDialog):
+    def __init__(self, service, parent=None):
+        super().__init__(parent)
+        self.service = service
+        self.column_maps = load_column_maps()
+        self.imported = 0
+        self.setWindowTitle("Import Wyciągu Bankowego")
+        self.resize(700, 320)
+        self.setStyleSheet("""
+            QDialog { background-color: #252526; color: white; }
+            QLabel { color: #aaa; font-weight: 600; font-size: 11px; }
+            QComboBox, QLineEdit {
+                background-color: #1e1e1e; border: 1px solid #444; border-radius: 6px;
+                padding: 5px; color: white; min-height: 25px;
+            }
+            QComboBox:focus, QLineEdit:focus { border: 1px solid #825fa2; }
+            QPushButton {
+                background-color: #825fa2; color: white; border-radius: 6px; padding: 8px 16px; font-weight: bold;
+            }
+            QPushButton:hover { background-color: #9a72bd; }
+            QPushButton:disabled { background-color: #444; color: #888; }
+            QPushButton#CancelBtn { background-color: #333; border: 1px solid #444; color: #ddd; }
+            QPushButton#CancelBtn:hover { background-color: #444; }
+            QProgressBar { background-color: #1e1e1e; border: 1px solid #444; border-radius: 6px; color: white; text-align: center; }
+            QProgressBar::chunk { background-color: #825fa2; border-radius: 6px; }
+        """)
+
+        layout = QVBoxLayout(self)
+        form_layout = QGridLayout()
+        form_layout.setSpacing(15)
+
+        self.f_path = QLineEdit()
+        self.f_path.setReadOnly(True)
+        self.f_path.setPlaceholderText("Wybierz plik wyciągu (CSV, MT940, camt.053)...")
+        browse_btn = QPushButton("Wybierz plik")
+        browse_btn.clicked.connect(self.handle_browse)
+
+        self.f_format = QComboBox()
+        for label, fmt in FORMATS:
+            self.f_format.addItem(label, fmt)
+        self.f_format.currentIndexChanged.connect(self.update_mapping_state)
+
+        self.f_mapping = QComboBox()
+        self.f_mapping.addItems(list(self.column_maps))
+
+        self.f_wallet = QComboBox()
+        for wal in self.service.get_wallets_for_combo():
+            self.f_wallet.addItem(wal.wallet_name, wal.id)
+
+        self.f_expense_cat = QComboBox()
+        self.f_income_cat = QComboBox()
+        for cat in self.service.get_categories_for_combo():
+            if cat.type == "EXPENSE":
+                self.f_expense_cat.addItem(cat.display_name, cat.subcategory_id)
+            elif cat.type == "INCOME":
+                self.f_income_cat.addItem(cat.display_name, cat.subcategory_id)
+
+        self.f_tag = QComboBox()
+        self.f_tag.setEditable(True)
+        self.f_tag.addItem("")
+        self.f_tag.addItems(self.service.get_cached_tags())
+
+        self.f_status = QComboBox()
+        self.f_status.addItems(["COMPLETED", "PENDING"])
+
+        form_layout.addWidget(QLabel("PLIK"), 0, 0)
+        path_row = QHBoxLayout()
+        path_row.addWidget(self.f_path)
+        path_row.addWidget(browse_btn)
+        form_layout.addLayout(path_row, 1, 0, 1, 3)
+
+        form_layout.addWidget(QLabel("FORMAT"), 2, 0)
+        form_layout.addWidget(self.f_format, 3, 0)
+        form_layout.addWidget(QLabel("MAPOWANIE KOLUMN (CSV)"), 2, 1)
+        form_layout.addWidget(self.f_mapping, 3, 1)
+        form_layout.addWidget(QLabel("PORTFEL"), 2, 2)
+        form_layout.addWidget(self.f_wallet, 3, 2)
+
+        form_layout.addWidget(QLabel("KATEGORIA WYDATKÓW"), 4, 0)
+        form_layout.addWidget(self.f_expense_cat, 5, 0)
+        form_layout.addWidget(QLabel("KATEGORIA WPŁYWÓW"), 4, 1)
+        form_layout.addWidget(self.f_income_cat, 5, 1)
+        form_layout.addWidget(QLabel("TAG / STATUS"), 4, 2)
+        tag_row = QHBoxLayout()
+        tag_row.addWidget(self.f_tag, 2)
+        tag_row.addWidget(self.f_status, 1)
+        form_layout.addLayout(tag_row, 5, 2)
+        layout.addLayout(form_layout)
+
+        self.progress = QProgressBar()
+        self.progress.setRange(0, 1)
+        self.progress.setValue(0)
+        self.progress.setFormat("")
+        layout.addWidget(self.progress)
+        self.status_lbl = QLabel("")
+        layout.addWidget(self.status_lbl)
+
+        btn_layout = QHBoxLayout()
+        self.cancel_btn = QPushButton("Anuluj")
+        self.cancel_btn.setObjectName("CancelBtn")
+        self.cancel_btn.clicked.connect(self.reject)
+        self.import_btn = QPushButton("Importuj")
+        self.import_btn.clicked.connect(self.handle_import)
+        btn_layout.addStretch()
+        btn_layout.addWidget(self.cancel_btn)
+        btn_layout.addWidget(self.import_btn)
+        layout.addLayout(btn_layout)
+
+        self.finished.connect(lambda _: TaskScheduler.get().cancel("import_statement"))
+        self.update_mapping_state()
+
+    def handle_browse(self):
+        path, _ = QFileDialog.getOpenFileName(
+            self, "Wybierz wyciąg", "", "Wyciągi (*.csv *.txt *.sta *.mt940 *.940 *.xml);;Wszystkie pliki (*)"
+        )
+        if path:
+            self.f_path.setText(path)
+            self.update_mapping_state()
+
+    def selected_format(self):
+        fmt = self.f_format.currentData()
+        path = self.f_path.text()
+        if fmt is None and path and os.path.exists(path):
+            fmt = detect_format(path)
+        return fmt
+
+    def update_mapping_state(self):
+        self.f_mapping.setEnabled(self.selected_format() in (None, "csv"))
+
+    def handle_import(self):
+        path = self.f_path.text()
+        if not path or not os.path.exists(path):
+            QMessageBox.warning(self, "Błąd", "Wybierz plik wyciągu.")
+            return
+        if self.f_wallet.currentData() is None or self.f_expense_cat.currentData() is None or self.f_income_cat.currentData() is None:
+            QMessageBox.warning(self, "Błąd", "Wybierz portfel oraz kategorie wydatków i wpływów.")
+            return
+
+        options = ImportOptions(
+            wallet_fk=str(self.f_wallet.currentData()),
+            expense_subcategory_fk=self.f_expense_cat.currentData(),
+            income_subcategory_fk=self.f_income_cat.currentData(),
+            fmt=self.selected_format(),
+            column_map=self.column_maps.get(self.f_mapping.currentText()),
+            status=self.f_status.currentText(),
+            tag=self.f_tag.currentText().strip() or None,
+        )
+        self.import_btn.setDisabled(True)
+        self.progress.setRange(0, 0)
+        self.status_lbl.setText("Importowanie...")
+        TaskScheduler.get().submit(
+            "import_statement", "iter_import_statement", path, options,
+            priority=TaskPriority.USER_EDIT,
+            progress=self.on_import_progress, finished=self.on_import_finished, error=self.on_import_error
+        )
+
+    def on_import_progress(self, progress):
+        self.imported = progress["imported"]
+        failed = f", błędy: {progress['failed']}" if progress["failed"] else ""
+        self.status_lbl.setText(
+            f"Zaimportowano: {progress['imported']}{failed} ({progress['method'].upper()}, {progress['elapsed']:.1f} s)"
+        )
+
+    def on_import_finished(self, _=None):
+        self.progress.setRange(0, 1)
+        self.progress.setValue(1)
+        self.import_btn.setDisabled(False)
+        QMessageBox.information(self, "Import", f"Zakończono import.\n{self.status_lbl.text() or 'Brak transakcji w pliku.'}")
+        if self.imported:
+            self.accept()
+
+    def on_import_error(self, error_msg):
+        self.progress.setRange(0, 1)
+        self.progress.setValue(0)
+        self.import_btn.setDisabled(False)
+        QMessageBox.critical(self, "Błąd", f"Import nie powiódł się:\n{error_msg}")
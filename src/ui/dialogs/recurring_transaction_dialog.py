@@ -137,8 +137,8 @@ class RecurringTransactionDialog(QDialog):
             self.f_wallet.addItem(wal.wallet_name, wal.id)
             self.f_to_wallet.addItem(wal.wallet_name, wal.id)
         
-        if hasattr(self.service, 'get_unique_tags'):
-            self.f_tag.addItems(self.service.get_unique_tags())
+        if hasattr(self.service, 'get_cached_tags'):
+            self.f_tag.addItems(self.service.get_cached_tags())
         self.f_tag.setCurrentIndex(-1)
 
     def on_type_changed(self, type_text):
@@ -1,16 +1,30 @@
 from PyQt6.QtWidgets import (
     QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget, 
     QTableWidgetItem, QHeaderView, QMessageBox, QFrame, QLabel, 
-    QGridLayout, QDoubleSpinBox, QLineEdit, QAbstractItemView
+    QGridLayout, QDoubleSpinBox, QLineEdit, QAbstractItemView, QProgressBar
 )
-from PyQt6.QtCore import Qt
+from datetime import date
+from PyQt6.QtCore import Qt, QTimer
 from PyQt6.QtGui import QColor, QFont
 from services.budget_service import BudgetService
+from core.events import EventBus
+from core.workers import TaskScheduler, TaskPriority
+
+COL_TAG, COL_TARGET, COL_SPENT, COL_REMAINING, COL_PROGRESS, COL_ACTIONS = range(6)
 
 class BudgetGoalsTab(QWidget):
     def __init__(self):
         super().__init__()
         self.service = BudgetService()
+        self.scheduler = TaskScheduler.get()
+        self._rows_by_tag = {}
+        self._pending_tags = set()
+        self._month = None
+        self.tags_timer = QTimer(self)
+        self.tags_timer.setSingleShot(True)
+        self.tags_timer.setInterval(400)
+        self.tags_timer.timeout.connect(self.refresh_changed_tags)
+        EventBus.get().goalTagsChanged.connect(self.on_goal_tags_changed)
         self.init_ui()
         self.refresh_data()
 
@@ -69,12 +83,12 @@ class BudgetGoalsTab(QWidget):
         self.main_layout.addWidget(self.form_frame)
 
         self.table = QTableWidget()
-        self.table.setColumnCount(3)
-        self.table.setHorizontalHeaderLabels(["Tag", "Miesięczny Cel", "Akcje"])
-        self.table.horizontalHeader().setSectionResizeMode(0, QHeaderView.ResizeMode.Stretch)
-        self.table.horizontalHeader().setSectionResizeMode(1, QHeaderView.ResizeMode.Stretch)
-        self.table.horizontalHeader().setSectionResizeMode(2, QHeaderView.ResizeMode.Fixed)
-        self.table.setColumnWidth(2, 100)
+        self.table.setColumnCount(6)
+        self.table.setHorizontalHeaderLabels(["Tag", "Miesięczny Cel", "Wydano", "Pozostało", "Postęp", "Akcje"])
+        for col in (COL_TAG, COL_TARGET, COL_SPENT, COL_REMAINING, COL_PROGRESS):
+            self.table.horizontalHeader().setSectionResizeMode(col, QHeaderView.ResizeMode.Stretch)
+        self.table.horizontalHeader().setSectionResizeMode(COL_ACTIONS, QHeaderView.ResizeMode.Fixed)
+        self.table.setColumnWidth(COL_ACTIONS, 100)
         
         self.table.setStyleSheet("""
             QTableWidget {
@@ -91,12 +105,25 @@ class BudgetGoalsTab(QWidget):
 
         self.main_layout.addWidget(self.table)
 
+    def showEvent(self, event):
+        super().showEvent(event)
+        if self._month is not None and self._month != date.today().replace(day=1):
+            self.refresh_data()
+
     def refresh_data(self):
+        self._pending_tags.clear()
+        self.scheduler.submit(
+            "goal_progress", "get_budget_goal_progress",
+            priority=TaskPriority.REFRESH, supersede=True,
+            finished=self.on_progress_loaded
+        )
+
+    def on_progress_loaded(self, progress):
+        self._month = date.today().replace(day=1)
         self.table.setRowCount(0)
-        goals = self.service.get_budget_goals()
-        
-        self.table.setRowCount(len(goals))
-        for row, goal in enumerate(goals):
+        self._rows_by_tag = {}
+        self.table.setRowCount(len(progress))
+        for row, goal in enumerate(progress):
             tag_item = QTableWidgetItem(goal.tag)
             tag_item.setForeground(QColor("#e0e0e0"))
             tag_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
@@ -118,13 +145,67 @@ class BudgetGoalsTab(QWidget):
                 QPushButton { background-color: #331d2c; color: #ff8a80; border: 1px solid #4d2a2a; border-radius: 4px; font-size: 10px; font-weight: bold; }
                 QPushButton:hover { background-color: #e74c3c; color: white; }
             """)
-            del_btn.clicked.connect(lambda _, g_id=goal.id: self.handle_delete_goal(g_id))
+            del_btn.clicked.connect(lambda _, g_id=goal.goal_id: self.handle_delete_goal(g_id))
             
             btn_layout.addWidget(del_btn)
 
-            self.table.setItem(row, 0, tag_item)
-            self.table.setItem(row, 1, amount_item)
-            self.table.setCellWidget(row, 2, btn_widget)
+            self.table.setItem(row, COL_TAG, tag_item)
+            self.table.setItem(row, COL_TARGET, amount_item)
+            self.table.setCellWidget(row, COL_ACTIONS, btn_widget)
+            self._rows_by_tag[goal.tag] = row
+            self.set_progress_row(row, goal)
+
+    def set_progress_row(self, row, goal):
+        over = goal.remaining < 0
+        spent_item = QTableWidgetItem(f"{goal.spent:,.2f} PLN")
+        spent_item.setForeground(QColor("#e0e0e0"))
+        spent_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+        spent_item.setToolTip(f"Transakcje w tym miesiącu: {goal.tx_count}")
+
+        remaining_item = QTableWidgetItem(f"{goal.remaining:,.2f} PLN")
+        remaining_item.setForeground(QColor("#ff8a80" if over else "#81c784"))
+        remaining_item.setTextAlignment(Qt.AlignmentFlag.AlignCenter)
+
+        pct = goal.progress_pct
+        bar = self.table.cellWidget(row, COL_PROGRESS)
+        if not isinstance(bar, QProgressBar):
+            bar = QProgressBar()
+            bar.setRange(0, 100)
+            bar.setTextVisible(True)
+            self.table.setCellWidget(row, COL_PROGRESS, bar)
+        bar.setValue(int(min(pct or 0, 100)))
+        bar.setFormat("-" if pct is None else f"{pct:.0f}%")
+        color = "#e74c3c" if over else "#f0ad4e" if (pct or 0) >= 80 else "#81c784"
+        bar.setStyleSheet(f"""
+            QProgressBar {{ background-color: #252526; border: 1px solid #333; border-radius: 4px; color: white; text-align: center; }}
+            QProgressBar::chunk {{ background-color: {color}; border-radius: 4px; }}
+        """)
+
+        self.table.setItem(row, COL_SPENT, spent_item)
+        self.table.setItem(row, COL_REMAINING, remaining_item)
+
+    def on_goal_tags_changed(self, tags):
+        watched = [t for t in tags if t in self._rows_by_tag]
+        if watched:
+            self._pending_tags.update(watched)
+            self.tags_timer.start()
+
+    def refresh_changed_tags(self):
+        if not self._pending_tags:
+            return
+        tags = sorted(self._pending_tags)
+        self._pending_tags.clear()
+        self.scheduler.submit(
+            f"goal_progress:{','.join(tags)}", "get_budget_goal_progress", tags,
+            priority=TaskPriority.REFRESH,
+            finished=self.on_tags_progress_loaded
+        )
+
+    def on_tags_progress_loaded(self, progress):
+        for goal in progress:
+            row = self._rows_by_tag.get(goal.tag)
+            if row is not None:
+                self.set_progress_row(row, goal)
 
     def handle_upsert_goal(self):
         tag = self.tag_input.text().strip()
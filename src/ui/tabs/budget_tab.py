@@ -1,26 +1,25 @@
 import os
 import platform
 import subprocess
-import tempfile
 import traceback
-from datetime import datetime, timedelta
 
 from PyQt6.QtWidgets import (
-    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableWidget, 
-    QTableWidgetItem, QHeaderView, QMessageBox, QFrame, QLabel, 
+    QWidget, QVBoxLayout, QHBoxLayout, QPushButton, QTableView, 
+    QHeaderView, QMessageBox, QFrame, QLabel, 
     QGridLayout, QDoubleSpinBox, QLineEdit, QFileDialog, QMenu,
-    QInputDialog, QDialog, QDateEdit, QComboBox, QDialogButtonBox, QFormLayout
+    QInputDialog, QDialog, QDateEdit, QComboBox, QDialogButtonBox, QFormLayout, QProgressDialog
 )
-from PyQt6.QtCore import Qt, QDate, QThread
-from PyQt6.QtGui import QColor, QFont
+from PyQt6.QtCore import Qt, QDate, QTimer
 
 from services.budget_service import BudgetService
 from models.transaction import TransactionType, TransactionStatus, TransactionSentiment
-from core.config import BASE_DIR
+from core.config import BASE_DIR, Config
 
-from core.workers import DataLoaderWorker
+from core.workers import TaskScheduler, TaskPriority
 from ui.delegates.highlight_delegate import HighlightDelegate
-from models.budget_types import BudgetColumn, BudgetTableWidgetItem
+from models.budget_types import BudgetColumn
+from models.budget_table_model import BudgetTableModel, BudgetFilterProxyModel
+from models.transaction_frame import TransactionFrame
 
 from ui.delegates.budget_delegates import (
     StatusBadgeDelegate, BooleanIconDelegate, AmountDelegate, 
@@ -44,6 +43,7 @@ class BudgetTab(QWidget):
     def __init__(self):
         super().__init__()
         self.service = BudgetService()
+        self.scheduler = TaskScheduler.get()
         self.current_attachment = None
         self.current_attachment_folder = "transactions"
         
@@ -51,12 +51,21 @@ class BudgetTab(QWidget):
         
         self.init_ui()
 
+        self.sync_timer = QTimer(self)
+        self.sync_timer.setInterval(Config.SYNC_INTERVAL_SEC * 1000)
+        self.sync_timer.timeout.connect(self.handle_background_sync)
+        self.sync_timer.start()
+
     def showEvent(self, event):
         super().showEvent(event)
-        self.handle_full_refresh()
+        self.handle_full_refresh(coalesce=True)
 
     def init_ui(self):
-        self.all_transactions = []
+        self.all_transactions = TransactionFrame()
+        self._reset_on_next_page = False
+        self._is_offline = False
+        self.active_column_filters = {}
+        self.export_column_filters = {}
         
         self.main_layout = QVBoxLayout(self)
         self.main_layout.setSpacing(20)
@@ -79,6 +88,16 @@ class BudgetTab(QWidget):
         self.files_btn.setFixedSize(46, 36)
         self.files_btn.clicked.connect(self.open_attachment_browser)
         self.toolbar.addWidget(self.files_btn)
+        self.import_btn = QPushButton("📥")
+        self.import_btn.setFixedSize(46, 36)
+        self.import_btn.setToolTip("Importuj wyciąg bankowy (CSV, MT940, camt.053)")
+        self.import_btn.clicked.connect(self.open_import_statement)
+        self.toolbar.addWidget(self.import_btn)
+        self.export_btn = QPushButton("📤")
+        self.export_btn.setFixedSize(46, 36)
+        self.export_btn.setToolTip("Eksportuj transakcje (filtry daty, portfela i autora)")
+        self.export_btn.clicked.connect(self.open_export_transactions)
+        self.toolbar.addWidget(self.export_btn)
         
         self.hide_pending_btn = QPushButton("⏳")
         self.hide_pending_btn.setCheckable(True)
@@ -148,16 +167,14 @@ class BudgetTab(QWidget):
         self.user_filter_combo.currentIndexChanged.connect(self.on_filter_changed)
         
         self.gen_recurring_btn.clicked.connect(self.handle_generate_recurring)
-        self.refresh_btn.clicked.connect(self.handle_full_refresh)
+        self.refresh_btn.clicked.connect(lambda: self.handle_full_refresh(coalesce=True))
 
     def _setup_table(self):
-        self.table = QTableWidget()
-        self.headers = [
-            "  Typ", "  Status", "  Data", "  Wartość", "  Autor", "  Kategoria", "  Podkategoria", 
-            "  Z Portfela", "  Do Portfela", "  Sentyment", "  Tag", "  Opis", "  Wliczony", "  Plik"
-        ]
-        self.table.setColumnCount(len(self.headers))
-        self.table.setHorizontalHeaderLabels(self.headers)
+        self.table = QTableView()
+        self.model = BudgetTableModel(self)
+        self.proxy = BudgetFilterProxyModel(self)
+        self.proxy.setSourceModel(self.model)
+        self.table.setModel(self.proxy)
         self.table.setStyleSheet(TABLE_STYLE)
 
         h = self.table.horizontalHeader()
@@ -179,17 +196,18 @@ class BudgetTab(QWidget):
         self.table.verticalHeader().setDefaultSectionSize(36)
         self.table.setShowGrid(False)
         self.table.setAlternatingRowColors(True)
-        self.table.setSelectionBehavior(QTableWidget.SelectionBehavior.SelectRows)
-        self.table.setSelectionMode(QTableWidget.SelectionMode.ExtendedSelection)
+        self.table.setSelectionBehavior(QTableView.SelectionBehavior.SelectRows)
+        self.table.setSelectionMode(QTableView.SelectionMode.ExtendedSelection)
         self.table.setContextMenuPolicy(Qt.ContextMenuPolicy.CustomContextMenu)
         
+        h.setSortIndicator(-1, Qt.SortOrder.AscendingOrder)
         self.table.setSortingEnabled(True)
         self.setup_delegates()
         
         self.main_layout.addWidget(self.table)
 
         self.table.customContextMenuRequested.connect(self.show_context_menu)
-        self.table.itemChanged.connect(self.on_item_changed)
+        self.model.cellEdited.connect(self.on_cell_edited)
 
     def _setup_entry_form(self):
         self.entry_frame = QFrame()
@@ -317,7 +335,7 @@ class BudgetTab(QWidget):
     def filter_table(self):
         query = self.search_input.text().lower()
         
-        for col in range(self.table.columnCount()):
+        for col in range(self.model.columnCount()):
             delegate = self.table.itemDelegateForColumn(col)
             if isinstance(delegate, HighlightDelegate):
                 delegate.setSearchQuery(query)
@@ -328,95 +346,12 @@ class BudgetTab(QWidget):
         selected_user_data = self.user_filter_combo.currentData()
         selected_user_id = str(selected_user_data) if selected_user_data is not None else None
 
-        filtered_data = []
-        total_income = 0.0
-        total_expense = 0.0
-
-        for row in self.all_transactions:
-            if hide_pending and row.get('status') == "PENDING":
-                continue
-
-            if selected_user_id:
-                row_author_id = str(row.get('author_id', 'None'))
-                if row_author_id != selected_user_id:
-                    continue
-
-            if query:
-                search_target = (
-                    f"{row.get('description', '')} "
-                    f"{row.get('category', '')} "
-                    f"{row.get('subcategory', '')} "
-                    f"{row.get('tag', '')} "
-                    f"{str(row.get('amount', ''))} "
-                    f"{row.get('from_wallet', '')} "
-                    f"{row.get('to_wallet', '')} "
-                    f"{row.get('author', '')} "
-                    f"{row.get('sentiment', '')}"
-                ).lower()
-                
-                if query not in search_target:
-                    continue
-            
-            filtered_data.append(row)
-            
-            try:
-                amt = float(row.get('amount', 0))
-                t_type = row.get('type')
-                if t_type == "INCOME":
-                    total_income += amt
-                elif t_type == "EXPENSE":
-                    total_expense += amt
-            except ValueError:
-                pass
-
-        balance = total_income - total_expense
-        balance_str = f"{balance:,.2f}".replace(",", " ").replace(".", ",")
-        
-        if balance > 0:
-            color = "#81c784"
-            prefix = "+"
-        elif balance < 0:
-            color = "#e57373"
-            prefix = ""
-        else:
-            color = "#e0e0e0"
-            prefix = ""
-
-        self.summary_label.setText(f"Bilans: {prefix}{balance_str} PLN")
-        self.summary_label.setStyleSheet(SUMMARY_LABEL_TEMPLATE.format(color=color))
-
-        self.populate_table(filtered_data)
+        self.proxy.set_filters(query, hide_pending, selected_user_id)
+        self.recalculate_balance_from_ui()
         self._update_visuals()
 
     def recalculate_balance_from_ui(self):
-        total_income = 0.0
-        total_expense = 0.0
-
-        for row in range(self.table.rowCount()):
-            if self.table.isRowHidden(row):
-                continue
-            
-            type_item = self.table.item(row, BudgetColumn.TYPE)
-            t_type = type_item.text() if type_item else ""
-
-            amt_item = self.table.item(row, BudgetColumn.AMOUNT)
-            amt = 0.0
-            if amt_item:
-                try:
-                    val = amt_item.data(Qt.ItemDataRole.EditRole)
-                    if isinstance(val, (float, int)):
-                        amt = float(val)
-                    else:
-                        amt = float(amt_item.text().replace(' ', '').replace(',', '.'))
-                except (ValueError, TypeError):
-                    amt = 0.0
-            
-            if t_type == "INCOME":
-                total_income += amt
-            elif t_type == "EXPENSE":
-                total_expense += amt
-
-        balance = total_income - total_expense
+        balance = self.proxy.balance()
         balance_str = f"{balance:,.2f}".replace(",", " ").replace(".", ",")
         
         if balance > 0:
@@ -431,6 +366,18 @@ class BudgetTab(QWidget):
 
         self.summary_label.setText(f"Bilans: {prefix}{balance_str} PLN")
         self.summary_label.setStyleSheet(SUMMARY_LABEL_TEMPLATE.format(color=color))
+
+    def populate_table(self, data):
+        try:
+            self.model.set_rows(data)
+            if self.model.warn_old_date:
+                self.info_label.setText("⚠️ Uwaga: Zmodyfikowano dzisiaj wpisy starsze niż 30 dni.")
+            else:
+                self.info_label.setText("")
+        except Exception as e:
+            print(f"CRITICAL UI ERROR in populate_table: {e}")
+            traceback.print_exc()
+
     def handle_select_attachment(self):
         path, _ = QFileDialog.getOpenFileName(self, "Wybierz plik", "", "Pliki (*.pdf *.jpg *.jpeg *.png)")
         if not path:
@@ -540,33 +487,40 @@ class BudgetTab(QWidget):
         is_t = self.f_type.currentText() == "TRANSFER"; self.f_to_wallet.setEnabled(is_t)
         if not is_t: self.f_to_wallet.setCurrentIndex(-1)
 
-    def handle_full_refresh(self):
+    def handle_full_refresh(self, coalesce: bool = False):
+        # Button clicks and tab switches join a load already in flight; refreshes
+        # after a write supersede it, since it may have read pre-write data.
+        if coalesce and self.scheduler.running("full_refresh"):
+            return
         self.table.setDisabled(True)
         self.refresh_btn.setText("⏳ ...")
         self.refresh_btn.setDisabled(True)
+        self._is_offline = False
 
-        self.thread = QThread()
-        
         def refresh_task(local_service):
-            local_service.reload_cache()
-            return {
-                "transactions": local_service.get_ui_transactions(),
-                "snapshot": local_service.get_cache_snapshot()
-            }
-
-        self.worker = DataLoaderWorker(refresh_task)
-        self.worker.moveToThread(self.thread)
+            served_local = False
+            if not local_service.sync_service.is_loaded() and local_service.load_local_cache():
+                yield {"snapshot": local_service.get_cache_snapshot(refresh_users=False)}
+                for page in local_service.iter_local_ui_transaction_pages():
+                    served_local = True
+                    yield {"transactions": page}
 
-        self.thread.started.connect(self.worker.run)
-        self.worker.finished.connect(self.on_data_loaded)
-        
-        self.worker.finished.connect(self.thread.quit)
-        self.worker.finished.connect(self.worker.deleteLater)
-        self.thread.finished.connect(self.thread.deleteLater)
-        self.worker.error.connect(self.on_worker_error)
-        self.worker.error.connect(self.thread.quit)
+            try:
+                local_service.reload_cache()
+                yield {"snapshot": local_service.get_cache_snapshot()}
+                for page in local_service.iter_ui_transaction_pages():
+                    yield {"transactions": page}
+                yield {"tags": local_service.get_unique_tags()}
+            except Exception as e:
+                if not served_local:
+                    raise
+                yield {"offline": str(e)}
 
-        self.thread.start()
+        self.scheduler.submit(
+            "full_refresh", refresh_task,
+            priority=TaskPriority.REFRESH, supersede=True,
+            progress=self.on_data_chunk, finished=self.on_data_loaded, error=self.on_worker_error
+        )
 
     def on_worker_error(self, error_msg):
         self.table.setDisabled(False)
@@ -574,26 +528,77 @@ class BudgetTab(QWidget):
         self.refresh_btn.setDisabled(False)
         QMessageBox.critical(self, "Error", f"Failed to load data: {error_msg}")
 
-    def on_data_loaded(self, payload):
-        transactions = payload.get("transactions", [])
-        snapshot = payload.get("snapshot", {})
+    def on_data_chunk(self, chunk):
+        if "offline" in chunk:
+            print(f"UI Warning: Showing local replica, sync failed: {chunk['offline']}")
+            self._is_offline = True
+            return
 
-        self.service.hydrate_cache(snapshot)
-        
-        wallets_list = [w.wallet_name for w in self.service.get_wallets_for_combo()]
-        users_data = snapshot.get("users", {})
-        
-        self.setup_delegates(wallets=wallets_list, users=users_data)
+        if "tags" in chunk:
+            current = self.f_tag.currentText()
+            self.f_tag.clear()
+            self.f_tag.addItems(chunk["tags"])
+            self.f_tag.setCurrentIndex(-1)
+            self.f_tag.setEditText(current)
+            return
 
-        self.all_transactions = transactions
-        self.load_form_combos()
-        self.active_column_filters = {}
-        
+        if "snapshot" in chunk:
+            snapshot = chunk["snapshot"] or {}
+            self.service.hydrate_cache(snapshot)
+            
+            wallets_list = [w.wallet_name for w in self.service.get_wallets_for_combo()]
+            users_data = snapshot.get("users", {})
+            
+            self.setup_delegates(wallets=wallets_list, users=users_data)
+
+            self._reset_on_next_page = True
+            self.load_form_combos()
+            self.active_column_filters = {}
+            self.export_column_filters = {}
+            self.proxy.column_filters.clear()
+            return
+
+        page = chunk.get("transactions") or TransactionFrame()
+        is_first_page = self._reset_on_next_page
+        if is_first_page:
+            self.all_transactions = TransactionFrame()
+            self._reset_on_next_page = False
+        self.all_transactions.extend(page)
+
+        if is_first_page:
+            self.table.setDisabled(False)
+            self.populate_table(self.all_transactions)
+            self.filter_table()
+        self.info_label.setText(f"⏳ Wczytano {len(self.all_transactions)} transakcji...")
+
+    def on_data_loaded(self, payload=None):
         self.table.setDisabled(False)
         self.refresh_btn.setText("↻ Odśwież")
         self.refresh_btn.setDisabled(False)
 
+        if self._reset_on_next_page and not self._is_offline:
+            self.all_transactions = TransactionFrame()
+        self._reset_on_next_page = False
+        self.populate_table(self.all_transactions)
         self.filter_table()
+        if self._is_offline:
+            self.info_label.setText("⚠️ Tryb offline: dane z lokalnej kopii.")
+
+    def handle_background_sync(self):
+        if not self.refresh_btn.isEnabled():
+            return
+        self.scheduler.submit(
+            "background_sync", "sync_transactions",
+            priority=TaskPriority.PREFETCH,
+            finished=self.on_background_sync_done, error=self.on_background_sync_error
+        )
+
+    def on_background_sync_done(self, result):
+        if result is not None and result.has_changes:
+            self.handle_full_refresh()
+
+    def on_background_sync_error(self, error_msg):
+        print(f"UI Warning: Background sync failed: {error_msg}")
 
     def load_form_combos(self):
         self.f_date.setDate(QDate.currentDate())
@@ -605,9 +610,8 @@ class BudgetTab(QWidget):
             self.user_filter_combo.clear()
             self.user_filter_combo.addItem("Wszyscy", None)
             
-            if hasattr(self.service.user_service, 'load_users'):
-                self.service.user_service.load_users()
-            users_map = self.service.user_service.get_users()
+            # Combos are filled from caches only; the refresh task reloads them off the GUI thread.
+            users_map = self.service.user_service.get_cached_users()
             active_user_id = self.service.get_active_user_id()
             
             if not active_user_id and users_map:
@@ -657,9 +661,7 @@ class BudgetTab(QWidget):
             self.f_to_wallet.blockSignals(False)
 
             self.f_tag.clear()
-            if hasattr(self.service, 'get_unique_tags'):
-                tags = self.service.get_unique_tags()
-                self.f_tag.addItems(tags)
+            self.f_tag.addItems(self.service.get_cached_tags())
             self.f_tag.setCurrentIndex(-1)
 
             prefs = self.service.load_last_entry_prefs()
@@ -724,29 +726,7 @@ class BudgetTab(QWidget):
         else:
             self.search_input.setStyleSheet(SEARCH_INPUT_STYLE)
 
-        for col in range(self.table.columnCount()):
-            item = self.table.horizontalHeaderItem(col)
-            if not item:
-                item = QTableWidgetItem(self.headers[col])
-                self.table.setHorizontalHeaderItem(col, item)
-            
-            base_name = self.headers[col]
-            font = item.font()
-            
-            if col in self.active_column_filters:
-                filter_val = str(self.active_column_filters[col])
-                if len(filter_val) > 10:
-                    filter_val = filter_val[:8] + ".."
-                
-                item.setText(f"{base_name} [{filter_val}]")
-                font.setBold(True)
-                item.setFont(font)
-                item.setForeground(QColor("#81c784"))
-            else:
-                item.setText(base_name)
-                font.setBold(False)
-                item.setFont(font)
-                item.setForeground(QColor("#e0e0e0"))
+        self.model.set_header_filters(self.active_column_filters)
 
     def handle_add_row(self):
         active_user_id = self.service.get_active_user_id()
@@ -828,6 +808,7 @@ class BudgetTab(QWidget):
                  QMessageBox.warning(self, "Błąd", "Nie wybrano użytkownika (sesja wygasła?).")
                  return
 
+            rows = []
             for i in range(count):
                 next_date = start_date.addMonths(i)
                 desc = f"{base_desc} (miesiąc {i+1})" if base_desc else f"(miesiąc {i+1})"
@@ -847,159 +828,41 @@ class BudgetTab(QWidget):
                     "attachment_path": None,
                     "attachment_type": None
                 }
-                self.service.add_transaction(d)
-            
-            self.handle_full_refresh()
+                rows.append(d)
+
+            self.gen_recurring_btn.setDisabled(True)
+            self.scheduler.submit(
+                "generate_recurring", "add_transactions_bulk", rows,
+                priority=TaskPriority.USER_EDIT,
+                finished=lambda inserted: self.on_recurring_generated(inserted, count),
+                error=self.on_recurring_error
+            )
+
+    def on_recurring_generated(self, inserted, count):
+        self.gen_recurring_btn.setDisabled(False)
+        self.handle_full_refresh()
+        if inserted == count:
             QMessageBox.information(self, "Sukces", f"Wygenerowano {count} wpisów.")
+        else:
+            QMessageBox.critical(self, "Błąd Zapisu", f"Zapisano {inserted or 0} z {count} wpisów.\nSprawdź logi w terminalu.")
 
-    def populate_table(self, data):
-        self.table.setUpdatesEnabled(False)
-        self.table.setSortingEnabled(False)
-        self.table.blockSignals(True)
-
-        try:
-            data.sort(key=lambda x: x['date'], reverse=True)
-            data.sort(key=lambda x: 0 if x.get('status') == 'PENDING' else 1)
-            
-            self.table.setRowCount(len(data))
-            
-            now = datetime.now()
-            today_str = now.strftime("%Y-%m-%d")
-            one_month_ago = QDate.currentDate().addMonths(-1)
-            warn_old_date = False
-
-            font_bold = QFont("Segoe UI", 9, QFont.Weight.Bold)
-            color_high_amt = QColor("#e3c96d")
-            color_bg_high = QColor(255, 215, 0, 25)
-            color_success = QColor("#81c784")
-            color_default = QColor("#e0e0e0")
-            color_transparent = QColor(0, 0, 0, 0)
-
-            for row_idx, entry in enumerate(data):
-                is_modified_today = False
-                tooltip_msg = ""
-                ts_raw = entry.get("updated_at") or entry.get("created_at")
-                
-                if ts_raw:
-                    try:
-                        ts_str = str(ts_raw).replace('T', ' ')[:19]
-                        dt_obj = datetime.strptime(ts_str, "%Y-%m-%d %H:%M:%S")
-                        dt_pl = dt_obj + timedelta(hours=1)
-                        if dt_pl.strftime("%Y-%m-%d") == today_str:
-                            is_modified_today = True
-                            tooltip_msg = f"Edytowano: {dt_pl.strftime('%H:%M')}"
-                    except Exception: 
-                        pass
-
-                if entry["date"] == today_str and not is_modified_today:
-                    is_modified_today = True
-                    tooltip_msg = "Nowa transakcja"
-
-                try:
-                    entry_date_q = QDate.fromString(entry["date"], "yyyy-MM-dd")
-                    if is_modified_today and entry_date_q < one_month_ago:
-                        warn_old_date = True
-                except Exception: 
-                    pass
-
-                row_color_hex = entry.get("row_color", "#888888")
-
-                def create_item(display_val, sort_val=None, align=Qt.AlignmentFlag.AlignCenter, color=color_default, editable=True):
-                    item = BudgetTableWidgetItem(str(display_val))
-                    item.setData(Qt.ItemDataRole.UserRole, entry["id"])
-                    
-                    if sort_val is not None:
-                        item.setData(Qt.ItemDataRole.EditRole, sort_val)
-                    else:
-                        item.setData(Qt.ItemDataRole.EditRole, display_val)
-
-                    item.setTextAlignment(align)
-                    item.setForeground(color)
-                    item.setBackground(color_transparent)
-                    
-                    if not editable:
-                        item.setFlags(item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                        
-                    return item
-
-                self.table.setItem(row_idx, BudgetColumn.TYPE, create_item(entry["type"], editable=False))
-                self.table.setItem(row_idx, BudgetColumn.STATUS, create_item(entry["status"]))
-                
-                d_q = QDate.fromString(entry["date"], "yyyy-MM-dd")
-                d_item = create_item(entry["date"], sort_val=d_q)
-                if is_modified_today:
-                    d_item.setForeground(color_success)
-                    d_item.setFont(font_bold)
-                    if tooltip_msg: d_item.setToolTip(tooltip_msg)
-                self.table.setItem(row_idx, BudgetColumn.DATE, d_item)
-
-                try:
-                    amt = float(entry["amount"])
-                except ValueError:
-                    amt = 0.0
-                    
-                amt_str = f"{amt:.2f}"
-                amt_item = create_item(amt_str, sort_val=amt, align=Qt.AlignmentFlag.AlignRight | Qt.AlignmentFlag.AlignVCenter)
-                
-                if amt > 1000:
-                    amt_item.setForeground(color_high_amt)
-                    amt_item.setFont(font_bold)
-                    amt_item.setBackground(color_bg_high)
-                self.table.setItem(row_idx, BudgetColumn.AMOUNT, amt_item)
-
-                auth_color = QColor(entry.get("author_color", "#ffffff"))
-                auth_item = create_item(entry["author"], color=auth_color)
-                self.table.setItem(row_idx, BudgetColumn.AUTHOR, auth_item)
-
-                self.table.setItem(row_idx, BudgetColumn.CATEGORY, create_item(entry["category"]))
-                self.table.setItem(row_idx, BudgetColumn.SUBCATEGORY, create_item(entry["subcategory"], color=QColor(row_color_hex)))
-
-                self.table.setItem(row_idx, BudgetColumn.WALLET_FROM, create_item(entry["from_wallet"]))
-                self.table.setItem(row_idx, BudgetColumn.WALLET_TO, create_item(entry["to_wallet"]))
-                self.table.setItem(row_idx, BudgetColumn.SENTIMENT, create_item(entry["sentiment"]))
-                self.table.setItem(row_idx, BudgetColumn.TAG, create_item(entry["tag"]))
-                self.table.setItem(row_idx, BudgetColumn.DESCRIPTION, create_item(entry["description"], align=Qt.AlignmentFlag.AlignLeft | Qt.AlignmentFlag.AlignVCenter))
-                self.table.setItem(row_idx, BudgetColumn.IN_STATS, create_item(entry["in_stats"]))
-
-                has_att = bool(entry.get("attachment_path"))
-                att_item = create_item("📎" if has_att else "", editable=False)
-                att_item.setData(Qt.ItemDataRole.UserRole, entry.get("attachment_path"))
-                self.table.setItem(row_idx, BudgetColumn.ATTACHMENT, att_item)
-
-                if entry["type"] != "TRANSFER":
-                    to_wallet_item = self.table.item(row_idx, BudgetColumn.WALLET_TO)
-                    to_wallet_item.setFlags(to_wallet_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-                    if to_wallet_item.text() != "-": to_wallet_item.setText("-")
-
-            if warn_old_date:
-                self.info_label.setText("⚠️ Uwaga: Zmodyfikowano dzisiaj wpisy starsze niż 30 dni.")
-            else:
-                self.info_label.setText("")
-
-        except Exception as e:
-            print(f"CRITICAL UI ERROR in populate_table: {e}")
-            traceback.print_exc()
-        
-        finally:
-            self.table.setUpdatesEnabled(True)
-            self.table.setSortingEnabled(True)
-            self.table.blockSignals(False)
+    def on_recurring_error(self, error_msg):
+        self.gen_recurring_btn.setDisabled(False)
+        QMessageBox.critical(self, "Błąd", f"Nie udało się wygenerować wpisów: {error_msg}")
 
     def handle_reset_filters(self):
         self.search_input.clear()
         self.user_filter_combo.setCurrentIndex(0)
         self.active_column_filters.clear()
+        self.export_column_filters.clear()
+        self.proxy.column_filters.clear()
         
-        for col in range(self.table.columnCount()):
+        for col in range(self.model.columnCount()):
             delegate = self.table.itemDelegateForColumn(col)
             if isinstance(delegate, HighlightDelegate):
                 delegate.setSearchQuery("")
 
         self.table.viewport().update()
-        
-        for row in range(self.table.rowCount()):
-            self.table.setRowHidden(row, False)
-            
         self.filter_table()
 
     def handle_default_sort(self):
@@ -1038,13 +901,7 @@ class BudgetTab(QWidget):
             return None, None
 
     def _prompt_text_filter(self, col_idx):
-        unique_values = set()
-        for row in range(self.table.rowCount()):
-            if not self.table.isRowHidden(row):
-                item = self.table.item(row, col_idx)
-                if item: unique_values.add(item.text())
-        
-        values_list = sorted(list(unique_values))
+        values_list = self.proxy.visible_values(col_idx)
         item_text, ok = QInputDialog.getItem(self, "Filtruj kolumnę", "Wybierz:", ["(Pokaż wszystko)"] + values_list, 0, False)
         return item_text if ok else None
 
@@ -1088,24 +945,25 @@ class BudgetTab(QWidget):
         if action == clear_col_act:
             if logical_index in self.active_column_filters:
                 del self.active_column_filters[logical_index]
+            self.export_column_filters.pop(logical_index, None)
             
-            if not self.active_column_filters:
-                for row in range(self.table.rowCount()):
-                    self.table.setRowHidden(row, False)
-            
-            self.filter_table()
+            self.proxy.set_column_filter(logical_index, None)
+            self.recalculate_balance_from_ui()
             self._update_visuals()
             return
 
         if action == sort_asc_act:
-            self.table.sortItems(logical_index, Qt.SortOrder.AscendingOrder)
+            self.table.sortByColumn(logical_index, Qt.SortOrder.AscendingOrder)
             return
         if action == sort_desc_act:
-            self.table.sortItems(logical_index, Qt.SortOrder.DescendingOrder)
+            self.table.sortByColumn(logical_index, Qt.SortOrder.DescendingOrder)
             return
 
         self.table.setUpdatesEnabled(False)
         filter_label = None 
+        predicate = None
+        export_value = None
+        model = self.model
 
         try:
             if logical_index == BudgetColumn.DATE:
@@ -1128,39 +986,35 @@ class BudgetTab(QWidget):
                         filter_label = f"{start.toString('dd.MM')}-{end.toString('dd.MM')}"
 
                 if start and end:
-                    for row in range(self.table.rowCount()):
-                        if self.table.isRowHidden(row): continue
-                        item = self.table.item(row, logical_index)
-                        if item:
-                            val = item.data(Qt.ItemDataRole.EditRole)
-                            r_date = val if isinstance(val, QDate) else QDate.fromString(item.text(), "yyyy-MM-dd")
-                            if not (start <= r_date <= end): self.table.setRowHidden(row, True)
+                    start_str, end_str = start.toString("yyyy-MM-dd"), end.toString("yyyy-MM-dd")
+                    predicate = lambda i: start_str <= model.row_text(i, BudgetColumn.DATE) <= end_str
+                    export_value = (start_str, end_str)
 
             elif logical_index == BudgetColumn.AMOUNT and action == filter_act:
                 op, thr = self._prompt_amount_filter()
                 if op:
                     filter_label = f"{op}{thr}"
-                    for row in range(self.table.rowCount()):
-                        if self.table.isRowHidden(row): continue
-                        item = self.table.item(row, logical_index)
-                        if item:
-                            try:
-                                val = float(item.data(Qt.ItemDataRole.EditRole))
-                                match = (val > thr) if op == '>' else (val < thr) if op == '<' else (abs(val - thr) < 0.01)
-                                if not match: self.table.setRowHidden(row, True)
-                            except: self.table.setRowHidden(row, True)
+                    if op == '>':
+                        predicate = lambda i: model.row_amount(i) > thr
+                    elif op == '<':
+                        predicate = lambda i: model.row_amount(i) < thr
+                    else:
+                        predicate = lambda i: abs(model.row_amount(i) - thr) < 0.01
 
             elif action == filter_act:
                 txt = self._prompt_text_filter(logical_index)
                 if txt and txt != "(Pokaż wszystko)":
                     filter_label = txt
-                    for row in range(self.table.rowCount()):
-                        if self.table.isRowHidden(row): continue
-                        item = self.table.item(row, logical_index)
-                        if item and item.text() != txt: self.table.setRowHidden(row, True)
+                    predicate = lambda i: model.row_text(i, logical_index) == txt
+                    export_value = txt
 
             if filter_label:
                 self.active_column_filters[logical_index] = filter_label
+                self.proxy.set_column_filter(logical_index, predicate)
+                if export_value is not None:
+                    self.export_column_filters[logical_index] = export_value
+                else:
+                    self.export_column_filters.pop(logical_index, None)
 
             self.recalculate_balance_from_ui()
             self._update_visuals()
@@ -1168,26 +1022,9 @@ class BudgetTab(QWidget):
         finally:
             self.table.setUpdatesEnabled(True)
 
-    def _update_row_locks(self, row):
-        t_item = self.table.item(row, BudgetColumn.TYPE)
-        to_item = self.table.item(row, BudgetColumn.WALLET_TO)
-        if not t_item or not to_item: return
-        if t_item.text() == "TRANSFER": 
-            to_item.setFlags(to_item.flags() | Qt.ItemFlag.ItemIsEditable)
-        else: 
-            to_item.setFlags(to_item.flags() & ~Qt.ItemFlag.ItemIsEditable)
-            if to_item.text() != "-": to_item.setText("-")
-
-    def on_item_changed(self, item):
-        if not item:
-            return
-            
-        self.table.blockSignals(True)
+    def on_cell_edited(self, row, col, val):
         try:
-            tx_id = item.data(Qt.ItemDataRole.UserRole)
-            row = item.row()
-            col = item.column()
-            val = item.text()
+            tx_id = self.model.row_id_at(row)
             
             mapping = {
                 BudgetColumn.TYPE: "transaction_type", 
@@ -1203,80 +1040,95 @@ class BudgetTab(QWidget):
                 BudgetColumn.IN_STATS: "is_excluded_from_stats"
             }
             
-            success = False
+            # Values are resolved here from the tab's caches; the write itself runs on
+            # the scheduler, so a slow round-trip never blocks the grid.
+            write = None
+            on_saved = None
 
             if col == BudgetColumn.DATE:
                 q_date = QDate.fromString(val, "yyyy-MM-dd")
                 if q_date.isValid():
                     iso_date = q_date.toString(Qt.DateFormat.ISODate)
-                    success = self.service.update_transaction_field(tx_id, "transaction_date", iso_date)
-                else:
-                    success = False
+                    write = lambda s: s.update_transaction_field(tx_id, "transaction_date", iso_date)
 
             elif col == BudgetColumn.AMOUNT:
                 val = val.replace(',', '.')
                 try:
                     float(val)
-                    success = self.service.update_transaction_field(tx_id, "amount", val)
+                    write = lambda s: s.update_transaction_field(tx_id, "amount", val)
                 except ValueError:
-                    item.setText("0.00")
+                    self.model.set_cell(row, BudgetColumn.AMOUNT, "0.00")
             
             elif col == BudgetColumn.TYPE:
-                if self.service.update_transaction_field(tx_id, "transaction_type", val):
-                    success = True
-                    self.table.blockSignals(False)
-                    self.refresh_data() 
-                    return 
+                default_cat = next((c for c in self.service.get_categories_for_combo() if c.type == val), None)
+                if default_cat:
+                    self._save_cell(row, tx_id, col, lambda s: s.update_transaction_field(tx_id, "subcategory_fk", default_cat.subcategory_id),
+                                    refresh=True)
+                return
 
             elif col == BudgetColumn.CATEGORY:
-                sub = self.table.item(row, BudgetColumn.SUBCATEGORY)
-                if sub: sub.setText("Wybierz...")
-                success = True
+                self.model.set_cell(row, BudgetColumn.SUBCATEGORY, "Wybierz...")
+                self._on_cell_saved(row, tx_id, True)
+                return
                 
             elif col == BudgetColumn.SUBCATEGORY:
-                cat_item = self.table.item(row, BudgetColumn.CATEGORY)
-                if cat_item:
-                    cat = cat_item.text()
-                    match = next((c for c in self.service.get_categories_for_combo() if c.category == cat and c.subcategory == val), None)
-                    if match: 
-                        success = self.service.update_transaction_field(tx_id, "subcategory_fk", match.subcategory_id)
+                cat = self.model.row_text(row, BudgetColumn.CATEGORY)
+                match = next((c for c in self.service.get_categories_for_combo() if c.category == cat and c.subcategory == val), None)
+                if match: 
+                    write = lambda s: s.update_transaction_field(tx_id, "subcategory_fk", match.subcategory_id)
 
             elif col == BudgetColumn.AUTHOR:
                 users_map = self.service.user_service.get_users()
                 new_uid = next((uid for uid, name in users_map.items() if name == val), None)
                 if new_uid:
-                    success = self.service.update_transaction_field(tx_id, "created_by_fk", new_uid)
+                    write = lambda s: s.update_transaction_field(tx_id, "created_by_fk", new_uid)
+                    on_saved = lambda: self.model.set_row_value(row, "author_id", str(new_uid))
 
             elif col in mapping:
                 f = mapping[col]
                 if f == "is_excluded_from_stats": 
-                    success = self.service.update_transaction_field(tx_id, f, (val == "Nie"))
+                    excluded = (val == "Nie")
+                    write = lambda s: s.update_transaction_field(tx_id, f, excluded)
                 elif f in ["wallet_fk", "to_wallet_fk"]:
                     w_id = next((w.id for w in self.service.get_wallets_for_combo() if w.wallet_name == val), None)
-                    success = self.service.update_transaction_field(tx_id, f, str(w_id) if w_id else None)
+                    write = lambda s: s.update_transaction_field(tx_id, f, str(w_id) if w_id else None)
                 else: 
-                    success = self.service.update_transaction_field(tx_id, f, val)
+                    write = lambda s: s.update_transaction_field(tx_id, f, val)
             
-            if success:
-                if col == BudgetColumn.DATE:
-                    item.setData(Qt.ItemDataRole.EditRole, QDate.fromString(val, "yyyy-MM-dd"))
-                    
-                date_item = self.table.item(row, BudgetColumn.DATE)
-                if date_item:
-                    date_item.setForeground(QColor("#81c784"))
-                    date_item.setFont(QFont("Segoe UI", 9, QFont.Weight.Bold))
-                    
-                    current_date_val = QDate.fromString(date_item.text(), "yyyy-MM-dd")
-                    one_month_ago = QDate.currentDate().addMonths(-1)
-                    if current_date_val < one_month_ago:
-                        self.info_label.setText("⚠️ Uwaga: Zmodyfikowano dzisiaj wpisy starsze niż 30 dni.")
-
-            self._update_row_locks(row)
+            if write is not None:
+                self._save_cell(row, tx_id, col, write, on_saved=on_saved)
 
         except Exception:
             pass
-        finally:
-            self.table.blockSignals(False)
+
+    def _save_cell(self, row, tx_id, col, write, on_saved=None, refresh=False):
+        # One key per cell: a newer edit of the same cell supersedes the pending one and
+        # runs after it, so the last value typed is the one stored.
+        self.scheduler.submit(
+            f"cell_edit:{tx_id}:{col}", write,
+            priority=TaskPriority.USER_EDIT, supersede=True,
+            finished=lambda success: self._on_cell_saved(row, tx_id, success, on_saved, refresh),
+            error=lambda error_msg: self._on_cell_saved(row, tx_id, False)
+        )
+
+    def _on_cell_saved(self, row, tx_id, success, on_saved=None, refresh=False):
+        if not success:
+            self.info_label.setText("⚠️ Nie udało się zapisać zmiany - sprawdź logi w terminalu.")
+            return
+        if refresh:
+            self.refresh_data()
+            return
+        # A refresh may have replaced the rows while the write was in flight.
+        if row >= self.model.storage_size() or self.model.row_id_at(row) != tx_id:
+            return
+        if on_saved:
+            on_saved()
+        self.model.mark_edited(row)
+            
+        current_date_val = QDate.fromString(self.model.row_text(row, BudgetColumn.DATE), "yyyy-MM-dd")
+        one_month_ago = QDate.currentDate().addMonths(-1)
+        if current_date_val < one_month_ago:
+            self.info_label.setText("⚠️ Uwaga: Zmodyfikowano dzisiaj wpisy starsze niż 30 dni.")
 
     def refresh_data(self):
         self.handle_full_refresh()
@@ -1288,7 +1140,8 @@ class BudgetTab(QWidget):
         menu.setStyleSheet("QMenu { background-color: #252526; color: white; border: 1px solid #333; } QMenu::item:selected { background-color: #825fa2; }")
         
         row_idx = rows[0].row()
-        file_path_data = self.table.item(row_idx, BudgetColumn.ATTACHMENT).data(Qt.ItemDataRole.UserRole)
+        file_path_data = rows[0].siblingAtColumn(BudgetColumn.ATTACHMENT).data(Qt.ItemDataRole.UserRole)
+        ids = [r.data(Qt.ItemDataRole.UserRole) for r in rows]
         
         view_act = None
         remove_attachment_act = None
@@ -1310,64 +1163,82 @@ class BudgetTab(QWidget):
         act = menu.exec(self.table.mapToGlobal(pos))
         
         if act == view_act and view_act:
-            file_content = self.service.download_attachment_content(file_path_data)
-            if not file_content:
-                QMessageBox.warning(self, "Błąd", "Nie udało się pobrać pliku.")
-                return
-
             ext = file_path_data.split('.')[-1].lower()
             if ext in ['jpg', 'jpeg', 'png', 'bmp', 'gif']:
-                preview = ImagePreviewDialog(file_content, self)
+                preview = ImagePreviewDialog(parent=self, storage_path=file_path_data)
                 preview.exec()
             else:
+                local_path = self.service.get_attachment_open_path(file_path_data)
+                if not local_path:
+                    QMessageBox.warning(self, "Błąd", "Nie udało się pobrać pliku.")
+                    return
                 try:
-                    with tempfile.NamedTemporaryFile(delete=False, suffix=f".{ext}") as tmp:
-                        tmp.write(file_content)
-                        tmp_path = tmp.name
                     if platform.system() == 'Darwin':
-                        subprocess.call(('open', tmp_path))
+                        subprocess.call(('open', local_path))
                     elif platform.system() == 'Windows':
-                        os.startfile(tmp_path)
+                        os.startfile(local_path)
                     else:
-                        subprocess.call(('xdg-open', tmp_path))
+                        subprocess.call(('xdg-open', local_path))
                 except Exception as e:
                     QMessageBox.critical(self, "Błąd", f"Nie można otworzyć pliku:\n{e}")
 
         elif act == remove_attachment_act and remove_attachment_act:
-            tx_id = self.table.item(row_idx, BudgetColumn.TYPE).data(Qt.ItemDataRole.UserRole)
+            tx_id = ids[0]
             if QMessageBox.question(self, "Usuń załącznik", "Czy na pewno chcesz usunąć załącznik z tej transakcji?", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No) == QMessageBox.StandardButton.Yes:
-                self.service.update_transaction_multiple_fields(tx_id, {"attachment_path": None, "attachment_type": None})
-                self.handle_full_refresh()
+                self.scheduler.submit(
+                    f"remove_attachment:{tx_id}", "update_transaction_multiple_fields", tx_id, {"attachment_path": None, "attachment_type": None},
+                    priority=TaskPriority.USER_EDIT,
+                    finished=lambda _: self.handle_full_refresh(),
+                    error=lambda error_msg: QMessageBox.critical(self, "Błąd", f"Nie udało się usunąć załącznika: {error_msg}")
+                )
 
         elif act == add_act:
             self.handle_manual_attachment(row_idx)
             
-        elif act == include_stats_act:
-            for index in rows:
-                tx_id = self.table.item(index.row(), BudgetColumn.TYPE).data(Qt.ItemDataRole.UserRole)
-                self.service.update_transaction_field(tx_id, "is_excluded_from_stats", False)
-            self.handle_full_refresh()
-
-        elif act == exclude_stats_act:
-            for index in rows:
-                tx_id = self.table.item(index.row(), BudgetColumn.TYPE).data(Qt.ItemDataRole.UserRole)
-                self.service.update_transaction_field(tx_id, "is_excluded_from_stats", True)
-            self.handle_full_refresh()
+        elif act in (include_stats_act, exclude_stats_act):
+            self.scheduler.submit(
+                "update_stats_flag", "update_transactions_many", ids, {"is_excluded_from_stats": act == exclude_stats_act},
+                priority=TaskPriority.USER_EDIT, supersede=True,
+                finished=self.on_bulk_updated,
+                error=lambda error_msg: QMessageBox.critical(self, "Błąd", f"Nie udało się zaktualizować transakcji: {error_msg}")
+            )
 
         elif act == dup:
-            for index in rows:
-                tx_id = self.table.item(index.row(), BudgetColumn.TYPE).data(Qt.ItemDataRole.UserRole)
-                original = self.service.get_transaction_by_id(tx_id)
-                if original: self.service.add_transaction(original)
-            self.handle_full_refresh()
+            TaskScheduler.get().submit(
+                "duplicate_transactions", "duplicate_transactions", ids,
+                priority=TaskPriority.USER_EDIT,
+                finished=lambda inserted: self.on_duplicated(inserted, len(ids)),
+                error=lambda error_msg: QMessageBox.critical(self, "Błąd", f"Nie udało się zduplikować transakcji: {error_msg}")
+            )
         elif act == dele:
             if QMessageBox.question(self, "Usuń", f"Usunąć {len(rows)} transakcji?", QMessageBox.StandardButton.Yes | QMessageBox.StandardButton.No) == QMessageBox.StandardButton.Yes:
-                ids = [self.table.item(r.row(), BudgetColumn.TYPE).data(Qt.ItemDataRole.UserRole) for r in rows]
-                if self.service.delete_transactions(ids): 
-                    self.handle_full_refresh()
+                TaskScheduler.get().submit(
+                    "delete_transactions", "delete_transactions", ids,
+                    priority=TaskPriority.USER_EDIT,
+                    finished=lambda deleted: self.on_deleted(deleted, len(set(ids))),
+                    error=lambda error_msg: QMessageBox.critical(self, "Błąd Usuwania", f"Nie udało się usunąć transakcji: {error_msg}")
+                )
+
+    def on_deleted(self, deleted, count):
+        if deleted:
+            self.handle_full_refresh()
+        failed = count - (deleted or 0)
+        if failed:
+            QMessageBox.critical(self, "Błąd Usuwania", f"Nie udało się usunąć {failed} z {count} transakcji.\nSprawdź logi w terminalu.")
+
+    def on_bulk_updated(self, success):
+        self.handle_full_refresh()
+        if not success:
+            QMessageBox.critical(self, "Błąd Zapisu", "Nie udało się zaktualizować części transakcji.\nSprawdź logi w terminalu.")
+
+    def on_duplicated(self, inserted, count):
+        if inserted:
+            self.handle_full_refresh()
+        if inserted != count:
+            QMessageBox.critical(self, "Błąd Zapisu", f"Zduplikowano {inserted or 0} z {count} transakcji.\nSprawdź logi w terminalu.")
 
     def handle_manual_attachment(self, row):
-            tx_id = self.table.item(row, BudgetColumn.TYPE).data(Qt.ItemDataRole.UserRole)
+            tx_id = self.proxy.index(row, BudgetColumn.TYPE).data(Qt.ItemDataRole.UserRole)
             path, _ = QFileDialog.getOpenFileName(self, "Dodaj załącznik", "", "Pliki (*.pdf *.jpg *.jpeg *.png)")
             if path:
                 current_cloud_folders = self.service.get_storage_folders()
@@ -1440,4 +1311,61 @@ class BudgetTab(QWidget):
     def open_attachment_browser(self):
         from ui.dialogs.attachment_browser import AttachmentBrowserDialog
         dlg = AttachmentBrowserDialog(self.service, self)
-        dlg.exec()
\ No newline at end of file
+        dlg.exec()
+
+    def open_import_statement(self):
+        from ui.dialogs.import_statement_dialog import ImportStatementDialog
+        dlg = ImportStatementDialog(self.service, self)
+        if dlg.exec() == QDialog.DialogCode.Accepted:
+            self.handle_full_refresh()
+
+    def export_filters(self) -> dict:
+        filters = {"date_from": None, "date_to": None, "wallets": None, "authors": None}
+        date_range = self.export_column_filters.get(BudgetColumn.DATE)
+        if date_range:
+            filters["date_from"], filters["date_to"] = date_range
+        wallet_name = self.export_column_filters.get(BudgetColumn.WALLET_FROM)
+        if wallet_name:
+            filters["wallets"] = [str(w.id) for w in self.service.get_wallets_for_combo() if w.wallet_name == wallet_name]
+        author = self.user_filter_combo.currentData()
+        if author is not None:
+            filters["authors"] = [str(author)]
+        return filters
+
+    def open_export_transactions(self):
+        from services.export_service import available_formats, format_for_path, FORMAT_EXTENSIONS
+        labels = {"csv": "CSV (*.csv)", "jsonl": "JSON Lines (*.jsonl)", "parquet": "Parquet (*.parquet)"}
+        formats = available_formats()
+        default_name = os.path.join(os.path.expanduser("~"), f"transakcje_{QDate.currentDate().toString('yyyy-MM-dd')}.csv")
+        path, selected = QFileDialog.getSaveFileName(
+            self, "Eksportuj transakcje", default_name, ";;".join(labels[f] for f in formats)
+        )
+        if not path:
+            return
+        fmt = format_for_path(path) or next((f for f in formats if labels[f] == selected), "csv")
+        if format_for_path(path) is None:
+            path += FORMAT_EXTENSIONS[fmt]
+
+        progress = QProgressDialog("Eksportowanie transakcji...", "Anuluj", 0, 0, self)
+        progress.setWindowTitle("Eksport")
+        progress.setWindowModality(Qt.WindowModality.WindowModal)
+        progress.setMinimumDuration(0)
+        progress.canceled.connect(lambda: TaskScheduler.get().cancel("export_transactions"))
+        state = {"exported": 0}
+
+        def on_progress(chunk):
+            state["exported"] = chunk["exported"]
+            progress.setLabelText(f"Wyeksportowano: {chunk['exported']} ({chunk['elapsed']:.1f} s)")
+
+        def on_finished(_):
+            progress.reset()
+            QMessageBox.information(self, "Eksport", f"Zapisano {state['exported']} transakcji do:\n{path}")
+
+        def on_error(error_msg):
+            progress.reset()
+            QMessageBox.critical(self, "Błąd", f"Eksport nie powiódł się:\n{error_msg}")
+
+        TaskScheduler.get().submit(
+            "export_transactions", "iter_export_transactions", path, fmt, self.export_filters(),
+            priority=TaskPriority.USER_EDIT, progress=on_progress, finished=on_finished, error=on_error
+        )
\ No newline at end of file
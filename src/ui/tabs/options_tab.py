@@ -12,6 +12,7 @@ from PyQt6.QtWidgets import (
 from PyQt6.QtCore import Qt, QPoint, QRect, QSize
 from PyQt6.QtGui import QColor, QPixmap
 from core.config import settings, BASE_DIR
+from core.events import EventBus
 from services.budget_service import BudgetService
 from services.user_service import UserService
 from ui.dialogs.add_wallet_dialog import AddWalletDialog
@@ -146,6 +147,11 @@ class OptionsTab(QWidget):
         self.current_user_id = None
         self.init_ui()
         self.refresh_all()
+        EventBus.get().usersChanged.connect(self.on_users_changed)
+
+    def on_users_changed(self, version):
+        self.refresh_users_list()
+        self.refresh_user_combo()
 
     def init_ui(self):
         outer_layout = QVBoxLayout(self)
@@ -414,7 +420,6 @@ class OptionsTab(QWidget):
         color = QColorDialog.getColor()
         if color.isValid():
             self.user_service.set_user_color(uid, color.name())
-            self.refresh_users_list()
 
     def create_category_chip(self, category_obj):
         chip = QFrame()
@@ -713,16 +718,12 @@ class OptionsTab(QWidget):
     def handle_scan_users(self):
         db_uuids = self.service.get_unique_authors()
         self.user_service.register_discovered_users(db_uuids)
-        self.refresh_users_list()
-        self.refresh_user_combo()
         QMessageBox.information(self, "Skanowanie", "Zaktualizowano listę użytkowników na podstawie historii transakcji.")
 
     def open_rename_dialog(self, uid, current_alias):
         new_name, ok = QInputDialog.getText(self, "Zmiana Nazwy", f"Podaj alias dla ID {uid}:", text=current_alias)
         if ok and new_name:
             self.user_service.rename_user(uid, new_name)
-            self.refresh_users_list()
-            self.refresh_user_combo()
 
     def perform_metabase_dump(self):
         dump_dir = os.path.join(BASE_DIR, "docker", "metabase")
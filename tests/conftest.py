@@ -0,0 +1,14 @@
+import os
+import sys
+from pathlib import Path
+
+BASE_DIR = Path(__file__).resolve().parent.parent
+sys.path.insert(0, str(BASE_DIR / "src"))
+sys.path.insert(0, str(BASE_DIR / "scripts"))
+
+# core.config validates these on import and core.database builds a client from them;
+# no test connects anywhere.
+os.environ.setdefault("SUPABASE_URL", "http://localhost:54321")
+for name in ("SUPABASE_SECRET_KEY", "DB_HOST", "DB_USER", "DB_PASSWORD"):
+    os.environ.setdefault(name, "test")
+os.environ.setdefault("QT_QPA_PLATFORM", "offscreen")
@@ -0,0 +1,56 @@
+import os
+
+import pytest
+
+from core.attachment_cache import AttachmentCache
+
+@pytest.fixture
+def cache(tmp_path):
+    return AttachmentCache(str(tmp_path), max_bytes=10)
+
+def set_access(cache, storage_path, when):
+    with cache._conn:
+        cache._conn.execute("UPDATE cache_entries SET last_access = ? WHERE storage_path = ?", (when, storage_path))
+
+def test_put_and_read(cache):
+    local_path = cache.put("2026-03/a.pdf", b"1234", etag='"e1"')
+    assert local_path.endswith(".pdf")
+    assert cache.read("2026-03/a.pdf") == b"1234"
+    assert cache.lookup("2026-03/a.pdf")["etag"] == '"e1"'
+    assert cache.size() == 4
+
+def test_eviction_drops_least_recently_used(cache):
+    cache.put("a", b"1234")
+    cache.put("b", b"1234")
+    set_access(cache, "a", 1)
+    set_access(cache, "b", 2)
+    cache.put("c", b"1234")
+    assert cache.lookup("a") is None
+    assert cache.lookup("b") is not None
+    assert cache.lookup("c") is not None
+    assert cache.size() == 8
+
+def test_the_new_entry_is_kept_even_when_oversized(cache):
+    cache.put("a", b"1234")
+    cache.put("big", b"x" * 20)
+    assert cache.lookup("a") is None
+    assert cache.read("big") == b"x" * 20
+
+def test_file_changed_behind_the_index_is_dropped(cache):
+    local_path = cache.put("a", b"1234")
+    with open(local_path, "wb") as f:
+        f.write(b"12")
+    assert cache.lookup("a") is None
+    assert not os.path.exists(local_path)
+
+def test_orphans_are_forgotten_on_open(tmp_path):
+    cache = AttachmentCache(str(tmp_path), max_bytes=100)
+    os.remove(cache.put("a", b"1234"))
+    cache._conn.close()
+    assert AttachmentCache(str(tmp_path), max_bytes=100).size() == 0
+
+def test_clear(cache):
+    local_path = cache.put("a", b"1234")
+    cache.clear()
+    assert cache.size() == 0
+    assert not os.path.exists(local_path)
@@ -0,0 +1,45 @@
+import pytest
+
+from core.attachment_names import display_name, hash_key, hashed_name, safe_name
+
+SHA = "0123456789abcdef" * 4
+
+@pytest.mark.parametrize("stem, expected", [
+    ("Paragon Biedronka", "Paragon_Biedronka"),
+    ("Zażółć gęślą jaźń", "Zazoc_gesla_jazn"),
+    ("a/b\\c:d", "abcd"),
+    ("..hidden.", "hidden"),
+    ("ąę", "ae"),
+    ("***", "plik"),
+])
+def test_safe_name(stem, expected):
+    assert safe_name(stem) == expected
+
+def test_safe_name_is_bounded():
+    assert len(safe_name("x" * 500)) == 80
+
+def test_hashed_name_keeps_the_name_and_lowercases_the_extension():
+    assert hashed_name("/tmp/Faktura 03.PDF", SHA) == "Faktura_03__0123456789ab.pdf"
+    assert hashed_name("/tmp/README", SHA) == "README__0123456789ab"
+
+def test_hash_key_ignores_the_readable_name():
+    first = hash_key(f"2026-03/{hashed_name('paragon.jpg', SHA)}")
+    second = hash_key(f"2026-03/{hashed_name('skan z telefonu.jpg', SHA)}")
+    assert first == second == ("2026-03", "0123456789ab", ".jpg")
+    assert hash_key(f"2026-04/{hashed_name('paragon.jpg', SHA)}") != first
+    assert hash_key(f"2026-03/{hashed_name('paragon.png', SHA)}") != first
+
+@pytest.mark.parametrize("path", ["2026-03/paragon.jpg", "2026-03/a__0123.jpg", "2026-03/a__0123456789AB.jpg"])
+def test_hash_key_of_plain_names(path):
+    assert hash_key(path) is None
+
+def test_display_name():
+    assert display_name(f"2026-03/{hashed_name('Faktura 03.PDF', SHA)}") == "Faktura_03.pdf"
+    assert display_name("2026-03/legacy name.jpg") == "legacy name.jpg"
+    assert display_name(None) == ""
+
+def test_full_hash_names():
+    name = hashed_name("/tmp/Faktura 03.PDF", SHA, full=True)
+    assert name == f"Faktura_03__{SHA}.pdf"
+    assert hash_key(f"2026-03/{name}") == ("2026-03", SHA, ".pdf")
+    assert display_name(f"2026-03/{name}") == "Faktura_03.pdf"
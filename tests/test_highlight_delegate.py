@@ -0,0 +1,31 @@
+import pytest
+from PyQt6.QtGui import QFont, QFontMetricsF
+from PyQt6.QtWidgets import QApplication
+
+from ui.delegates.highlight_delegate import HighlightDelegate
+
+@pytest.fixture
+def delegate():
+    app = QApplication.instance() or QApplication([])
+    if not isinstance(app, QApplication):
+        pytest.skip("a non-GUI application already runs in this process")
+    delegate = HighlightDelegate()
+    yield delegate
+    delegate.deleteLater()
+
+def matches(segments):
+    return [segment for _, segment, is_match in segments if is_match]
+
+def test_spans_follow_the_original_text(delegate):
+    delegate.setSearchQuery("stanbul")
+    segments, _, _, _ = delegate._layout("İstanbul İstanbul", QFont(), 10_000)
+    assert matches(segments) == ["stanbul", "stanbul"]
+    assert "".join(segment for _, segment, _ in segments) == "İstanbul İstanbul"
+
+def test_bold_runs_fit_the_width(delegate):
+    font = QFont()
+    text = "mmmm " * 20
+    delegate.setSearchQuery("mmmm")
+    width = int(QFontMetricsF(font).horizontalAdvance(text)) - 1
+    _, text_width, _, _ = delegate._layout(text, font, width)
+    assert text_width <= width
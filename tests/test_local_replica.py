@@ -0,0 +1,46 @@
+import pytest
+
+from core.local_replica import LocalReplica
+
+GOALS = [
+    {"id": 1, "tag": "wakacje", "monthly_target_amount": "500.00", "is_active": True},
+    {"id": 2, "tag": "auto", "monthly_target_amount": 250.5, "is_active": False},
+]
+
+@pytest.fixture
+def replica(tmp_path):
+    return LocalReplica(str(tmp_path / "replica.db"))
+
+def count_writes(replica):
+    writes = []
+    replica._conn.set_trace_callback(lambda sql: writes.append(sql) if sql.startswith(("INSERT", "DELETE")) else None)
+    return writes
+
+def test_replace_table_stores_the_rows(replica):
+    replica.replace_table("dim_budget_goals", GOALS)
+    rows = sorted(replica.fetch_all("dim_budget_goals"), key=lambda r: r["id"])
+    assert [(r["id"], r["tag"], r["is_active"]) for r in rows] == [(1, "wakacje", True), (2, "auto", False)]
+
+def test_unchanged_rows_are_not_rewritten(replica):
+    replica.replace_table("dim_budget_goals", GOALS)
+    writes = count_writes(replica)
+    replica.replace_table("dim_budget_goals", [dict(g) for g in GOALS])
+    assert writes == []
+
+def test_only_the_difference_is_written(replica):
+    replica.replace_table("dim_budget_goals", GOALS)
+    writes = count_writes(replica)
+    replica.replace_table("dim_budget_goals", [
+        {**GOALS[0], "monthly_target_amount": "600.00"},
+        {"id": 3, "tag": "prezenty", "monthly_target_amount": 100, "is_active": True},
+    ])
+    rows = {r["id"]: r for r in replica.fetch_all("dim_budget_goals")}
+    assert sorted(rows) == [1, 3]
+    assert float(rows[1]["monthly_target_amount"]) == 600
+    assert sum(sql.startswith("INSERT") for sql in writes) == 2
+    assert sum(sql.startswith("DELETE") for sql in writes) == 1
+
+def test_text_columns_compare_exactly(replica):
+    replica.replace_table("dim_budget_goals", [{"id": 1, "tag": "100", "monthly_target_amount": 5}])
+    replica.replace_table("dim_budget_goals", [{"id": 1, "tag": "1e2", "monthly_target_amount": 5}])
+    assert replica.fetch_all("dim_budget_goals")[0]["tag"] == "1e2"
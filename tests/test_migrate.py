@@ -0,0 +1,36 @@
+from migrate import MIGRATIONS_DIR, Migration, split_statements
+
+def test_splits_on_top_level_semicolons():
+    assert split_statements("SELECT 1; SELECT 2;\nSELECT 3") == ["SELECT 1;", "SELECT 2;", "SELECT 3"]
+
+def test_keeps_semicolons_inside_quotes_and_comments():
+    sql = "INSERT INTO t VALUES ('a;b', 'it''s; fine');\n-- comment; here\nSELECT 2; /* block; comment */ SELECT 3;"
+    assert split_statements(sql) == [
+        "INSERT INTO t VALUES ('a;b', 'it''s; fine');",
+        "-- comment; here\nSELECT 2;",
+        "/* block; comment */ SELECT 3;",
+    ]
+
+def test_keeps_dollar_quoted_bodies_whole():
+    body = "CREATE FUNCTION f() RETURNS void AS $$\nBEGIN\n    PERFORM 1;\n    PERFORM 2;\nEND;\n$$ LANGUAGE plpgsql;"
+    tagged = "DO $body$ BEGIN PERFORM 1; END $body$;"
+    assert split_statements(f"{body}\n{tagged}") == [body, tagged]
+
+def test_drops_comment_only_and_empty_statements():
+    assert split_statements("-- header\n;\n;;SELECT 1;\n-- trailing comment\n") == ["SELECT 1;"]
+
+def test_steps_skip_transaction_control_after_comment_header(tmp_path):
+    path = tmp_path / "V9.9.9__Example.sql"
+    path.write_text(
+        "-- header\nBEGIN;\nCREATE TABLE t (id int);\nCREATE INDEX CONCURRENTLY idx_t ON t (id);\n"
+        "ALTER TABLE t ADD COLUMN x int;\nCOMMIT;\n",
+        encoding="utf-8",
+    )
+    steps = Migration(path).steps()
+    assert [(transactional, len(batch)) for transactional, batch in steps] == [(True, 1), (False, 1), (True, 1)]
+    assert steps[1][1] == ["CREATE INDEX CONCURRENTLY idx_t ON t (id);"]
+
+def test_shipped_migrations_split():
+    for path in sorted(MIGRATIONS_DIR.glob("V*.sql")):
+        for transactional, batch in Migration(path).steps():
+            assert batch and all(statement.strip() for statement in batch), path.name
@@ -0,0 +1,36 @@
+import pytest
+
+from core.search_index import SearchIndex
+
+TEXTS = [
+    "Biedronka zakupy spożywcze",
+    "Orlen paliwo",
+    "Zakupy online Allegro",
+    "Czynsz za mieszkanie",
+]
+
+@pytest.fixture
+def index():
+    index = SearchIndex()
+    index.build(TEXTS)
+    return index
+
+def brute_force(texts, query):
+    query = query.lower()
+    return {row for row, text in enumerate(texts) if query in text.lower()}
+
+@pytest.mark.parametrize("query", ["zakupy", "ZAKUPY", "kup", "ak", "a", "pal", "zakupy o", "py onl", "brak", "spożyw"])
+def test_search_matches_substring_scan(index, query):
+    assert index.search(query) == brute_force(TEXTS, query)
+
+def test_empty_query_means_no_filter(index):
+    assert index.search("") is None
+
+def test_whitespace_query_scans_the_texts(index):
+    assert index.search(" ") == brute_force(TEXTS, " ")
+
+def test_update_replaces_the_row_tokens(index):
+    index.update(1, "Shell paliwo")
+    assert index.search("orlen") == set()
+    assert index.search("shell") == {1}
+    assert index.search("paliwo") == {1}
@@ -0,0 +1,101 @@
+from datetime import date
+from decimal import Decimal
+
+import pytest
+
+from services.statement_parsers import (
+    ColumnMap, detect_format, iter_camt053_rows, iter_csv_rows, iter_mt940_rows, parse_amount, parse_date,
+)
+
+@pytest.mark.parametrize("text, expected", [
+    ("12,50", Decimal("12.50")),
+    ("-12,5", Decimal("-12.5")),
+    ("1.234,56", Decimal("1234.56")),
+    ("1,234.56", Decimal("1234.56")),
+    ("1 234,56 zł", Decimal("1234.56")),
+    ("1,234", Decimal("1234")),
+    ("1.234", Decimal("1234")),
+    ("1.234.567", Decimal("1234567")),
+    ("12,345,678", Decimal("12345678")),
+    ("0,125", Decimal("0.125")),
+    ("1,2345", Decimal("1.2345")),
+    ("12.50-", Decimal("-12.50")),
+    ("12,50+", Decimal("12.50")),
+    ("1.234,56-", Decimal("-1234.56")),
+    ("−5,00", Decimal("-5.00")),
+    ("1234", Decimal("1234")),
+])
+def test_parse_amount(text, expected):
+    assert parse_amount(text) == expected
+
+@pytest.mark.parametrize("text", ["", None, "-", "+", "abc", "--5"])
+def test_parse_amount_rejects_garbage(text):
+    assert parse_amount(text) is None
+
+@pytest.mark.parametrize("text, fmt, expected", [
+    ("2026-03-01", None, date(2026, 3, 1)),
+    ("01.03.2026", None, date(2026, 3, 1)),
+    ("2026-03-01 12:30", None, date(2026, 3, 1)),
+    ("2026-03-01T12:30:00", None, date(2026, 3, 1)),
+    ("03/01/2026", "%m/%d/%Y", date(2026, 3, 1)),
+    ("wczoraj", None, None),
+])
+def test_parse_date(text, fmt, expected):
+    assert parse_date(text, fmt) == expected
+
+def test_csv_skips_summary_and_splits_debit_credit(tmp_path):
+    path = tmp_path / "wyciag.csv"
+    path.write_text(
+        "Rachunek;PL00 1234\n"
+        "Data;Uznania;Obciążenia;Opis\n"
+        "2026-03-01;;1.234,56;Czynsz\n"
+        "2026-03-02;1,234;;Zwrot\n"
+        "suma;;;\n",
+        encoding="cp1250",
+    )
+    column_map = ColumnMap(date_column="Data", debit_column="Obciążenia", credit_column="Uznania")
+    rows = list(iter_csv_rows(str(path), column_map))
+    assert [(r.booking_date, r.amount, r.description) for r in rows] == [
+        (date(2026, 3, 1), Decimal("-1234.56"), "Czynsz"),
+        (date(2026, 3, 2), Decimal("1234"), "Zwrot"),
+    ]
+
+def test_mt940(tmp_path):
+    path = tmp_path / "wyciag.sta"
+    path.write_text(
+        ":20:ST1\n"
+        ":60F:C260301PLN1000,00\n"
+        ":61:2603010301D12,50NTRFREF1//BANK1\n"
+        ":86:020~20Zakupy~21 spożywcze~32Żabka\n"
+        ":61:2603020302C100,00NTRFREF2\n"
+        ":86:Wpłata\n"
+        ":62F:C260302PLN1087,50\n",
+        encoding="utf-8",
+    )
+    assert detect_format(str(path)) == "mt940"
+    rows = list(iter_mt940_rows(str(path)))
+    assert [(r.booking_date, r.amount, r.description, r.counterparty, r.currency) for r in rows] == [
+        (date(2026, 3, 1), Decimal("-12.50"), "Zakupy spożywcze", "Żabka", "PLN"),
+        (date(2026, 3, 2), Decimal("100.00"), "Wpłata", "", "PLN"),
+    ]
+
+def test_camt053(tmp_path):
+    path = tmp_path / "wyciag.xml"
+    path.write_text(
+        '<?xml version="1.0"?>'
+        '<Document xmlns="urn:iso:std:iso:20022:tech:xsd:camt.053.001.02"><BkToCstmrStmt><Stmt>'
+        "<Acct><Ccy>PLN</Ccy></Acct>"
+        '<Ntry><Amt Ccy="EUR">12.50</Amt><CdtDbtInd>DBIT</CdtDbtInd><BookgDt><Dt>2026-03-01</Dt></BookgDt>'
+        "<NtryDtls><TxDtls><RmtInf><Ustrd>Kawa</Ustrd></RmtInf>"
+        "<RltdPties><Cdtr><Nm>Kawiarnia</Nm></Cdtr></RltdPties></TxDtls></NtryDtls></Ntry>"
+        "<Ntry><Amt>5.00</Amt><CdtDbtInd>DBIT</CdtDbtInd><RvslInd>true</RvslInd>"
+        "<BookgDt><DtTm>2026-03-02T10:00:00</DtTm></BookgDt><AddtlNtryInf>Zwrot</AddtlNtryInf></Ntry>"
+        "</Stmt></BkToCstmrStmt></Document>",
+        encoding="utf-8",
+    )
+    assert detect_format(str(path)) == "camt053"
+    rows = list(iter_camt053_rows(str(path)))
+    assert [(r.booking_date, r.amount, r.description, r.counterparty, r.currency) for r in rows] == [
+        (date(2026, 3, 1), Decimal("-12.50"), "Kawa", "Kawiarnia", "EUR"),
+        (date(2026, 3, 2), Decimal("5.00"), "Zwrot", "", "PLN"),
+    ]
@@ -0,0 +1,131 @@
+import threading
+from datetime import datetime
+
+import pytest
+
+from core.local_replica import LocalReplica
+from models.transaction import Transaction
+from services import sync_service
+from services.sync_service import TransactionSyncService
+
+WALLET = "11111111-1111-1111-1111-111111111111"
+AUTHOR = "22222222-2222-2222-2222-222222222222"
+
+def tx_row(n, stamp="2026-03-01T10:00:00+00:00", **overrides):
+    data = {
+        "id": f"00000000-0000-0000-0000-{n:012d}", "amount": 10 + n, "transaction_date": "2026-03-01",
+        "wallet_fk": WALLET, "subcategory_fk": 1, "created_by_fk": AUTHOR,
+        "created_at": stamp, "updated_at": stamp,
+    }
+    data.update(overrides)
+    return data
+
+def parse(value):
+    return datetime.fromisoformat(value)
+
+class FakeRepo:
+    table = "fact_transactions"
+
+    def __init__(self, replica):
+        self.replica = replica
+        self.rows = {}
+        self.tombstones = []
+        self.pruned_through = None
+        self.on_fetch = lambda: None
+
+    def put(self, row):
+        self.rows[row["id"]] = row
+
+    def iter_pages(self, page_size):
+        yield Transaction.from_rows(list(self.rows.values()))
+
+    def get_latest_tombstone_at(self):
+        return self.tombstones[-1]["deleted_at"] if self.tombstones else None
+
+    def get_tombstone_horizon(self):
+        return self.pruned_through
+
+    def iter_changed_pages(self, updated_since, created_since, page_size):
+        self.on_fetch()
+        yield Transaction.from_rows([r for r in self.rows.values() if parse(r["updated_at"]) >= updated_since])
+
+    def iter_tombstones_since(self, since, page_size):
+        return iter([t for t in self.tombstones if parse(t["deleted_at"]) >= since])
+
+    def get_all_local(self):
+        return Transaction.from_rows(self.replica.fetch_transactions())
+
+@pytest.fixture
+def repo(tmp_path):
+    return FakeRepo(LocalReplica(str(tmp_path / "replica.db")))
+
+@pytest.fixture
+def service(monkeypatch, repo):
+    monkeypatch.setattr(sync_service, "TransactionRepository", lambda: repo)
+    monkeypatch.setattr(TransactionSyncService, "_instance", None)
+    return TransactionSyncService()
+
+def ids(transactions):
+    return sorted(str(t.id) for t in transactions)
+
+def test_first_sync_is_a_full_load(service, repo):
+    repo.put(tx_row(1))
+    repo.put(tx_row(2))
+    result = service.sync()
+    assert ids(result.upserted) == ids(service.snapshot())
+    assert len(service.snapshot()) == 2
+    assert len(repo.replica.fetch_transactions()) == 2
+
+def test_delta_sync_merges_changes_and_tombstones(service, repo):
+    repo.put(tx_row(1))
+    repo.put(tx_row(2))
+    service.sync()
+
+    repo.put(tx_row(1, "2026-03-02T10:00:00+00:00", amount=99))
+    repo.put(tx_row(3, "2026-03-02T10:00:00+00:00"))
+    del repo.rows[tx_row(2)["id"]]
+    repo.tombstones.append({"id": 1, "row_id": tx_row(2)["id"], "deleted_at": "2026-03-02T11:00:00+00:00"})
+
+    result = service.sync()
+    assert ids(result.upserted) == [tx_row(1)["id"], tx_row(3)["id"]]
+    assert result.deleted_ids == [tx_row(2)["id"]]
+    assert ids(service.snapshot()) == [tx_row(1)["id"], tx_row(3)["id"]]
+    assert ids(repo.get_all_local()) == [tx_row(1)["id"], tx_row(3)["id"]]
+
+def test_readers_do_not_wait_for_the_network(service, repo):
+    repo.put(tx_row(1))
+    service.sync()
+    seen = []
+
+    def read_from_another_thread():
+        reader = threading.Thread(target=lambda: seen.append(len(service.snapshot())))
+        reader.start()
+        reader.join(2)
+
+    repo.on_fetch = read_from_another_thread
+    service.sync()
+    assert seen == [1]
+
+def test_reset_during_fetch_discards_the_delta(service, repo):
+    repo.put(tx_row(1))
+    service.sync()
+    repo.put(tx_row(2, "2026-03-02T10:00:00+00:00"))
+    repo.on_fetch = service.reset
+    assert not service.sync().has_changes
+    assert service.snapshot() == []
+
+def test_pruned_tombstones_force_a_full_reload(service, repo):
+    repo.put(tx_row(1))
+    repo.put(tx_row(2))
+    service.sync()
+
+    # Deleted and pruned before this client synced again: no tombstone is left to read.
+    del repo.rows[tx_row(2)["id"]]
+    repo.pruned_through = "2026-03-05T00:00:00+00:00"
+    result = service.sync()
+    assert ids(result.upserted) == [tx_row(1)["id"]]
+    assert ids(service.snapshot()) == [tx_row(1)["id"]]
+
+    # The reload starts at the horizon, so the next sync is a delta again.
+    repo.put(tx_row(3, "2026-03-06T10:00:00+00:00"))
+    assert ids(service.sync().upserted) == [tx_row(3)["id"]]
@@ -0,0 +1,38 @@
+from models.totals import TotalsAggregator
+
+def build():
+    totals = TotalsAggregator()
+    totals.build(
+        [("INCOME", "COMPLETED"), ("EXPENSE", "COMPLETED"), ("EXPENSE", "PENDING"), ("EXPENSE", "COMPLETED")],
+        [1000.0, 12.5, 7.25, 0.1],
+    )
+    return totals
+
+def test_build_groups_by_key():
+    groups = {key: (total, count) for key, total, count in build().groups()}
+    assert groups == {
+        ("INCOME", "COMPLETED"): (1000.0, 1),
+        ("EXPENSE", "COMPLETED"): (12.6, 2),
+        ("EXPENSE", "PENDING"): (7.25, 1),
+    }
+
+def test_total_filters_groups_by_predicate():
+    totals = build()
+    assert totals.total(lambda key: key[0] == "EXPENSE") == 19.85
+    assert totals.total(lambda key: key == ("EXPENSE", "COMPLETED")) == 12.6
+    assert totals.total(lambda key: False) == 0
+
+def test_move_between_groups_and_drop_empty_group():
+    totals = build()
+    totals.move(("EXPENSE", "PENDING"), 7.25, ("EXPENSE", "COMPLETED"), 7.3)
+    groups = {key: (total, count) for key, total, count in totals.groups()}
+    assert ("EXPENSE", "PENDING") not in groups
+    assert groups[("EXPENSE", "COMPLETED")] == (19.9, 3)
+
+def test_repeated_edits_do_not_drift():
+    totals = TotalsAggregator()
+    totals.build([("EXPENSE",)] * 3, [0.1, 0.2, 0.3])
+    for _ in range(1000):
+        totals.move(("EXPENSE",), 0.1, ("EXPENSE",), 0.7)
+        totals.move(("EXPENSE",), 0.7, ("EXPENSE",), 0.1)
+    assert totals.total(lambda key: True) == 0.6
@@ -0,0 +1,66 @@
+from datetime import date
+from decimal import Decimal
+from uuid import UUID
+
+import pytest
+
+from models.transaction import Transaction, TransactionDecoder, TransactionSentiment, TransactionStatus, to_minor_units
+
+WALLET = "11111111-1111-1111-1111-111111111111"
+AUTHOR = "22222222-2222-2222-2222-222222222222"
+
+def row(**overrides):
+    data = {
+        "id": "a1", "amount": 12.5, "transaction_date": "2026-03-01", "wallet_fk": WALLET,
+        "subcategory_fk": "7", "created_by_fk": AUTHOR, "status": "PENDING", "sentiment": "Rutyna",
+        "tag": "dom", "description": "Zakupy",
+        "dim_categories": {"type": "EXPENSE", "category": "Dom", "subcategory": "Jedzenie"},
+    }
+    data.update(overrides)
+    return data
+
+@pytest.mark.parametrize("amount, expected", [
+    (12, 1200),
+    (12.5, 1250),
+    (2.675, 268),
+    (-2.675, -268),
+    (0.1, 10),
+    ("19.99", 1999),
+    (Decimal("0.005"), 1),
+    (Decimal("-1234.564"), -123456),
+])
+def test_to_minor_units(amount, expected):
+    assert to_minor_units(amount) == expected
+
+def test_decode_maps_fields():
+    tx = Transaction.from_dict(row())
+    assert tx.amount_minor == 1250 and tx.amount == Decimal("12.50")
+    assert tx.wallet_fk == UUID(WALLET) and tx.created_by_fk == UUID(AUTHOR)
+    assert tx.subcategory_fk == 7
+    assert (tx.type, tx.category_name, tx.subcategory_name) == ("EXPENSE", "Dom", "Jedzenie")
+    assert tx.transaction_date == date(2026, 3, 1)
+    assert tx.status is TransactionStatus.PENDING and tx.sentiment is TransactionSentiment.RUTYNA
+    assert tx.to_wallet_fk is None
+
+def test_decode_defaults():
+    tx = Transaction.from_dict(row(status=None, sentiment=None, tag=None, dim_categories=None, type="INCOME"))
+    assert tx.status is TransactionStatus.COMPLETED
+    assert tx.sentiment is None and tx.tag is None
+    assert (tx.type, tx.category_name, tx.subcategory_name) == ("INCOME", "-", "-")
+
+def test_decoder_shares_values_within_one_decoder():
+    decoder = TransactionDecoder()
+    first = Transaction.from_rows([row(id="a1")], decoder)[0]
+    second = Transaction.from_rows([row(id="a2")], decoder)[0]
+    assert first.wallet_fk is second.wallet_fk
+    assert first.transaction_date is second.transaction_date
+
+def test_from_rows_does_not_keep_values_between_calls():
+    first = Transaction.from_rows([row(id="a1")])[0]
+    second = Transaction.from_rows([row(id="a2")])[0]
+    assert first.wallet_fk == second.wallet_fk
+    assert first.wallet_fk is not second.wallet_fk
+
+def test_to_dict_round_trips():
+    tx = Transaction.from_dict(row(to_wallet_fk=WALLET))
+    assert Transaction.from_dict({**tx.to_dict(), "dim_categories": row()["dim_categories"]}) == tx
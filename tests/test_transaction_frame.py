@@ -0,0 +1,56 @@
+from models.transaction_frame import CodedColumn, TransactionFrame
+
+def rows():
+    return [
+        {"id": "a", "amount": "12.50", "type": "EXPENSE", "tag": None, "updated_at": "2026-03-02"},
+        {"id": "b", "amount": "oops", "type": "INCOME", "tag": "pensja", "created_at": "2026-03-01"},
+        {"id": "c", "amount": None, "type": "EXPENSE", "tag": "auto"},
+    ]
+
+def test_coded_column_shares_values():
+    column = CodedColumn()
+    for value in ["x", "y", "x", None, "x"]:
+        column.append(value)
+    assert column.values == ["x", "y", None]
+    assert column.materialize() == ["x", "y", "x", None, "x"]
+    column[1] = "x"
+    assert column[1] == "x"
+    assert len(column.values) == 3
+
+def test_coded_column_sort_keys_put_none_last():
+    column = CodedColumn()
+    for value in ["b", None, "a", "b"]:
+        column.append(value)
+    assert column.sort_keys() == [1, 2, 0, 1]
+
+def test_extend_remaps_codes():
+    first, second = CodedColumn(), CodedColumn()
+    for value in ["a", "b"]:
+        first.append(value)
+    for value in ["c", "b", "c"]:
+        second.append(value)
+    first.extend(second)
+    assert first.materialize() == ["a", "b", "c", "b", "c"]
+    assert first.values == ["a", "b", "c"]
+
+def test_from_rows_normalizes_amount_and_changed_at():
+    frame = TransactionFrame.from_rows(rows())
+    assert len(frame) == 3
+    assert list(frame.column("amount")) == [12.5, 0.0, 0.0]
+    assert frame.column("changed_at") == ["2026-03-02", "2026-03-01", None]
+    assert frame.row(1)["type"] == "INCOME"
+
+def test_set_and_text_column():
+    frame = TransactionFrame.from_rows(rows())
+    frame.set("amount", 2, "7")
+    frame.set("amount", 0, "bad")
+    frame.set("tag", 0, "auto")
+    assert frame.text_column("amount") == ["0.00", "0.00", "7.00"]
+    assert frame.text_column("tag") == ["auto", "pensja", "auto"]
+    assert frame.text_column("description") == ["", "", ""]
+
+def test_extend_frames():
+    frame = TransactionFrame.from_rows(rows()[:1])
+    frame.extend(TransactionFrame.from_rows(rows()[1:]))
+    assert frame.text_column("id") == ["a", "b", "c"]
+    assert frame.text_column("type") == ["EXPENSE", "INCOME", "EXPENSE"]
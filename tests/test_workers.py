@@ -0,0 +1,115 @@
+import threading
+import time
+
+import pytest
+from PyQt6.QtCore import QCoreApplication
+
+from core import workers
+from core.workers import TaskScheduler
+
+@pytest.fixture
+def scheduler(monkeypatch):
+    app = QCoreApplication.instance() or QCoreApplication([])
+    monkeypatch.setattr(workers, "_thread_service", lambda: None)
+    scheduler = TaskScheduler()
+    yield scheduler
+    scheduler.wait_for_done(5000)
+    app.processEvents()
+
+def drain(scheduler):
+    assert scheduler.wait_for_done(5000)
+    QCoreApplication.processEvents()
+
+def test_same_key_joins_the_running_task(scheduler):
+    release = threading.Event()
+    calls = []
+
+    def task(_service):
+        calls.append(1)
+        release.wait(5)
+        return "done"
+
+    results = []
+    first = scheduler.submit("load", task, finished=results.append)
+    second = scheduler.submit("load", task, finished=results.append)
+    assert second is first
+    release.set()
+    drain(scheduler)
+    assert calls == [1]
+    assert results == ["done"]
+    assert scheduler.running("load") is None
+
+def test_superseded_run_finishes_before_the_next_one_starts(scheduler):
+    spans = []
+    started = threading.Event()
+
+    def task(_service, name):
+        begin = time.monotonic()
+        started.set()
+        for _ in range(20):
+            time.sleep(0.01)
+            yield name
+        spans.append((name, begin, time.monotonic()))
+
+    progress = []
+    first = scheduler.submit("load", task, "first", progress=progress.append)
+    assert started.wait(5)
+    scheduler.submit("load", task, "second", supersede=True, progress=progress.append)
+    drain(scheduler)
+
+    assert first.is_cancelled()
+    assert [name for name, _, _ in spans] == ["second"]
+    assert set(progress) <= {"second"}
+
+def test_superseded_generator_is_closed_before_the_next_run(scheduler):
+    events = []
+    started = threading.Event()
+
+    def task(_service, name):
+        events.append(f"{name} start")
+        started.set()
+        try:
+            while True:
+                time.sleep(0.01)
+                yield name
+        finally:
+            events.append(f"{name} end")
+
+    def last(_service):
+        events.append("last start")
+
+    scheduler.submit("load", task, "first")
+    assert started.wait(5)
+    scheduler.submit("load", last, supersede=True)
+    drain(scheduler)
+    assert events == ["first start", "first end", "last start"]
+
+def test_key_state_is_dropped_with_the_last_task(scheduler):
+    scheduler.submit("a", lambda _service: None)
+    scheduler.submit("b", lambda _service: None)
+    drain(scheduler)
+    assert scheduler._running == {}
+    assert scheduler._pending == {}
+
+def test_queued_runs_of_one_key_do_not_hold_pool_threads(scheduler):
+    release = threading.Event()
+    started = threading.Event()
+    calls = []
+
+    def slow(_service, n):
+        calls.append(n)
+        started.set()
+        release.wait(5)
+
+    scheduler.submit("edit", slow, 0)
+    assert started.wait(5)
+    for n in range(1, 2 * TaskScheduler.MAX_THREADS):
+        scheduler.submit("edit", slow, n, supersede=True)
+
+    other = threading.Event()
+    scheduler.submit("other", lambda _service: other.set())
+    assert other.wait(5)
+
+    release.set()
+    drain(scheduler)
+    assert calls == [0, 2 * TaskScheduler.MAX_THREADS - 1]